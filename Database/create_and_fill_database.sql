@@ -82,10 +82,28 @@ CREATE TABLE users (
   email VARCHAR NOT NULL,
   password VARCHAR NOT NULL,
   role VARCHAR NOT NULL,
-  name VARCHAR NOT NULL
+  name VARCHAR NOT NULL,
   CONSTRAINT email_UNIQUE UNIQUE (email)
 );
 
+--
+-- Table structure for table `token_versions`
+--
+CREATE TABLE token_versions (
+  user_id INTEGER PRIMARY KEY,
+  version INTEGER NOT NULL DEFAULT 0
+);
+
+--
+-- Table structure for table `resource_versions`
+--
+CREATE TABLE resource_versions (
+  family VARCHAR(32) PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0,
+  modified_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+INSERT INTO resource_versions (family) VALUES ('tournaments'),('players'),('teams'),('match_formats'),('matches');
+
 --
 -- Table structure for table `matchups`
 --
@@ -98,11 +116,47 @@ CREATE TABLE matchups (
   player_two INTEGER DEFAULT NULL,
   player_one_score INTEGER DEFAULT NULL,
   player_two_score INTEGER DEFAULT NULL,
+  next_matchup_id INTEGER DEFAULT NULL,
+  next_slot SMALLINT DEFAULT NULL CHECK (next_slot IN (1, 2)),
   CONSTRAINT fk_game_tournament1 FOREIGN KEY (tournament_id) REFERENCES tournament (id) ON DELETE NO ACTION ON UPDATE NO ACTION,
   CONSTRAINT fk_round_player1 FOREIGN KEY (player_one) REFERENCES player (id) ON DELETE NO ACTION ON UPDATE NO ACTION,
-  CONSTRAINT fk_round_player2 FOREIGN KEY (player_two) REFERENCES player (id) ON DELETE NO ACTION ON UPDATE NO ACTION
+  CONSTRAINT fk_round_player2 FOREIGN KEY (player_two) REFERENCES player (id) ON DELETE NO ACTION ON UPDATE NO ACTION,
+  CONSTRAINT fk_matchup_next FOREIGN KEY (next_matchup_id) REFERENCES matchups (id) ON DELETE NO ACTION ON UPDATE NO ACTION
 );
 
+--
+-- Table structure for table `league_standings`
+--
+CREATE TABLE league_standings (
+  tournament_id INTEGER NOT NULL,
+  player_id INTEGER NOT NULL,
+  played INTEGER NOT NULL DEFAULT 0,
+  wins INTEGER NOT NULL DEFAULT 0,
+  losses INTEGER NOT NULL DEFAULT 0,
+  points_for INTEGER NOT NULL DEFAULT 0,
+  points_against INTEGER NOT NULL DEFAULT 0,
+  point_differential INTEGER GENERATED ALWAYS AS (points_for - points_against) STORED,
+  PRIMARY KEY (tournament_id, player_id),
+  CONSTRAINT fk_standing_tournament FOREIGN KEY (tournament_id) REFERENCES tournament (id) ON DELETE NO ACTION ON UPDATE NO ACTION,
+  CONSTRAINT fk_standing_player FOREIGN KEY (player_id) REFERENCES player (id) ON DELETE NO ACTION ON UPDATE NO ACTION
+);
+
+--
+-- Table structure for table `player_stats`
+--
+CREATE TABLE player_stats (
+  player_id INTEGER PRIMARY KEY,
+  matches_played INTEGER NOT NULL DEFAULT 0,
+  wins INTEGER NOT NULL DEFAULT 0,
+  total_points BIGINT NOT NULL DEFAULT 0,
+  titles INTEGER NOT NULL DEFAULT 0,
+  CONSTRAINT fk_stats_player FOREIGN KEY (player_id) REFERENCES player (id) ON DELETE CASCADE ON UPDATE NO ACTION
+);
+
+CREATE INDEX idx_player_stats_wins ON player_stats (wins DESC, player_id);
+CREATE INDEX idx_player_stats_total_points ON player_stats (total_points DESC, player_id);
+CREATE INDEX idx_player_stats_titles ON player_stats (titles DESC, player_id);
+
 --
 -- Table structure for table `team_match_detail`
 --
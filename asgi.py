@@ -0,0 +1,40 @@
+"""
+This is the ASGI entry point of the application, run with `uvicorn asgi:app`.
+
+The read endpoints of the match, tournament, player, team and user modules are
+served by async handlers on an asyncpg pool, so a request waiting on the
+database does not hold a worker. Every other route, including forms and
+writes, is served by the Flask application from `main`, mounted underneath.
+"""
+
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from fastapi.middleware.wsgi import WSGIMiddleware
+from common.response_cache import close_response_cache, configure_response_cache_from
+from data import async_database
+from data.migrations import apply_migrations
+from main import app as flask_app
+from routers.async_api import async_router
+from services import scoreboard_service, version_service
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """
+    Applies pending migrations, configures the response cache and opens the
+    asyncpg pool on startup. On shutdown, closes the pool and the connection to
+    the shared response cache and stops the score and version listeners.
+    """
+    apply_migrations()
+    configure_response_cache_from(flask_app.config)
+    await async_database.open_pool()
+    try:
+        yield
+    finally:
+        scoreboard_service.stop_listener()
+        version_service.stop_listener()
+        close_response_cache()
+        await async_database.close_pool()
+
+app = FastAPI(lifespan=lifespan, docs_url=None, redoc_url=None, openapi_url=None)
+app.include_router(async_router)
+app.mount('/', WSGIMiddleware(flask_app))
@@ -0,0 +1,4 @@
+"""
+Benchmarks for the data and service layers. Each module can be run directly,
+e.g. `python -m benchmarks.bench_pool`.
+"""
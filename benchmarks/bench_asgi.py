@@ -0,0 +1,100 @@
+"""
+Compares the requests/sec of the Flask and the ASGI serving modes on the same
+endpoints, with the same number of concurrent clients.
+
+Both servers must be running against the same database, for example:
+
+    flask --app main run --port 5000
+    uvicorn asgi:app --port 8000
+
+Run with `python -m benchmarks.bench_asgi --flask http://127.0.0.1:5000
+--asgi http://127.0.0.1:8000`. Each endpoint is warmed up, then requested in
+a loop by `--concurrency` clients for `--duration` seconds.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import namedtuple
+import aiohttp
+
+PATHS = ['/tournaments/all', '/match/playerMatch']
+CONCURRENCY = 64
+DURATION = 10.0
+WARM_UP_REQUESTS = 20
+
+LoadResult = namedtuple('LoadResult', ['requests', 'errors', 'elapsed', 'p50', 'p99'])
+
+async def _client(session: aiohttp.ClientSession, url: str, deadline: float,
+                  latencies: list[float], errors: list[int]) -> None:
+    """
+    Requests `url` in a loop until `deadline`, recording the latency of each success.
+    """
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            async with session.get(url) as response:
+                await response.read()
+                ok = response.status == 200
+        except aiohttp.ClientError:
+            ok = False
+        if ok:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors.append(1)
+
+async def load(url: str, concurrency: int, duration: float) -> LoadResult:
+    """
+    Runs `concurrency` clients against `url` for `duration` seconds.
+    """
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        for _ in range(WARM_UP_REQUESTS):
+            async with session.get(url) as response:
+                await response.read()
+
+        latencies: list[float] = []
+        errors: list[int] = []
+        started = time.perf_counter()
+        deadline = started + duration
+        await asyncio.gather(*(
+            _client(session, url, deadline, latencies, errors) for _ in range(concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    if len(latencies) < 2:
+        return LoadResult(len(latencies), len(errors), elapsed, float('nan'), float('nan'))
+    percentiles = statistics.quantiles(latencies, n=100)
+    return LoadResult(len(latencies), len(errors), elapsed, percentiles[49], percentiles[98])
+
+def report(label: str, path: str, result: LoadResult) -> None:
+    """
+    Prints the throughput and latency percentiles of one run.
+    """
+    print(f"{label:<6} {path:<20} {result.requests / result.elapsed:>9.0f} req/s "
+          f"p50={result.p50 * 1000:>7.1f}ms p99={result.p99 * 1000:>7.1f}ms "
+          f"errors={result.errors}")
+
+async def main(targets: dict[str, str], paths: list[str], concurrency: int,
+               duration: float) -> None:
+    for path in paths:
+        throughput = {}
+        for label, base_url in targets.items():
+            result = await load(base_url.rstrip('/') + path, concurrency, duration)
+            report(label, path, result)
+            throughput[label] = result.requests / result.elapsed
+        if throughput.get('flask'):
+            print(f"{'':<6} {path:<20} asgi/flask = {throughput['asgi'] / throughput['flask']:.2f}x")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', 1)[0])
+    parser.add_argument('--flask', required=True, help="base URL of the Flask server")
+    parser.add_argument('--asgi', required=True, help="base URL of the ASGI server")
+    parser.add_argument('--path', action='append', dest='paths', help="endpoint to load")
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--duration', type=float, default=DURATION)
+    args = parser.parse_args()
+
+    asyncio.run(main({'flask': args.flask, 'asgi': args.asgi}, args.paths or PATHS,
+                     args.concurrency, args.duration))
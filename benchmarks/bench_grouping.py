@@ -0,0 +1,73 @@
+"""
+Compares grouping joined player match rows before and after the grouping engine.
+
+The previous implementation collected every match in a dict, checked
+participants against the wrong container and built one model per call.
+Run with `python -m benchmarks.bench_grouping`.
+"""
+
+import gc
+import time
+from datetime import date
+from data.models import PlayerMatch, PlayerMatchData
+from services import match_service
+
+ROWS = 1_000_000
+PLAYERS_PER_MATCH = 4
+
+def synthetic_rows(count: int) -> list[tuple]:
+    """
+    Generates `count` player match rows clustered by match id.
+    """
+    played_at = date(2030, 1, 1)
+    return [
+        (i // PLAYERS_PER_MATCH, f"Match {i // PLAYERS_PER_MATCH}", played_at, "Format A",
+         i, f"Player {i}")
+        for i in range(count)
+    ]
+
+def legacy_player_matches(data: list[tuple]) -> list[PlayerMatch]:
+    """
+    The previous flattening of the player match listing.
+    """
+    flattened = {}
+    for match_id, title, played_at, match_format_name, player_id, player_name in data:
+        if match_id not in flattened:
+            flattened[match_id] = (match_id, title, played_at, match_format_name, [], [])
+
+        if player_id not in flattened:
+            flattened[match_id][-2].append(player_id)
+
+        if player_name not in flattened:
+            flattened[match_id][5].append(player_name)
+
+    return [PlayerMatch.from_query_result(PlayerMatchData(*obj)) for obj in flattened.values()]
+
+def grouped_player_matches(data: list[tuple]) -> list[PlayerMatch]:
+    """
+    The grouping engine used by match_service.
+    """
+    return list(match_service._player_matches(data))
+
+def measure(group, data: list[tuple]) -> float:
+    """
+    Returns the rows per second `group` processes over `data`. Like timeit,
+    the garbage collector is paused so its pauses do not dominate the timing.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        group(data)
+        return len(data) / (time.perf_counter() - started)
+    finally:
+        gc.enable()
+
+def main() -> None:
+    data = synthetic_rows(ROWS)
+    print(f"{'implementation':>16} {'rows/s':>12}")
+    for name, group in (("legacy", legacy_player_matches), ("grouping", grouped_player_matches)):
+        print(f"{name:>16} {measure(group, data):>12,.0f}")
+
+if __name__ == '__main__':
+    main()
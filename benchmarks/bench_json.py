@@ -0,0 +1,65 @@
+"""
+Compares serializing a tournament with 10k matchups through Flask's default
+JSON provider, after `model_dump()`, with `FastJSONProvider` serializing the
+model directly.
+
+Run with `python -m benchmarks.bench_json`.
+"""
+
+import json
+import time
+from datetime import date, timedelta
+from flask import Flask, jsonify
+from common.json_provider import FastJSONProvider
+from data.models import MatchUp, Player, TournamentResponseModel
+
+MATCHUPS = 10_000
+PLAYERS = 128
+ROUNDS = 20
+
+def synthetic_tournament() -> TournamentResponseModel:
+    """
+    Builds a played tournament with MATCHUPS matchups between PLAYERS players.
+    """
+    players = [Player(id=i, first_name=f"First {i}", second_name=f"Last {i}",
+                      country="Bulgaria", team=f"Team {i % 16}") for i in range(1, PLAYERS + 1)]
+    matchups = [MatchUp(id=i, tournament_id=1, played_at=date(2030, 1, 1) + timedelta(days=i % 365),
+                        tournament_phase=i % 7, player_one=i % PLAYERS + 1,
+                        player_two=(i + 1) % PLAYERS + 1, player_one_score=i % 120,
+                        player_two_score=(i * 7) % 120, next_matchup_id=i // 2 or None,
+                        next_slot=i % 2 + 1) for i in range(1, MATCHUPS + 1)]
+    return TournamentResponseModel(id=1, title="Cup", prize="1000 lv", format="Knockout",
+                                   winner=1, players=players, matchups=matchups)
+
+def measure(app: Flask, serialize) -> tuple[float, bytes]:
+    """
+    Returns the best time in ms of ROUNDS serializations and the last body.
+    """
+    best = float("inf")
+    with app.app_context():
+        for _ in range(ROUNDS):
+            started = time.perf_counter()
+            body = serialize().get_data()
+            best = min(best, time.perf_counter() - started)
+    return best * 1000, body
+
+def main() -> None:
+    tournament = synthetic_tournament()
+    default_app = Flask(__name__)
+    fast_app = Flask(__name__)
+    fast_app.json = FastJSONProvider(fast_app)
+
+    timings = {}
+    bodies = {}
+    for name, app, serialize in (
+        ("default", default_app, lambda: jsonify(tournament.model_dump())),
+        ("fast", fast_app, lambda: jsonify(tournament)),
+    ):
+        timings[name], bodies[name] = measure(app, serialize)
+        print(f"{name:>8}: {timings[name]:8.1f} ms for {MATCHUPS} matchups "
+              f"({len(bodies[name]) / 1e6:.1f} MB)")
+    assert json.loads(bodies["default"]) == json.loads(bodies["fast"])
+    print(f"speedup: {timings['default'] / timings['fast']:.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""
+Compares knockout tournament creation before and after bulk bracket building.
+
+The previous implementation looked every participant up by id and again by
+name, then inserted each matchup on its own. Run with
+`python -m benchmarks.bench_knockout`.
+"""
+
+import itertools
+import time
+from datetime import date
+from unittest.mock import patch
+from benchmarks.standin import StandInServer
+from data import database
+from data.models import Tournament
+from services import player_service, tournaments_service
+
+SIZES = [4, 8, 16, 32, 64, 128, 256]
+
+def knockout_responder():
+    """
+    Answers the statements issued while creating a knockout tournament.
+    """
+    ids = itertools.count(1)
+
+    def respond(sql: str, params: tuple) -> list[tuple]:
+        if "ANY(%s)" in sql:
+            return [(pid, f"First{pid}", f"Last{pid}", "USA", None) for pid in params[0]]
+        if sql.startswith("EXECUTE player_by_id"):
+            return [(params[0], f"First{params[0]}", f"Last{params[0]}", "USA", None)]
+        if sql.startswith("EXECUTE player_by_name"):
+            pid = int(params[0][len("First"):])
+            return [(pid, params[0], params[1], None, None)]
+        if "generate_series" in sql:
+            return [(next(ids),) for _ in range(params[0])]
+        if "RETURNING" in sql:
+            return [(next(ids),) for _ in range(max(sql.count("(%s,"), 1))]
+        return [(next(ids),)]
+
+    return respond
+
+def legacy_create_knockout(tournament: Tournament, participant_ids: list[int],
+                           starting_date: date) -> None:
+    """
+    The previous knockout creation: per-player lookups and per-matchup inserts.
+    """
+    players = [player_service.get_player_by_id(pid) for pid in participant_ids]
+    tournaments_service.create_tournament(tournament)
+
+    insert_sql = '''insert into matchups (tournament_id, played_at, tournament_phase,
+        player_one, player_two, player_one_score, player_two_score)
+        values (%s, %s, %s, %s, %s, %s, %s)'''
+    for home, away in zip(players[::2], players[1::2]):
+        player1 = player_service.get_player_by_name(f"{home.first_name} {home.second_name}")
+        player2 = player_service.get_player_by_name(f"{away.first_name} {away.second_name}")
+        database.insert_query(insert_sql, (tournament.id, starting_date, 1,
+                                           player1.id, player2.id, None, None))
+
+    phase, p_count = 2, len(players) // 2
+    while p_count > 1:
+        for _ in range(p_count // 2):
+            database.insert_query(insert_sql, (tournament.id, starting_date, phase,
+                                               None, None, None, None))
+        phase += 1
+        p_count //= 2
+
+def measure(create, size: int) -> tuple[float, int]:
+    """
+    Creates one tournament of `size` participants and returns (seconds, statements).
+    """
+    server = StandInServer(responder=knockout_responder())
+    database.configure_pool(min_size=1, max_size=1, connect=server.connect)
+    tournament = Tournament(title="Bench Cup", prize="1000 lv", format_id=1)
+
+    started = time.perf_counter()
+    create(tournament, list(range(1, size + 1)), date(2030, 1, 1))
+    return time.perf_counter() - started, server.statements
+
+def bulk_create_knockout(tournament: Tournament, participant_ids: list[int],
+                         starting_date: date) -> None:
+    """
+    The bulk knockout creation from tournaments_service.
+    """
+    with patch("services.tournaments_service.jsonify"):
+        tournaments_service.create_knockout_tournament(
+            tournament, [str(pid) for pid in participant_ids], starting_date
+        )
+
+def main() -> None:
+    print(f"{'players':>8} {'legacy ms':>10} {'stmts':>6} {'bulk ms':>10} {'stmts':>6}")
+    for size in SIZES:
+        legacy_time, legacy_statements = measure(legacy_create_knockout, size)
+        bulk_time, bulk_statements = measure(bulk_create_knockout, size)
+        print(f"{size:>8} {legacy_time * 1000:>10.1f} {legacy_statements:>6} "
+              f"{bulk_time * 1000:>10.1f} {bulk_statements:>6}")
+
+if __name__ == '__main__':
+    main()
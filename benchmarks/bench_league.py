@@ -0,0 +1,87 @@
+"""
+Compares league creation before and after in-memory round-robin scheduling.
+
+The previous implementation looked both players of every pairing up by name
+and inserted each matchup on its own. Run with `python -m benchmarks.bench_league`.
+"""
+
+import itertools
+import time
+from datetime import date, timedelta
+from benchmarks.standin import StandInServer
+from data import database
+from data.models import Tournament
+from services import player_service, tournaments_service
+
+SIZES = [8, 64, 256]
+QUERY_LATENCY = 0.00005
+
+def league_responder():
+    """
+    Answers the statements issued while creating a league.
+    """
+    ids = itertools.count(1)
+
+    def respond(sql: str, params: tuple) -> list[tuple]:
+        if "ANY(%s)" in sql:
+            return [(pid, f"First{pid}", f"Last{pid}", "USA", None) for pid in params[0]]
+        if sql.startswith("EXECUTE player_by_name"):
+            pid = int(params[0][len("First"):])
+            return [(pid, params[0], params[1], None, None)]
+        return [(next(ids),)]
+
+    return respond
+
+def legacy_create_league(league: Tournament, participant_ids: list[int],
+                         starting_date: date) -> None:
+    """
+    The previous league creation: two name lookups and one insert per pairing.
+    """
+    players = list(player_service.get_players_by_ids(participant_ids).values())
+    tournaments_service.create_tournament(league)
+
+    for day in range(1, len(players)):
+        phase = day % (len(players) - 1)
+        rotated = players[:1] + players[-phase:] + players[1:-phase] if phase else players
+        half = len(rotated) // 2
+        for home, away in zip(rotated[:half], rotated[half:][::-1]):
+            player_one = player_service.get_player_by_name(f"{home.first_name} {home.second_name}")
+            player_two = player_service.get_player_by_name(f"{away.first_name} {away.second_name}")
+            database.insert_query(
+                '''insert into matchups
+                (tournament_id, played_at, tournament_phase, player_one, player_two,
+                player_one_score, player_two_score)
+                values (%s, %s, %s, %s, %s, %s, %s)''',
+                (league.id, starting_date + timedelta(days=7 * phase), phase + 1,
+                 player_one.id, player_two.id, None, None)
+            )
+
+def bulk_create_league(league: Tournament, participant_ids: list[int],
+                       starting_date: date) -> None:
+    """
+    The round-robin league creation from tournaments_service.
+    """
+    tournaments_service.create_league(league, [str(pid) for pid in participant_ids], starting_date)
+
+def measure(create, size: int) -> tuple[float, int]:
+    """
+    Creates one league of `size` players and returns (seconds, statements).
+    """
+    server = StandInServer(query_latency=QUERY_LATENCY, responder=league_responder())
+    database.configure_pool(min_size=1, max_size=1, connect=server.connect)
+    league = Tournament(title="Bench League", prize="2000 lv", format_id=2)
+
+    started = time.perf_counter()
+    create(league, list(range(1, size + 1)), date(2030, 1, 1))
+    return time.perf_counter() - started, server.statements
+
+def main() -> None:
+    print(f"{'players':>8} {'legacy ms':>10} {'stmts':>6} {'bulk ms':>10} {'stmts':>6}")
+    for size in SIZES:
+        legacy_time, legacy_statements = measure(legacy_create_league, size)
+        bulk_time, bulk_statements = measure(bulk_create_league, size)
+        print(f"{size:>8} {legacy_time * 1000:>10.1f} {legacy_statements:>6} "
+              f"{bulk_time * 1000:>10.1f} {bulk_statements:>6}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Compares rebuilding player statistics per game in Python with the vectorized
+NumPy pass used by player_service.rebuild_player_stats.
+
+Run with `python -m benchmarks.bench_player_stats`.
+"""
+
+import time
+import numpy as np
+from services.player_stats import aggregate_results, result_stats
+
+GAMES = 200_000
+PLAYERS = 5_000
+PLAYERS_PER_GAME = 2
+
+def synthetic_results(games: int) -> list[tuple[int, int, int]]:
+    """
+    Generates (game, player, score) rows with distinct players per game.
+    """
+    rng = np.random.default_rng(1)
+    rows = []
+    for game in range(games):
+        players = rng.choice(PLAYERS, PLAYERS_PER_GAME, replace=False)
+        rows.extend((game, int(player), int(rng.integers(40, 120))) for player in players)
+    return rows
+
+def per_game(rows: list[tuple[int, int, int]]) -> dict[int, list[int]]:
+    """
+    Groups rows by game and adds up result_stats, one game at a time.
+    """
+    games: dict[int, dict[int, int]] = {}
+    for game, player, score in rows:
+        games.setdefault(game, {})[player] = score
+
+    totals: dict[int, list[int]] = {}
+    for scores in games.values():
+        for player, (played, won, points) in result_stats(scores).items():
+            stats = totals.setdefault(player, [0, 0, 0])
+            stats[0] += played
+            stats[1] += won
+            stats[2] += points
+    return totals
+
+def vectorized(rows: list[tuple[int, int, int]]) -> dict[int, list[int]]:
+    """
+    Aggregates the rows with aggregate_results.
+    """
+    results = np.array(rows, dtype=np.int64).reshape(-1, 3)
+    player_ids, played, wins, points = aggregate_results(
+        results[:, 0], results[:, 1], results[:, 2]
+    )
+    return {
+        player: [matches, won, total]
+        for player, matches, won, total in zip(
+            player_ids.tolist(), played.tolist(), wins.tolist(), points.tolist()
+        )
+    }
+
+def main() -> None:
+    rows = synthetic_results(GAMES)
+    timings = {}
+    for name, aggregate in (("per game", per_game), ("numpy", vectorized)):
+        started = time.perf_counter()
+        totals = aggregate(rows)
+        timings[name] = time.perf_counter() - started
+        print(f"{name:>9}: {timings[name] * 1000:8.1f} ms for {len(rows)} rows "
+              f"({len(totals)} players)")
+    assert per_game(rows) == vectorized(rows)
+    print(f"speedup: {timings['per game'] / timings['numpy']:.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Compares query throughput with and without the connection pool.
+
+Run with `python -m benchmarks.bench_pool`.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.standin import StandInServer
+from data import database
+
+QUERIES = 2000
+THREADS = 8
+
+def unpooled_read_query(server: StandInServer, sql: str, sql_params: tuple = ()) -> list[tuple]:
+    """
+    The previous read_query: one new connection per query.
+    """
+    conn = server.connect()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(sql, sql_params)
+            return cursor.fetchall()
+    finally:
+        conn.close()
+
+def run(label: str, query, server: StandInServer) -> None:
+    """
+    Executes QUERIES point lookups over THREADS worker threads and prints the throughput.
+    """
+    started = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as executor:
+        list(executor.map(query, range(QUERIES)))
+    elapsed = time.perf_counter() - started
+
+    print(f"{label:<10} {QUERIES / elapsed:>10.0f} queries/s "
+          f"{server.connections:>6} connections opened")
+
+def main() -> None:
+    sql = "SELECT id, name FROM team WHERE id = %s"
+
+    unpooled = StandInServer()
+    run("unpooled", lambda i: unpooled_read_query(unpooled, sql, (i,)), unpooled)
+
+    pooled = StandInServer()
+    database.configure_pool(min_size=2, max_size=THREADS, connect=pooled.connect)
+    run("pooled", lambda i: database.read_query(sql, (i,)), pooled)
+
+    stats = database.pool_stats()
+    print(f"pool: checkouts={stats.checkouts} waits={stats.waits} "
+          f"wait_time={stats.wait_time * 1000:.1f}ms peak_in_use={stats.peak_in_use}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Compares point lookups sent as plain SQL with the same lookups run as
+prepared statements.
+
+By default the lookups run against the stand-in server, which charges a
+parse/plan latency for every statement that is not an `EXECUTE`. Set
+BENCH_DSN to a libpq connection string to measure a real PostgreSQL database
+holding the application schema instead. Run with
+`python -m benchmarks.bench_prepared`.
+"""
+
+import os
+import statistics
+import time
+import psycopg2
+from benchmarks.standin import StandInServer
+from data import database
+from services import player_service
+
+LOOKUPS = 2000
+PARSE_LATENCY = 0.00008
+
+PLAYER_BY_ID = """SELECT player.id, first_name, second_name, country.name, team.name
+       FROM player
+       LEFT JOIN team ON team_id = team.id
+       LEFT JOIN country ON country_id = country.id
+       WHERE player.id = %s"""
+
+def player_responder(sql: str, params: tuple) -> list[tuple]:
+    """
+    Answers player lookups, whether sent as plain SQL or as EXECUTE.
+    """
+    if "player" in sql and params:
+        return [(params[0], "First", "Last", "USA", None)]
+    return []
+
+def plain_lookup(player_id: int) -> None:
+    """
+    The previous get_player_by_id query, parsed and planned on every call.
+    """
+    database.read_query(PLAYER_BY_ID, (player_id,))
+
+def prepared_lookup(player_id: int) -> None:
+    """
+    get_player_by_id through the prepared-statement registry.
+    """
+    player_service.get_player_by_id(player_id)
+
+def measure(lookup, player_ids: list[int]) -> list[float]:
+    """
+    Returns the latency in seconds of every lookup.
+    """
+    latencies = []
+    for player_id in player_ids:
+        started = time.perf_counter()
+        lookup(player_id)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+def main() -> None:
+    dsn = os.environ.get("BENCH_DSN")
+    if dsn:
+        database.configure_pool(min_size=1, max_size=1, connect=lambda: psycopg2.connect(dsn))
+        player_ids = [row[0] for row in database.read_query(
+            "SELECT id FROM player ORDER BY id LIMIT %s", (LOOKUPS,))] or [1]
+        print(f"PostgreSQL at BENCH_DSN, {LOOKUPS} lookups")
+    else:
+        server = StandInServer(query_latency=0.0001, parse_latency=PARSE_LATENCY,
+                               responder=player_responder)
+        database.configure_pool(min_size=1, max_size=1, connect=server.connect)
+        player_ids = list(range(1, 101))
+        print(f"stand-in server, {LOOKUPS} lookups, {PARSE_LATENCY * 1e6:.0f} us parse/plan")
+
+    player_ids = (player_ids * (LOOKUPS // len(player_ids) + 1))[:LOOKUPS]
+    print(f"{'lookup':>10} {'p50 us':>8} {'p99 us':>8}")
+    for name, lookup in (("plain", plain_lookup), ("prepared", prepared_lookup)):
+        latencies = sorted(measure(lookup, player_ids))
+        print(f"{name:>10} {statistics.median(latencies) * 1e6:>8.0f} "
+              f"{latencies[int(len(latencies) * 0.99)] * 1e6:>8.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Measures `/tournaments/all` served without the response cache, from the local
+cache of one worker, and by a second, cold worker that shares the bodies
+stored by the first through a stand-in Redis server on a Unix socket.
+
+Requests cycle through PAGES distinct query strings. Family versions are held
+fixed, as between two writes. Run with `python -m benchmarks.bench_response_cache`.
+"""
+
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from unittest.mock import patch
+from flask import Flask
+from benchmarks.standin import StandInCacheServer, StandInServer
+from common import response_cache
+from data import database
+from routers.tournaments import tournaments_blueprint
+
+REQUESTS = 2000
+PAGES = 20
+VALIDATORS = ("tournaments.1-players.1", datetime(2030, 1, 1, tzinfo=timezone.utc))
+
+def summary_responder(_sql: str, params: tuple) -> list[tuple]:
+    """
+    Answers the tournament page query with `limit + 1` aggregated rows.
+    """
+    return [(t, f"Cup {t}", "1000 lv", "Knockout", "First", "Last",
+             list(range(1, 33)), list(range(31 * t, 31 * t + 31)))
+            for t in range(1, params[-1] + 1)]
+
+def run(client, server: StandInServer) -> tuple[float, int]:
+    """
+    Sends REQUESTS requests and returns the requests/sec and statements executed.
+    """
+    statements = server.statements
+    started = time.perf_counter()
+    for i in range(REQUESTS):
+        client.get(f"/tournaments/all?limit={30 + i % PAGES}")
+    return REQUESTS / (time.perf_counter() - started), server.statements - statements
+
+def main() -> None:
+    server = StandInServer(responder=summary_responder)
+    database.configure_pool(min_size=1, max_size=1, connect=server.connect)
+    app = Flask(__name__)
+    app.register_blueprint(tournaments_blueprint)
+    client = app.test_client()
+    directory = tempfile.mkdtemp()
+    shared = StandInCacheServer(os.path.join(directory, "cache.sock")).start()
+
+    print(f"{'mode':<14} {'req/s':>9} {'statements':>11} {'hit ratio':>10} {'MB saved':>9}")
+    with patch("services.version_service.validators", return_value=None):
+        rate, statements = run(client, server)
+    print(f"{'no cache':<14} {rate:>9.0f} {statements:>11} {'-':>10} {'-':>9}")
+
+    with patch("services.version_service.validators", return_value=VALIDATORS):
+        for mode in ("local", "shared, cold"):
+            backend = response_cache.SocketBackend(shared.path)
+            cache = response_cache.configure_response_cache(backend=backend)
+            rate, statements = run(client, server)
+            stats = cache.stats()
+            print(f"{mode:<14} {rate:>9.0f} {statements:>11} {stats.hit_ratio:>10.3f} "
+                  f"{stats.bytes_saved / 1e6:>9.1f}")
+            backend.close()
+
+    shared.close()
+    os.rmdir(directory)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Compares watchers polling a tournament with watchers subscribed to its live
+score channel.
+
+Polling watchers each reload the tournament details once per interval, two
+statements per reload with the detail cache off. Subscribed watchers receive
+one dispatched event, encoded once and fanned out by the broker, per score
+update. Run with `python -m benchmarks.bench_scoreboard`.
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from unittest.mock import patch
+from benchmarks.standin import StandInServer
+from data import database
+from services import scoreboard_service, tournaments_service
+
+WATCHERS = [100, 1000, 5000]
+THREADS = 8
+MATCHUPS = 31
+
+def detail_responder(sql: str, _params: tuple) -> list[tuple]:
+    """
+    Answers the two statements of the tournament detail loader and the
+    tournament format lookup.
+    """
+    if "FROM tournament_format" in sql:
+        return [(1, "Knockout"), (2, "League")]
+    if "FROM matchups" in sql:
+        return [(m, 1, date(2030, 1, 1), 1, 2 * m, 2 * m + 1, 3, 5, None, None,
+                 "First", "Last", "USA", None, "First", "Last", "USA", None)
+                for m in range(1, MATCHUPS + 1)]
+    return [(1, "Cup", "1000 lv", 1, None)]
+
+def poll(watchers: int) -> tuple[float, int]:
+    """
+    Every watcher reloads the tournament once. Returns the time and statements.
+    """
+    server = StandInServer(responder=detail_responder)
+    database.configure_pool(min_size=THREADS, max_size=THREADS, connect=server.connect)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as executor:
+        list(executor.map(lambda _: tournaments_service.load_tournament_detail(1), range(watchers)))
+    return time.perf_counter() - started, server.statements
+
+def push(watchers: int) -> tuple[float, int]:
+    """
+    One score event reaches every subscribed watcher. Returns the time and frames delivered.
+    """
+    with patch("services.scoreboard_service.start_listener"):
+        subscriptions = [scoreboard_service.subscribe("tournament:1") for _ in range(watchers)]
+    payload = json.dumps({"topic": "tournament:1", "event": "score", "data": {
+        "matchup_id": 9, "player_one": 7, "player_two": 8,
+        "player_one_score": 3, "player_two_score": 5
+    }})
+
+    started = time.perf_counter()
+    delivered = scoreboard_service.dispatch(payload)
+    elapsed = time.perf_counter() - started
+
+    for subscription in subscriptions:
+        subscription.close()
+    return elapsed, delivered
+
+def main() -> None:
+    print(f"{'watchers':>8} {'poll ms':>10} {'statements':>11} {'push ms':>10} {'delivered':>10}")
+    for watchers in WATCHERS:
+        poll_time, statements = poll(watchers)
+        push_time, delivered = push(watchers)
+        print(f"{watchers:>8} {poll_time * 1000:>10.1f} {statements:>11} "
+              f"{push_time * 1000:>10.2f} {delivered:>10}")
+
+if __name__ == '__main__':
+    main()
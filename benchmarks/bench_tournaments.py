@@ -0,0 +1,103 @@
+"""
+Compares listing tournaments before and after aggregating matchups in SQL.
+
+The previous query returned one row per matchup and de-duplicated players in
+Python with list membership tests. The aggregated query returns one row per
+tournament with player and match id arrays.
+
+The numbers are transfer-only: both queries are answered by an in-process
+stand-in server, so they cover the rows shipped and the time spent turning
+them into dictionaries, but none of the server-side cost of the joins and
+`array_agg(DISTINCT ...)`. They are not evidence that the aggregated query is
+faster end to end; compare both queries with EXPLAIN ANALYZE on a real
+PostgreSQL server for that. Run with `python -m benchmarks.bench_tournaments`.
+"""
+
+import time
+from benchmarks.standin import StandInServer
+from data import database
+from services import tournaments_service
+
+TOURNAMENTS = 1000
+PLAYERS = 256
+
+def matchup_rows() -> list[tuple]:
+    """
+    One row per matchup of TOURNAMENTS knockout brackets of PLAYERS players.
+    """
+    rows, match_id = [], 0
+    for tour_id in range(1, TOURNAMENTS + 1):
+        players = list(range(1, PLAYERS + 1))
+        while len(players) > 1:
+            winners = []
+            for player_one, player_two in zip(players[::2], players[1::2]):
+                match_id += 1
+                rows.append((tour_id, f"Cup {tour_id}", "1000 lv", 1, None, None,
+                             player_one, player_two, match_id))
+                winners.append(player_one)
+            players = winners
+    return rows
+
+def aggregated_rows(rows: list[tuple]) -> list[tuple]:
+    """
+    The rows the aggregated query returns for the same data.
+    """
+    summaries = {}
+    for tour_id, title, prize, tournament_format, first, second, one, two, match_id in rows:
+        summary = summaries.setdefault(
+            tour_id, (tour_id, title, prize, tournament_format, first, second, set(), []))
+        summary[6].update((one, two))
+        summary[7].append(match_id)
+    return [(*summary[:6], sorted(summary[6]), summary[7]) for summary in summaries.values()]
+
+def legacy_all_tournaments() -> list[dict]:
+    """
+    The previous all_tournaments: one row per matchup, list de-duplication.
+    """
+    data = database.read_query("SELECT legacy")
+    flattened = {}
+    for (tour_id, title, prize, tournament_format, first_name, second_name,
+        player_one, player_two, match_id) in data:
+        if tour_id not in flattened:
+            winner_name = f"{first_name} {second_name}" if first_name else "No winner yet"
+            flattened[tour_id] = {
+                "id": tour_id,
+                "title": title,
+                "prize": prize,
+                "tournament_format": tournament_format,
+                "winner": winner_name,
+                "players": [],
+                "matches": []
+            }
+        if player_one is not None and player_one not in flattened[tour_id]["players"]:
+            flattened[tour_id]["players"].append(player_one)
+        if player_two is not None and player_two not in flattened[tour_id]["players"]:
+            flattened[tour_id]["players"].append(player_two)
+        if match_id is not None:
+            flattened[tour_id]["matches"].append(match_id)
+
+    return list(flattened.values())
+
+def measure(list_tournaments, rows: list[tuple]) -> float:
+    """
+    Lists the tournaments once against a server answering with `rows`.
+    """
+    server = StandInServer(responder=lambda _sql, _params: rows)
+    database.configure_pool(min_size=1, max_size=1, connect=server.connect)
+
+    started = time.perf_counter()
+    list_tournaments()
+    return time.perf_counter() - started
+
+def main() -> None:
+    rows = matchup_rows()
+    summaries = aggregated_rows(rows)
+    print(f"{TOURNAMENTS} tournaments x {PLAYERS} players "
+          "(transfer and decoding only, no server-side query cost)")
+    print(f"{'query':>12} {'rows':>8} {'client ms':>10}")
+    print(f"{'legacy':>12} {len(rows):>8} {measure(legacy_all_tournaments, rows) * 1000:>10.1f}")
+    print(f"{'aggregated':>12} {len(summaries):>8} "
+          f"{measure(tournaments_service.all_tournaments, summaries) * 1000:>10.1f}")
+
+if __name__ == '__main__':
+    main()
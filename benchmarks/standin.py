@@ -0,0 +1,152 @@
+"""
+A local stand-in for a PostgreSQL server used by the benchmarks.
+
+Connections sleep for a configurable handshake latency when opened and for a
+round-trip latency on every executed statement, which is enough to compare
+access patterns without a running database. Statements other than `EXECUTE`
+of a prepared statement additionally pay a parse/plan latency.
+
+`StandInCacheServer` stands in for a Redis server on a Unix socket shared by
+several worker processes.
+"""
+
+import os
+import socketserver
+import threading
+import time
+from typing import Callable
+
+Responder = Callable[[str, tuple], list[tuple]]
+
+def _no_rows(_sql: str, _params: tuple) -> list[tuple]:
+    return []
+
+class StandInCursor:
+    """
+    Cursor that records statements and answers them through a responder.
+    """
+    def __init__(self, conn: "StandInConnection") -> None:
+        self._conn = conn
+        self._rows: list[tuple] = []
+        self.rowcount = 0
+
+    def __enter__(self) -> "StandInCursor":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def execute(self, sql: str, params: tuple = ()) -> None:
+        """
+        Simulates one round-trip to the server.
+        """
+        server = self._conn.server
+        planned = sql.startswith("EXECUTE ")
+        time.sleep(server.query_latency + (0 if planned else server.parse_latency))
+        server.statements += 1
+        self._rows = list(server.responder(sql, params))
+        self.rowcount = len(self._rows) or 1
+
+    def fetchone(self) -> tuple | None:
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self) -> list[tuple]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self) -> None:
+        self._rows = []
+
+class StandInConnection:
+    """
+    Connection to a `StandInServer`.
+    """
+    def __init__(self, server: "StandInServer") -> None:
+        self.server = server
+        self.closed = 0
+
+    def cursor(self, *_args, **_kwargs) -> StandInCursor:
+        return StandInCursor(self)
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = 1
+
+class StandInServer:
+    """
+    Simulated server with handshake, per-statement and parse/plan latencies in seconds.
+    """
+    def __init__(self, handshake_latency: float = 0.003, query_latency: float = 0.0002,
+                 responder: Responder = _no_rows, parse_latency: float = 0.0) -> None:
+        self.handshake_latency = handshake_latency
+        self.query_latency = query_latency
+        self.parse_latency = parse_latency
+        self.responder = responder
+        self.connections = 0
+        self.statements = 0
+
+    def connect(self) -> StandInConnection:
+        """
+        Opens a new simulated connection, paying the handshake latency.
+        """
+        time.sleep(self.handshake_latency)
+        self.connections += 1
+        return StandInConnection(self)
+
+class StandInCacheServer:
+    """
+    Redis-compatible key-value server on a Unix socket, answering GET and SET
+    (expiry arguments are accepted and ignored), for the shared response cache.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.values: dict[bytes, bytes] = {}
+        self.commands = 0
+        self._server = socketserver.ThreadingUnixStreamServer(path, self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        kwargs={'poll_interval': 0.05}, daemon=True)
+
+    def start(self) -> "StandInCacheServer":
+        """
+        Starts serving in the background.
+        """
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """
+        Stops serving and removes the socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        os.unlink(self.path)
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                while True:
+                    header = self.rfile.readline()
+                    if not header:
+                        return
+                    args = []
+                    for _ in range(int(header[1:])):
+                        length = int(self.rfile.readline()[1:])
+                        args.append(self.rfile.read(length + 2)[:-2])
+                    server.commands += 1
+                    if args[0].upper() == b"GET":
+                        value = server.values.get(args[1])
+                        reply = b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+                    else:
+                        server.values[args[1]] = args[2]
+                        reply = b"+OK\r\n"
+                    self.wfile.write(reply)
+
+        return Handler
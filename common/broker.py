@@ -0,0 +1,181 @@
+"""
+This module contains an in-process publish/subscribe broker for Server-Sent
+Events. Each published event is encoded as an SSE frame once and handed to
+every subscriber of its topic, so the cost of an update does not depend on
+how clients consume it.
+
+Subscribers consume from a bounded queue, either blocking (WSGI views) or
+awaiting (ASGI handlers). A subscriber that falls `max_pending` events
+behind is closed instead of slowing down the publisher; its client is
+expected to reconnect and reload the current state.
+"""
+
+import asyncio
+import queue
+import threading
+from collections import namedtuple
+
+MAX_PENDING = 100
+KEEP_ALIVE = b": keep-alive\n\n"
+
+BrokerStats = namedtuple('BrokerStats', ['topics', 'subscribers', 'published', 'dropped'])
+
+def sse_frame(event: str, data: str) -> bytes:
+    """
+    Encodes one Server-Sent Event. `data` must be a single line, e.g. compact JSON.
+    """
+    return f"event: {event}\ndata: {data}\n\n".encode()
+
+class Subscription:
+    """
+    A subscriber's queue of pending frames on one topic, consumed by blocking reads.
+    """
+    def __init__(self, broker: "Broker", topic: str, max_pending: int) -> None:
+        self.topic = topic
+        self.closed = False
+        self._broker = broker
+        self._frames: queue.Queue = queue.Queue(max_pending)
+
+    def __enter__(self) -> "Subscription":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def deliver(self, frame: bytes) -> bool:
+        """
+        Queues a frame. Returns False, closing the subscription, if it is full.
+        """
+        try:
+            self._frames.put_nowait(frame)
+        except queue.Full:
+            self.closed = True
+            return False
+        return True
+
+    def get(self, timeout: float | None = None) -> bytes | None:
+        """
+        Waits for the next frame and returns it, or None after `timeout` seconds.
+        """
+        try:
+            return self._frames.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        """
+        Stops receiving frames.
+        """
+        self.closed = True
+        self._broker.unsubscribe(self)
+
+class AsyncSubscription(Subscription):
+    """
+    A subscription consumed from an asyncio event loop. Frames published from
+    other threads are handed over to the loop.
+    """
+    def __init__(self, broker: "Broker", topic: str, max_pending: int,
+                 loop: asyncio.AbstractEventLoop) -> None:
+        super().__init__(broker, topic, max_pending)
+        self._loop = loop
+        self._async_frames: asyncio.Queue = asyncio.Queue(max_pending)
+
+    def deliver(self, frame: bytes) -> bool:
+        if self.closed:
+            return False
+        try:
+            self._loop.call_soon_threadsafe(self._put, frame)
+        except RuntimeError:
+            self.closed = True
+            return False
+        return True
+
+    def _put(self, frame: bytes) -> None:
+        try:
+            self._async_frames.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.close()
+
+    async def get(self, timeout: float | None = None) -> bytes | None:
+        """
+        Awaits the next frame and returns it, or None after `timeout` seconds.
+        """
+        try:
+            return await asyncio.wait_for(self._async_frames.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+class Broker:
+    """
+    Thread-safe fan-out of SSE frames to the subscribers of a topic.
+    """
+    def __init__(self, max_pending: int = MAX_PENDING) -> None:
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._topics: dict[str, set[Subscription]] = {}
+        self._published = 0
+        self._dropped = 0
+
+    def subscribe(self, topic: str) -> Subscription:
+        """
+        Subscribes a blocking consumer to `topic`.
+        """
+        return self._add(Subscription(self, topic, self.max_pending))
+
+    def subscribe_async(self, topic: str) -> AsyncSubscription:
+        """
+        Subscribes a consumer running on the current event loop to `topic`.
+        """
+        loop = asyncio.get_running_loop()
+        return self._add(AsyncSubscription(self, topic, self.max_pending, loop))
+
+    def _add(self, subscription: Subscription) -> Subscription:
+        with self._lock:
+            self._topics.setdefault(subscription.topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Removes a subscription. Unknown subscriptions are ignored.
+        """
+        with self._lock:
+            subscribers = self._topics.get(subscription.topic)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._topics[subscription.topic]
+
+    def publish(self, topic: str, event: str, data: str) -> int:
+        """
+        Sends an event to every subscriber of `topic` and returns how many
+        received it. Subscribers that are too far behind are dropped.
+        """
+        with self._lock:
+            subscribers = list(self._topics.get(topic, ()))
+            self._published += 1
+        if not subscribers:
+            return 0
+
+        frame = sse_frame(event, data)
+        delivered = 0
+        for subscription in subscribers:
+            if subscription.deliver(frame):
+                delivered += 1
+            else:
+                self.unsubscribe(subscription)
+                with self._lock:
+                    self._dropped += 1
+        return delivered
+
+    def stats(self) -> BrokerStats:
+        """
+        Returns the number of topics and subscribers and the events published and dropped.
+        """
+        with self._lock:
+            return BrokerStats(
+                topics=len(self._topics),
+                subscribers=sum(len(s) for s in self._topics.values()),
+                published=self._published,
+                dropped=self._dropped
+            )
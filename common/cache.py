@@ -0,0 +1,86 @@
+"""
+This module contains a small thread-safe in-process cache whose entries
+expire individually after their own time-to-live.
+"""
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Hashable
+
+TTLCacheStats = namedtuple('TTLCacheStats', ['hits', 'misses', 'evictions', 'size'])
+
+class TTLCache:
+    """
+    Mapping of keys to values that expire `ttl` seconds after being stored.
+    When full, the least recently used entry is evicted.
+
+    Attributes:
+        max_size (int): The maximum number of entries kept.
+    """
+    def __init__(self, max_size: int = 10000) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Returns the value stored under `key`, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """
+        Stores `value` under `key` for `ttl` seconds. Non-positive TTLs are ignored.
+        """
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        """
+        Removes the entry stored under `key`, if any.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_if(self, predicate: Callable[[Any], bool]) -> int:
+        """
+        Removes every entry whose value matches `predicate` and returns how many were removed.
+        """
+        with self._lock:
+            keys = [key for key, (value, _) in self._entries.items() if predicate(value)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> TTLCacheStats:
+        """
+        Returns the hit, miss and eviction counters of the cache.
+        """
+        with self._lock:
+            return TTLCacheStats(self._hits, self._misses, self._evictions, len(self._entries))
@@ -0,0 +1,41 @@
+"""
+Conditional GET support for read endpoints whose responses only change when
+one of the resource families they are built from changes.
+
+Responses carry an `ETag` and `Last-Modified` derived from the family
+versions kept by `version_service`. A request whose `If-None-Match` (or
+`If-Modified-Since`) still matches is answered with 304 before the view runs,
+so it does not touch the database.
+"""
+
+from functools import wraps
+from typing import Callable
+from flask import Response, current_app, request
+from werkzeug.http import is_resource_modified
+from services import version_service
+
+def conditional_get(*families: str) -> Callable:
+    """
+    Makes a view answer conditional requests from the versions of `families`.
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            validators = version_service.validators(*families)
+            if validators is None:
+                return view(*args, **kwargs)
+
+            etag, last_modified = validators
+            if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+                response = Response(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            response.last_modified = last_modified
+            response.cache_control.no_cache = True
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,79 @@
+"""
+This module serializes response bodies to JSON without the per-object
+overhead of the standard library encoder.
+
+Pydantic models, and lists of models of one type, are serialized to bytes by
+pydantic-core through a cached `TypeAdapter`, without building intermediate
+dicts. Other values are encoded with orjson when it is installed and with the
+standard library otherwise. Both keep the conventions of Flask's default
+provider: sorted keys in plain dicts and dates as HTTP dates (date fields of
+the models are declared as `data.models.HttpDate` for the same result); model
+fields keep their declaration order.
+Models nested in plain values are dumped to JSON-compatible dicts first.
+"""
+
+import json
+from datetime import date
+from functools import lru_cache
+from typing import Any
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+from pydantic import BaseModel, TypeAdapter
+from data.models import format_http_date
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(value: Any) -> Any:
+    """
+    Encodes the values the JSON encoders do not support, like Flask does.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode='json')
+    if isinstance(value, date):
+        return format_http_date(value)
+    return DefaultJSONProvider.default(value)
+
+@lru_cache(maxsize=None)
+def _adapter(model: type[BaseModel], many: bool) -> TypeAdapter:
+    """
+    Returns the adapter serializing one `model` or a list of them.
+    """
+    return TypeAdapter(list[model] if many else model)
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    Serializes `obj` to compact UTF-8 JSON.
+    """
+    if isinstance(obj, BaseModel):
+        return _adapter(type(obj), False).dump_json(obj)
+    if isinstance(obj, list) and obj and isinstance(obj[0], BaseModel) \
+            and all(type(item) is type(obj[0]) for item in obj):
+        return _adapter(type(obj[0]), True).dump_json(obj)
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SORT_KEYS
+                            | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(obj, default=_default, sort_keys=True, ensure_ascii=False,
+                      separators=(',', ':')).encode()
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider serializing through `dumps_bytes`. Calls passing
+    encoder options, and responses in debug mode, which are indented, use the
+    default provider.
+    """
+    default = staticmethod(_default)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return dumps_bytes(obj).decode()
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        if self.compact is False or (self.compact is None and self._app.debug):
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
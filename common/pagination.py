@@ -0,0 +1,87 @@
+"""
+This module contains helpers for keyset (cursor-based) pagination of list
+endpoints: reading `limit`/`cursor` query parameters and encoding the
+opaque cursor tokens returned to clients.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date
+from typing import Mapping
+from flask import request
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+def encode_cursor(key: tuple | None) -> str | None:
+    """
+    Encodes the sort key of the last row of a page as an opaque token.
+    """
+    if key is None:
+        return None
+    raw = json.dumps(list(key), default=str, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(token: str | None) -> tuple | None:
+    """
+    Decodes a token produced by `encode_cursor`. Raises ValueError if it is malformed.
+    """
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        key = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {token}") from e
+    if not isinstance(key, list) or not key:
+        raise ValueError(f"Invalid cursor: {token}")
+    return tuple(key)
+
+def id_key(after: tuple | None) -> tuple | None:
+    """
+    Validates a decoded (id,) cursor and converts it to the types the
+    drivers bind. Raises ValueError if it is malformed.
+    """
+    if not after:
+        return None
+    try:
+        (row_id,) = after
+        return (int(row_id),)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {after}") from e
+
+def match_key(after: tuple | None) -> tuple | None:
+    """
+    Validates a decoded (played_at, match_id) cursor, whose date is an ISO
+    string, and converts it to the types the drivers bind.
+    Raises ValueError if it is malformed.
+    """
+    if not after:
+        return None
+    try:
+        played_at, match_id = after
+        return date.fromisoformat(played_at), int(match_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {after}") from e
+
+def page_params() -> tuple[int, tuple | None]:
+    """
+    Reads the `limit` and `cursor` query parameters of the current request.
+    Raises ValueError if either is invalid.
+    """
+    return read_page_params(request.args)
+
+def read_page_params(args: Mapping[str, str]) -> tuple[int, tuple | None]:
+    """
+    Reads the `limit` and `cursor` parameters from a mapping of query
+    parameters. Raises ValueError if either is invalid, including a limit
+    that is not a number.
+    """
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError as e:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}") from e
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit, decode_cursor(args.get('cursor'))
@@ -0,0 +1,74 @@
+"""
+This module reports the database work done by each request: the number of
+statements, the time spent in the database, the connections borrowed and
+statements repeated with different parameters (the N+1 pattern).
+
+In debug mode the figures are sent back as response headers; otherwise one
+structured log line is written per request.
+"""
+
+import json
+import logging
+from flask import Response, current_app, g, request
+from data import database
+
+logger = logging.getLogger(__name__)
+
+def start_request_stats() -> None:
+    """
+    Starts recording the statements of the current request.
+    """
+    g.query_log = database.start_query_log()
+
+def add_query_headers(response: Response) -> Response:
+    """
+    Adds the query statistics gathered so far to the response in debug mode.
+    """
+    log = g.get('query_log')
+    if log is None:
+        return response
+
+    g.response_status = response.status_code
+    if current_app.debug:
+        response.headers['X-DB-Queries'] = str(log.queries)
+        response.headers['X-DB-Time-Ms'] = f"{log.db_time * 1000:.2f}"
+        response.headers['X-DB-Connections'] = str(log.connections)
+        repeated = log.repeated()
+        if repeated:
+            response.headers['X-DB-N-Plus-One'] = "; ".join(
+                f"{count}x {_statement(sql)}" for sql, count in repeated.items()
+            )
+    response.headers.add('Server-Timing', f"db;dur={log.db_time * 1000:.2f}")
+    return response
+
+def finish_request_stats(_exc: BaseException | None = None) -> None:
+    """
+    Stops recording and, outside debug mode, logs the request's statistics.
+    Runs on teardown so statements of streamed responses are included.
+    """
+    log = g.pop('query_log', None)
+    if log is None:
+        return
+    database.stop_query_log(log)
+
+    if not current_app.debug:
+        logger.info(json.dumps({
+            "event": "request_queries",
+            "method": request.method,
+            "path": request.path,
+            "status": g.get('response_status'),
+            "queries": log.queries,
+            "db_time_ms": round(log.db_time * 1000, 2),
+            "connections": log.connections,
+            "n_plus_one": [
+                {"sql": _statement(sql), "count": count}
+                for sql, count in log.repeated().items()
+            ],
+        }))
+
+def _statement(sql: str, length: int = 120) -> str:
+    """
+    Collapses whitespace in a statement and truncates it for reporting.
+    """
+    text = " ".join(sql.split())
+    return text if len(text) <= length else text[:length - 3] + "..."
@@ -0,0 +1,325 @@
+"""
+This module caches the serialized JSON bodies of list responses.
+
+Entries are keyed by route, query parameters and the versions of the resource
+families a response is built from, and tagged with those families. The local
+store is an LRU bounded by the total size of the bodies it holds. Service
+writes bump family versions through `version_service`, and every process drops
+the entries tagged with a family once its new version arrives.
+
+An optional backend shared by the worker processes of a host, such as a
+Redis-compatible server on a Unix socket, is consulted on local misses. Its
+keys carry the versions too, so it never serves a body older than the versions
+a process knows; outdated entries simply expire.
+"""
+
+import logging
+import os
+import socket
+import threading
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from typing import Any, Callable, Iterable, Mapping, Protocol
+from urllib.parse import urlencode
+from flask import Response, current_app, request
+from services import version_service
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+MAX_ENTRY_FRACTION = 8
+SHARED_TTL = 300.0
+SHARED_TIMEOUT = 0.05
+
+ResponseCacheStats = namedtuple('ResponseCacheStats', [
+    'hits', 'shared_hits', 'misses', 'hit_ratio', 'bytes_saved', 'entries', 'size', 'evictions'
+])
+
+class CacheBackend(Protocol):
+    """
+    A store of bodies shared by several processes.
+    """
+    def get(self, key: str) -> bytes | None: ...
+
+    def set(self, key: str, body: bytes) -> None: ...
+
+class SocketBackend:
+    """
+    Client of a Redis-compatible server listening on a Unix socket. Only GET
+    and SET with an expiry are used. The connection is opened on first use;
+    after an error it is closed and the call is treated as a miss.
+
+    Attributes:
+        path (str): The path of the server's socket.
+        ttl (float): Seconds after which stored bodies expire.
+    """
+    def __init__(self, path: str, ttl: float = SHARED_TTL,
+                 timeout: float = SHARED_TIMEOUT) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._timeout = timeout
+        self._sock: socket.socket | None = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        """
+        Returns the body stored under `key`, or None.
+        """
+        return self._call(b"GET", key.encode())
+
+    def set(self, key: str, body: bytes) -> None:
+        """
+        Stores `body` under `key` for `ttl` seconds.
+        """
+        self._call(b"SET", key.encode(), body, b"PX", str(int(self.ttl * 1000)).encode())
+
+    def close(self) -> None:
+        """
+        Closes the connection, if open.
+        """
+        with self._lock:
+            self._disconnect()
+
+    def _call(self, *args: bytes) -> bytes | None:
+        with self._lock:
+            try:
+                if self._sock is None:
+                    self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    self._sock.settimeout(self._timeout)
+                    self._sock.connect(self.path)
+                if self._reader is None:
+                    self._reader = self._sock.makefile('rb')
+                self._sock.sendall(encode_command(args))
+                return read_reply(self._reader)
+            except (OSError, ValueError):
+                logger.warning("Shared response cache at %s failed", self.path, exc_info=True)
+                self._disconnect()
+                return None
+
+    def _disconnect(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = self._reader = None
+
+def encode_command(args: tuple[bytes, ...]) -> bytes:
+    """
+    Encodes a command as a RESP array of bulk strings.
+    """
+    return b"".join(
+        [b"*%d\r\n" % len(args)] + [b"$%d\r\n%s\r\n" % (len(arg), arg) for arg in args]
+    )
+
+def read_reply(reader) -> bytes | None:
+    """
+    Reads one RESP reply. Bulk strings are returned as bytes, a missing value
+    as None and status replies as their text. Error replies raise ValueError.
+    """
+    line = reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ValueError("Connection closed")
+    kind, value = line[:1], line[1:-2]
+    if kind == b"$":
+        length = int(value)
+        if length < 0:
+            return None
+        data = reader.read(length + 2)
+        if len(data) != length + 2:
+            raise ValueError("Connection closed")
+        return data[:-2]
+    if kind in (b"+", b":"):
+        return value
+    if kind == b"-":
+        raise ValueError(value.decode(errors="replace"))
+    raise ValueError(f"Unsupported reply: {line!r}")
+
+class ResponseCache:
+    """
+    LRU of response bodies bounded by their total size in bytes, with the
+    tags of every entry, in front of an optional shared backend.
+
+    Attributes:
+        max_bytes (int): The maximum total size of the keys and bodies kept.
+    """
+    def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+                 backend: CacheBackend | None = None) -> None:
+        self.max_bytes = max_bytes
+        self.backend = backend
+        self._entries: OrderedDict[str, tuple[bytes, tuple[str, ...]]] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._shared_hits = 0
+        self._misses = 0
+        self._bytes_saved = 0
+        self._evictions = 0
+
+    def get(self, key: str, tags: tuple[str, ...] = ()) -> bytes | None:
+        """
+        Returns the body stored under `key`, locally or in the shared backend,
+        or None. A body found in the backend is kept locally under `tags`.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                self._bytes_saved += len(entry[0])
+                return entry[0]
+
+        body = self.backend.get(key) if self.backend is not None else None
+        with self._lock:
+            if body is None:
+                self._misses += 1
+                return None
+            self._shared_hits += 1
+            self._bytes_saved += len(body)
+        self._store(key, body, tags)
+        return body
+
+    def set(self, key: str, body: bytes, tags: tuple[str, ...]) -> None:
+        """
+        Stores `body` under `key`, tagged with `tags`, locally and in the shared backend.
+        """
+        self._store(key, body, tags)
+        if self.backend is not None:
+            self.backend.set(key, body)
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        """
+        Drops the local entries tagged with any of `tags` and returns how many were dropped.
+        """
+        with self._lock:
+            keys = set().union(*(self._keys_by_tag.get(tag, ()) for tag in tags))
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """
+        Drops every local entry.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self._size = 0
+
+    def stats(self) -> ResponseCacheStats:
+        """
+        Returns the hit ratio, the bytes served from the cache and the size of the cache.
+        """
+        with self._lock:
+            lookups = self._hits + self._shared_hits + self._misses
+            ratio = (self._hits + self._shared_hits) / lookups if lookups else 0.0
+            return ResponseCacheStats(self._hits, self._shared_hits, self._misses, ratio,
+                                      self._bytes_saved, len(self._entries), self._size,
+                                      self._evictions)
+
+    def _store(self, key: str, body: bytes, tags: tuple[str, ...]) -> None:
+        """
+        Keeps `body` locally, evicting the least recently used entries to stay
+        within `max_bytes`. Bodies above a fraction of the budget are not kept.
+        """
+        if len(key) + len(body) > self.max_bytes // MAX_ENTRY_FRACTION:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (body, tags)
+            self._size += len(key) + len(body)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def _remove(self, key: str) -> None:
+        """
+        Drops a local entry and its tags. The lock must be held.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        body, tags = entry
+        self._size -= len(key) + len(body)
+        for tag in tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+_cache = ResponseCache()
+
+def configure_response_cache(max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+                             backend: CacheBackend | None = None) -> ResponseCache:
+    """
+    Replaces the response cache with one using the given size and shared
+    backend, and closes the backend of the previous one.
+    """
+    global _cache
+    close_response_cache()
+    _cache = ResponseCache(max_bytes, backend)
+    return _cache
+
+def configure_response_cache_from(config: Mapping[str, Any]) -> ResponseCache:
+    """
+    Configures the response cache from the `RESPONSE_CACHE_MAX_BYTES` and
+    `RESPONSE_CACHE_SOCKET` settings of `config`, or from the environment
+    variables of the same names. The shared backend on the Unix socket is
+    used only when a socket path is set.
+    """
+    def setting(name: str) -> Any:
+        return config.get(name) or os.environ.get(name)
+
+    path = setting('RESPONSE_CACHE_SOCKET')
+    max_bytes = int(setting('RESPONSE_CACHE_MAX_BYTES') or RESPONSE_CACHE_MAX_BYTES)
+    return configure_response_cache(max_bytes, SocketBackend(path) if path else None)
+
+def close_response_cache() -> None:
+    """
+    Closes the connection of the response cache to its shared backend, if any.
+    """
+    if isinstance(_cache.backend, SocketBackend):
+        _cache.backend.close()
+
+def response_cache_stats() -> ResponseCacheStats:
+    """
+    Returns the statistics of the response cache.
+    """
+    return _cache.stats()
+
+def _invalidate(families: set[str]) -> None:
+    _cache.invalidate(families)
+
+version_service.on_change(_invalidate)
+
+def cached_response(*families: str) -> Callable:
+    """
+    Serves the JSON body of a view from the response cache. The view must only
+    depend on the request's path and query parameters and on `families`.
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            validators = version_service.validators(*families)
+            if validators is None:
+                return view(*args, **kwargs)
+
+            query = urlencode(sorted(request.args.items(multi=True)))
+            key = f"{request.path}?{query}#{validators[0]}"
+            body = _cache.get(key, families)
+            if body is not None:
+                response = Response(body, mimetype='application/json')
+                response.headers['X-Cache'] = 'HIT'
+                return response
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200 and response.is_json and not response.is_streamed:
+                _cache.set(key, response.get_data(), families)
+            response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,66 @@
+"""
+This module contains helpers for streaming large collections as JSON or
+NDJSON responses, one item at a time, so the full payload is never held in memory,
+and for streaming broker subscriptions as Server-Sent Events.
+"""
+
+from typing import Iterable, Iterator
+from flask import Response, current_app, stream_with_context
+from common.broker import KEEP_ALIVE, Subscription
+
+SSE_KEEP_ALIVE_INTERVAL = 15.0
+SSE_HEADERS = {'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+
+STREAM_FORMATS = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson'
+}
+
+def _json_chunks(key: str, items: Iterable[dict]) -> Iterator[str]:
+    """
+    Yields `{"<key>": [item, item, ...]}` piece by piece.
+    """
+    yield f'{{"{key}": ['
+    separator = ''
+    for item in items:
+        yield separator + current_app.json.dumps(item)
+        separator = ','
+    yield ']}'
+
+def _ndjson_chunks(items: Iterable[dict]) -> Iterator[str]:
+    """
+    Yields one JSON document per line.
+    """
+    for item in items:
+        yield current_app.json.dumps(item) + '\n'
+
+def stream_response(key: str, items: Iterable[dict], fmt: str = 'json') -> Response:
+    """
+    Creates a streaming response for `items`, serialized as a JSON object holding
+    them under `key`, or as newline-delimited JSON.
+    """
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"Unsupported stream format: {fmt}")
+
+    chunks = _ndjson_chunks(items) if fmt == 'ndjson' else _json_chunks(key, items)
+    return Response(stream_with_context(chunks), mimetype=STREAM_FORMATS[fmt])
+
+def _event_frames(subscription: Subscription, keep_alive: float) -> Iterator[bytes]:
+    """
+    Yields the frames of a subscription, with a keep-alive comment whenever
+    none arrives for `keep_alive` seconds, until it is closed. Unsubscribes
+    when the client disconnects.
+    """
+    with subscription:
+        yield KEEP_ALIVE
+        while not subscription.closed:
+            frame = subscription.get(timeout=keep_alive)
+            yield KEEP_ALIVE if frame is None else frame
+
+def event_stream_response(subscription: Subscription,
+                          keep_alive: float = SSE_KEEP_ALIVE_INTERVAL) -> Response:
+    """
+    Creates a Server-Sent Events response streaming the events of `subscription`.
+    """
+    return Response(_event_frames(subscription, keep_alive),
+                    mimetype='text/event-stream', headers=SSE_HEADERS)
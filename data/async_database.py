@@ -0,0 +1,104 @@
+"""
+This module is the asyncio counterpart of `data.database`, used by the ASGI
+application. Queries run on connections borrowed from an asyncpg pool, so a
+request waiting on PostgreSQL does not hold a worker thread.
+
+Queries are written with the same `%s` placeholders as in `data.database` and
+return rows as tuples, so the services' SQL and row mapping are shared between
+both modes. asyncpg prepares and caches every statement per connection.
+Statements issued inside `async with transaction():` share one connection and
+are committed together.
+"""
+
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator
+import asyncpg
+from data.database import (
+    CONNECTION_SETTINGS, POOL_MAX_SIZE, POOL_MIN_SIZE, POOL_TIMEOUT,
+    numbered_placeholders, registered_statement
+)
+
+_pool: asyncpg.Pool | None = None
+_pool_settings = {'min_size': POOL_MIN_SIZE, 'max_size': POOL_MAX_SIZE, **CONNECTION_SETTINGS}
+
+_current_connection: ContextVar[asyncpg.Connection | None] = ContextVar(
+    "current_async_connection", default=None
+)
+
+def configure_pool(min_size: int = POOL_MIN_SIZE, max_size: int = POOL_MAX_SIZE,
+                   **connect_kwargs) -> None:
+    """
+    Sets the size and connection arguments (e.g. `dsn`) of the pool created by
+    `open_pool`. Defaults to the settings of `data.database`.
+    """
+    _pool_settings.clear()
+    _pool_settings.update(min_size=min_size, max_size=max_size,
+                          **(connect_kwargs or CONNECTION_SETTINGS))
+
+async def open_pool() -> asyncpg.Pool:
+    """
+    Creates the shared pool if it is not open yet and returns it.
+    """
+    global _pool
+    if _pool is None:
+        _pool = await asyncpg.create_pool(**_pool_settings)
+    return _pool
+
+async def close_pool() -> None:
+    """
+    Closes the shared pool and its connections.
+    """
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.close()
+
+@asynccontextmanager
+async def _connection() -> AsyncIterator[asyncpg.Connection]:
+    """
+    Yields the connection of the active transaction, or borrows one from the pool.
+    """
+    active = _current_connection.get()
+    if active is not None:
+        yield active
+        return
+
+    pool = await open_pool()
+    async with pool.acquire(timeout=POOL_TIMEOUT) as conn:
+        yield conn
+
+@asynccontextmanager
+async def transaction() -> AsyncIterator[asyncpg.Connection]:
+    """
+    Runs the enclosed queries on a single pooled connection with one commit.
+    Nested blocks reuse the outer transaction.
+    """
+    if _current_connection.get() is not None:
+        yield _current_connection.get()
+        return
+
+    pool = await open_pool()
+    async with pool.acquire(timeout=POOL_TIMEOUT) as conn:
+        async with conn.transaction():
+            token = _current_connection.set(conn)
+            try:
+                yield conn
+            finally:
+                _current_connection.reset(token)
+
+async def read_query(sql: str, sql_params: tuple = ()) -> list[tuple]:
+    """
+    Executes a read query and returns the results.
+    """
+    async with _connection() as conn:
+        rows = await conn.fetch(numbered_placeholders(sql)[0], *sql_params)
+    return [tuple(row) for row in rows]
+
+async def execute_statement(name: str, sql_params: tuple = ()) -> list[tuple]:
+    """
+    Executes the statement registered as `name` in `data.database` and returns the results.
+    """
+    async with _connection() as conn:
+        rows = await conn.fetch(registered_statement(name), *sql_params)
+    return [tuple(row) for row in rows]
@@ -1,60 +1,523 @@
 """
-This module handles database interactions, including querying, inserting, and 
+This module handles database interactions, including querying, inserting, and
 updating data in the PostgreSQL database.
+
+Queries run on connections borrowed from a shared connection pool, so the
+connection handshake is paid once per pooled connection instead of once per query.
+Statements issued inside `with transaction():` share one connection and are
+committed together. Large result sets can be consumed incrementally with
+`stream_query`, which reads through a server-side cursor.
+
+Every statement and connection checkout is recorded in the active `QueryLog`,
+if any, which is how per-request query counts and N+1 patterns are reported.
+
+Hot queries can be registered by name with `register_statement` and run with
+`execute_statement`, which prepares them once per pooled connection.
+
+`notify` sends PostgreSQL notifications, which `data.notifications` listens to.
+`on_commit` defers in-process side effects of a write until its transaction commits.
 """
 
+import itertools
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Callable, Iterator
+from weakref import WeakKeyDictionary
 import psycopg2
-from psycopg2.extensions import connection
+import psycopg2.errors
+from psycopg2.extensions import connection, cursor as Cursor
+from data.pool import ConnectionPool, PoolStats
+
+POOL_MIN_SIZE = 1
+POOL_MAX_SIZE = 10
+POOL_TIMEOUT = 30.0
+INSERT_MANY_PAGE_SIZE = 1000
+STREAM_ITERSIZE = 2000
+N_PLUS_ONE_THRESHOLD = 5
+
+_stream_ids = itertools.count(1)
+
+_statements: dict[str, tuple[str, int]] = {}
+_prepared: WeakKeyDictionary = WeakKeyDictionary()
+_prepared_lock = threading.Lock()
+
+CONNECTION_SETTINGS = {
+    'user': 'postgres',
+    'password': 'akonarch',
+    'host': 'localhost',
+    'port': 5432,
+    'database': 'basketball_match'
+}
 
 def _get_connection() -> connection:
     """
     Establishes and returns a connection to the PostgreSQL database.
     """
-    return psycopg2.connect(
-        user='postgres',
-        password='akonarch',
-        host='localhost',
-        port=5432,
-        database='basketball_match'
-    )
+    return psycopg2.connect(**CONNECTION_SETTINGS)
+
+_pool = ConnectionPool(
+    _get_connection, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE, timeout=POOL_TIMEOUT
+)
+
+def configure_pool(min_size: int = POOL_MIN_SIZE, max_size: int = POOL_MAX_SIZE,
+                   timeout: float = POOL_TIMEOUT,
+                   connect: Callable[[], connection] = _get_connection) -> ConnectionPool:
+    """
+    Replaces the shared connection pool with one using the given settings.
+    Idle connections of the previous pool are closed.
+    """
+    global _pool
+    old_pool = _pool
+    _pool = ConnectionPool(connect, min_size=min_size, max_size=max_size, timeout=timeout)
+    old_pool.close()
+    return _pool
+
+def pool_stats() -> PoolStats:
+    """
+    Returns the statistics of the shared connection pool.
+    """
+    return _pool.stats()
+
+class QueryLog:
+    """
+    Statements, database time and connection checkouts recorded while the log
+    is active, e.g. during one request.
+
+    Attributes:
+        queries (int): The number of statements executed.
+        db_time (float): Seconds spent executing statements.
+        connections (int): The number of connections borrowed from the pool.
+    """
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_time = 0.0
+        self.connections = 0
+        self._executions: Counter[str] = Counter()
+        self._params: defaultdict[str, set[int]] = defaultdict(set)
+        self._token: Token | None = None
+
+    def record(self, sql: str, sql_params: tuple | None, elapsed: float) -> None:
+        """
+        Records one executed statement.
+        """
+        self.queries += 1
+        self.db_time += elapsed
+        self._executions[sql] += 1
+        self._params[sql].add(hash(repr(sql_params)))
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> dict[str, int]:
+        """
+        Returns the statements executed with at least `threshold` different
+        parameter sets (the N+1 pattern), mapped to how often they ran.
+        """
+        return {
+            sql: self._executions[sql]
+            for sql, params in self._params.items() if len(params) >= threshold
+        }
+
+_query_log: ContextVar[QueryLog | None] = ContextVar("query_log", default=None)
+
+def start_query_log() -> QueryLog:
+    """
+    Starts recording the statements of the current context into a new log.
+    """
+    log = QueryLog()
+    log._token = _query_log.set(log)
+    return log
+
+def stop_query_log(log: QueryLog) -> None:
+    """
+    Stops recording into `log`, restoring the previously active log.
+    """
+    if log._token is None:
+        return
+    try:
+        _query_log.reset(log._token)
+    except ValueError:
+        # The token was created in another context (e.g. a streamed response
+        # finishing elsewhere); just make sure this log stops recording.
+        if _query_log.get() is log:
+            _query_log.set(None)
+    log._token = None
+
+@contextmanager
+def track_queries() -> Iterator[QueryLog]:
+    """
+    Records the statements executed inside the block.
+    """
+    log = start_query_log()
+    try:
+        yield log
+    finally:
+        stop_query_log(log)
+
+def _execute(cursor: Cursor, sql: str, sql_params: tuple | None = None) -> None:
+    """
+    Executes a statement, recording it in the active query log.
+    """
+    log = _query_log.get()
+    if log is None:
+        cursor.execute(sql, sql_params)
+        return
+
+    started = time.perf_counter()
+    try:
+        cursor.execute(sql, sql_params)
+    finally:
+        log.record(sql, sql_params, time.perf_counter() - started)
+
+@contextmanager
+def _checkout() -> Iterator[connection]:
+    """
+    Borrows a pooled connection, recording the checkout in the active query log.
+    """
+    log = _query_log.get()
+    if log is not None:
+        log.connections += 1
+    with _pool.connection() as conn:
+        yield conn
+
+@contextmanager
+def _connection() -> Iterator[connection]:
+    """
+    Borrows a pooled connection, committing on success and rolling back on error.
+    """
+    with _checkout() as conn:
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+
+def _expand_values(sql: str, rows: list[tuple]) -> tuple[str, tuple]:
+    """
+    Expands the single `VALUES %s` placeholder of `sql` into one row of
+    placeholders per parameter tuple and flattens the parameters.
+    """
+    row_template = "(" + ", ".join(["%s"] * len(rows[0])) + ")"
+    values = ", ".join([row_template] * len(rows))
+    head, tail = sql.split("VALUES %s", 1)
+    return f"{head}VALUES {values}{tail}", tuple(value for row in rows for value in row)
+
+def numbered_placeholders(sql: str) -> tuple[str, int]:
+    """
+    Rewrites the `%s` placeholders of `sql` as `$1`, `$2`, ... and returns the
+    rewritten SQL with the number of placeholders.
+    """
+    head, *parts = sql.split("%s")
+    return head + "".join(f"${i}{part}" for i, part in enumerate(parts, 1)), len(parts)
+
+def register_statement(name: str, sql: str) -> None:
+    """
+    Registers `sql`, written with `%s` placeholders, as the prepared statement
+    `name`. It is prepared on a connection the first time it runs there.
+    """
+    if not name.isidentifier():
+        raise ValueError(f"Invalid statement name: {name}")
+
+    numbered, param_count = numbered_placeholders(sql)
+    if _statements.get(name, (numbered,))[0] != numbered:
+        raise ValueError(f"Statement {name} is already registered with different SQL")
+    _statements[name] = (numbered, param_count)
+
+def registered_statement(name: str) -> str:
+    """
+    Returns the numbered SQL of the registered statement `name`.
+    """
+    if name not in _statements:
+        raise ValueError(f"Unknown statement: {name}")
+    return _statements[name][0]
+
+def _prepared_on(conn: connection) -> set[str]:
+    """
+    Returns the names of the statements already prepared on `conn`.
+    """
+    with _prepared_lock:
+        prepared = _prepared.get(conn)
+        if prepared is None:
+            prepared = _prepared[conn] = set()
+        return prepared
+
+def _run_statement(conn: connection, cursor: Cursor, name: str,
+                   sql_params: tuple) -> list[tuple]:
+    """
+    Executes the registered statement `name` on `conn`, preparing it first if needed.
+    """
+    if name not in _statements:
+        raise ValueError(f"Unknown statement: {name}")
+    sql, param_count = _statements[name]
+
+    prepared = _prepared_on(conn)
+    if name not in prepared:
+        _execute(cursor, f"PREPARE {name} AS {sql}")
+        prepared.add(name)
+
+    arguments = f" ({', '.join(['%s'] * param_count)})" if param_count else ""
+    _execute(cursor, f"EXECUTE {name}{arguments}", sql_params)
+    return cursor.fetchall()
+
+class Transaction:
+    """
+    A unit of work running every statement on the same connection.
+
+    Obtained from `transaction()`; the work is committed once when the
+    `with` block exits and rolled back if it raises.
+    """
+    def __init__(self, conn: connection) -> None:
+        self._conn = conn
+        self._on_commit: list[Callable[[], None]] = []
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """
+        Registers `callback` to run after the transaction commits. It does
+        not run if the transaction is rolled back.
+        """
+        self._on_commit.append(callback)
+
+    def read_query(self, sql: str, sql_params: tuple = ()) -> list[tuple]:
+        """
+        Executes a read query inside the transaction and returns the results.
+        """
+        with self._conn.cursor() as cursor:
+            _execute(cursor, sql, sql_params)
+            return cursor.fetchall()
+
+    def execute_statement(self, name: str, sql_params: tuple = ()) -> list[tuple]:
+        """
+        Executes a registered prepared statement inside the transaction and
+        returns the results.
+        """
+        with self._conn.cursor() as cursor:
+            return _run_statement(self._conn, cursor, name, sql_params)
+
+    def insert_query(self, sql: str, sql_params: tuple = ()) -> int | None:
+        """
+        Executes an insert query inside the transaction and returns the generated ID
+        (if "RETURNING" is in the SQL query), or the last inserted ID.
+        """
+        with self._conn.cursor() as cursor:
+            _execute(cursor, sql, sql_params)
+
+            if "RETURNING" in sql:
+                return cursor.fetchone()[0]
+
+            _execute(cursor, "SAVEPOINT lastval")
+            try:
+                _execute(cursor, "SELECT LASTVAL();")
+                lastval = cursor.fetchone()
+                _execute(cursor, "RELEASE SAVEPOINT lastval")
+                return lastval[0] if lastval else None
+            except psycopg2.Error:
+                _execute(cursor, "ROLLBACK TO SAVEPOINT lastval")
+                return None
+
+    def update_query(self, sql: str, sql_params: tuple = ()) -> bool:
+        """
+        Executes an update query inside the transaction and returns whether any
+        rows were affected.
+        """
+        with self._conn.cursor() as cursor:
+            _execute(cursor, sql, sql_params)
+            return cursor.rowcount > 0
+
+    def insert_many(self, sql: str, rows: list[tuple]) -> list[int] | int:
+        """
+        Inserts many rows with multi-row `INSERT ... VALUES` statements.
+
+        `sql` must contain a single `VALUES %s` placeholder. Returns the generated
+        IDs in row order when "RETURNING" is in the SQL query, otherwise the
+        number of affected rows.
+        """
+        returning = "RETURNING" in sql
+        ids, affected = [], 0
+        with self._conn.cursor() as cursor:
+            for start in range(0, len(rows), INSERT_MANY_PAGE_SIZE):
+                page_sql, page_params = _expand_values(
+                    sql, rows[start:start + INSERT_MANY_PAGE_SIZE]
+                )
+                _execute(cursor, page_sql, page_params)
+                if returning:
+                    ids.extend(row[0] for row in cursor.fetchall())
+                else:
+                    affected += cursor.rowcount
+
+        return ids if returning else affected
+
+    def stream_query(self, sql: str, sql_params: tuple = (),
+                     itersize: int = STREAM_ITERSIZE) -> Iterator[tuple]:
+        """
+        Yields the rows of a read query inside the transaction through a
+        server-side cursor.
+        """
+        yield from _stream_rows(self._conn, sql, sql_params, itersize)
+
+def _stream_rows(conn: connection, sql: str, sql_params: tuple,
+                 itersize: int) -> Iterator[tuple]:
+    """
+    Yields the rows of a query read through a named cursor on `conn`.
+    """
+    with conn.cursor(name=f"stream_{next(_stream_ids)}") as cursor:
+        cursor.itersize = itersize
+        _execute(cursor, sql, sql_params)
+        yield from cursor
+
+_current_transaction: ContextVar[Transaction | None] = ContextVar(
+    "current_transaction", default=None
+)
+
+@contextmanager
+def transaction() -> Iterator[Transaction]:
+    """
+    Runs the enclosed statements on a single pooled connection with one commit.
+
+    The module level query helpers join the active transaction, so service
+    functions called inside the block share it. Nested blocks reuse the
+    outer transaction.
+    """
+    active = _current_transaction.get()
+    if active is not None:
+        yield active
+        return
+
+    with _connection() as conn:
+        tx = Transaction(conn)
+        token = _current_transaction.set(tx)
+        try:
+            yield tx
+        finally:
+            _current_transaction.reset(token)
+
+    for callback in tx._on_commit:
+        callback()
+
+def on_commit(callback: Callable[[], None]) -> None:
+    """
+    Runs `callback` once the active transaction commits, or right away outside
+    a transaction, where every statement is committed as soon as it runs.
+    """
+    tx = _current_transaction.get()
+    if tx is None:
+        callback()
+    else:
+        tx.on_commit(callback)
 
 def read_query(sql: str, sql_params: tuple = ()) -> list[tuple]:
     """
     Executes a read query on the database and returns the results.
     """
-    with _get_connection() as conn:
+    tx = _current_transaction.get()
+    if tx is not None:
+        return tx.read_query(sql, sql_params)
+
+    with _connection() as conn:
         with conn.cursor() as cursor:
-            cursor.execute(sql, sql_params)
+            _execute(cursor, sql, sql_params)
             return cursor.fetchall()
 
+def execute_statement(name: str, sql_params: tuple = ()) -> list[tuple]:
+    """
+    Executes the prepared statement registered as `name` and returns the results.
+
+    Connections replaced by the pool start without prepared statements and
+    prepare them again on first use. If the server no longer knows a
+    statement, it is prepared again and the call retried once.
+    """
+    tx = _current_transaction.get()
+    if tx is not None:
+        return tx.execute_statement(name, sql_params)
+
+    with _connection() as conn:
+        with conn.cursor() as cursor:
+            try:
+                return _run_statement(conn, cursor, name, sql_params)
+            except psycopg2.errors.InvalidSqlStatementName:
+                conn.rollback()
+                _prepared_on(conn).discard(name)
+            except psycopg2.errors.DuplicatePreparedStatement:
+                conn.rollback()
+                _prepared_on(conn).add(name)
+            return _run_statement(conn, cursor, name, sql_params)
+
 def insert_query(sql: str, sql_params: tuple = ()) -> int | None:
     """
     Executes an insert query on the database and returns the generated ID
     (if "RETURNING" is in the SQL query), or the last inserted ID.
     """
-    with _get_connection() as conn:
+    tx = _current_transaction.get()
+    if tx is not None:
+        return tx.insert_query(sql, sql_params)
+
+    with _connection() as conn:
         with conn.cursor() as cursor:
-            cursor.execute(sql, sql_params)
+            _execute(cursor, sql, sql_params)
             conn.commit()
 
             if "RETURNING" in sql:
                 return cursor.fetchone()[0]
 
             try:
-                cursor.execute("SELECT LASTVAL();")
+                _execute(cursor, "SELECT LASTVAL();")
                 lastval = cursor.fetchone()
                 if lastval:
                     return lastval[0]
                 return None
             except psycopg2.Error:
+                conn.rollback()
                 return None
 
 def update_query(sql: str, sql_params: tuple = ()) -> bool:
     """
     Executes an update query on the database and returns whether any rows were affected.
     """
-    with _get_connection() as conn:
+    tx = _current_transaction.get()
+    if tx is not None:
+        return tx.update_query(sql, sql_params)
+
+    with _connection() as conn:
         with conn.cursor() as cursor:
-            cursor.execute(sql, sql_params)
-            conn.commit()
+            _execute(cursor, sql, sql_params)
             return cursor.rowcount > 0
+
+def insert_many(sql: str, rows: list[tuple]) -> list[int] | int:
+    """
+    Inserts many rows with multi-row `INSERT ... VALUES` statements in one
+    transaction. See `Transaction.insert_many`.
+    """
+    if not rows:
+        return [] if "RETURNING" in sql else 0
+
+    with transaction() as tx:
+        return tx.insert_many(sql, rows)
+
+def stream_query(sql: str, sql_params: tuple = (),
+                 itersize: int = STREAM_ITERSIZE) -> Iterator[tuple]:
+    """
+    Executes a read query through a named (server-side) cursor and yields rows
+    one at a time, fetching `itersize` rows per round-trip. The connection is
+    held until the generator is exhausted or closed.
+    """
+    tx = _current_transaction.get()
+    if tx is not None:
+        yield from tx.stream_query(sql, sql_params, itersize)
+        return
+
+    with _checkout() as conn:
+        try:
+            yield from _stream_rows(conn, sql, sql_params, itersize)
+        finally:
+            if not conn.closed:
+                conn.rollback()
+
+def notify(channel: str, payloads: list[str]) -> None:
+    """
+    Sends one NOTIFY per payload on `channel` in a single statement. Inside a
+    transaction the notifications are delivered to listeners only if it commits.
+    """
+    if payloads:
+        read_query("SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload",
+                   (channel, payloads))
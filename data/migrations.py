@@ -0,0 +1,152 @@
+"""
+This module holds the versioned schema migrations and the runner that applies
+the pending ones at startup.
+
+Applied versions are recorded in the `schema_migrations` table. Every statement
+is idempotent, so a database created from `Database/create_and_fill_database.sql`,
+which already contains the earlier tables, simply records those versions as applied.
+"""
+
+import logging
+from collections import namedtuple
+from data import database
+
+logger = logging.getLogger(__name__)
+
+Migration = namedtuple('Migration', ['version', 'name', 'statements'])
+
+MIGRATIONS = [
+    Migration(1, "token versions", [
+        """CREATE TABLE IF NOT EXISTS token_versions (
+             user_id INTEGER PRIMARY KEY,
+             version INTEGER NOT NULL DEFAULT 0
+           )"""
+    ]),
+    Migration(2, "knockout bracket links", [
+        "ALTER TABLE matchups ADD COLUMN IF NOT EXISTS next_matchup_id INTEGER DEFAULT NULL",
+        """ALTER TABLE matchups ADD COLUMN IF NOT EXISTS next_slot SMALLINT DEFAULT NULL
+           CHECK (next_slot IN (1, 2))""",
+        """DO $$ BEGIN
+             ALTER TABLE matchups ADD CONSTRAINT fk_matchup_next FOREIGN KEY (next_matchup_id)
+               REFERENCES matchups (id) ON DELETE NO ACTION ON UPDATE NO ACTION;
+           EXCEPTION WHEN duplicate_object THEN NULL;
+           END $$"""
+    ]),
+    Migration(3, "league standings", [
+        """CREATE TABLE IF NOT EXISTS league_standings (
+             tournament_id INTEGER NOT NULL REFERENCES tournament (id),
+             player_id INTEGER NOT NULL REFERENCES player (id),
+             played INTEGER NOT NULL DEFAULT 0,
+             wins INTEGER NOT NULL DEFAULT 0,
+             losses INTEGER NOT NULL DEFAULT 0,
+             points_for INTEGER NOT NULL DEFAULT 0,
+             points_against INTEGER NOT NULL DEFAULT 0,
+             point_differential INTEGER GENERATED ALWAYS AS (points_for - points_against) STORED,
+             PRIMARY KEY (tournament_id, player_id)
+           )"""
+    ]),
+    Migration(4, "player statistics", [
+        """CREATE TABLE IF NOT EXISTS player_stats (
+             player_id INTEGER PRIMARY KEY REFERENCES player (id) ON DELETE CASCADE,
+             matches_played INTEGER NOT NULL DEFAULT 0,
+             wins INTEGER NOT NULL DEFAULT 0,
+             total_points BIGINT NOT NULL DEFAULT 0,
+             titles INTEGER NOT NULL DEFAULT 0
+           )""",
+        "CREATE INDEX IF NOT EXISTS idx_player_stats_wins ON player_stats (wins DESC, player_id)",
+        """CREATE INDEX IF NOT EXISTS idx_player_stats_total_points
+           ON player_stats (total_points DESC, player_id)""",
+        "CREATE INDEX IF NOT EXISTS idx_player_stats_titles ON player_stats (titles DESC, player_id)"
+    ]),
+    # team_match_detail.match_id is already served by its (match_id, team_id) primary key,
+    # and users.email by the index of its email_UNIQUE constraint.
+    Migration(5, "indexes for hot predicates", [
+        """CREATE INDEX IF NOT EXISTS idx_matchups_tournament_phase
+           ON matchups (tournament_id, tournament_phase)""",
+        "CREATE INDEX IF NOT EXISTS idx_player_name ON player (first_name, second_name)",
+        "CREATE INDEX IF NOT EXISTS idx_player_team_id ON player (team_id)",
+        """CREATE INDEX IF NOT EXISTS idx_player_match_detail_match_id
+           ON player_match_detail (match_id)"""
+    ]),
+    Migration(6, "resource versions", [
+        """CREATE TABLE IF NOT EXISTS resource_versions (
+             family VARCHAR(32) PRIMARY KEY,
+             version BIGINT NOT NULL DEFAULT 0,
+             modified_at TIMESTAMPTZ NOT NULL DEFAULT now()
+           )""",
+        """INSERT INTO resource_versions (family) VALUES
+             ('tournaments'), ('players'), ('teams'), ('match_formats')
+           ON CONFLICT (family) DO NOTHING"""
+    ]),
+    Migration(7, "match versions", [
+        "INSERT INTO resource_versions (family) VALUES ('matches') ON CONFLICT (family) DO NOTHING"
+    ]),
+    # Brackets created before migration 2 have no links, and their empty rounds
+    # were numbered from phase 1. Their matchups were inserted round by round,
+    # so in id order the matchup at position i of a bracket of 2n - 1 matchups
+    # feeds position n + i // 2, like `link_knockout_bracket`, and belongs to the
+    # round given by the bit lengths of 2n and of the matchups left after it.
+    Migration(8, "backfill knockout bracket links", [
+        """WITH bracket AS (
+             SELECT m.id, m.tournament_id,
+                    row_number() OVER (PARTITION BY m.tournament_id ORDER BY m.id) - 1 AS position,
+                    count(*) OVER (PARTITION BY m.tournament_id) AS total
+             FROM matchups AS m
+             JOIN tournament AS t ON t.id = m.tournament_id
+             JOIN tournament_format AS f ON f.id = t.tournament_format_id
+             WHERE lower(f.name) = 'knockout'
+               AND NOT EXISTS (SELECT 1 FROM matchups AS linked
+                               WHERE linked.tournament_id = m.tournament_id
+                                 AND linked.next_matchup_id IS NOT NULL)
+           )
+           UPDATE matchups AS m
+           SET next_matchup_id = next.id,
+               next_slot = CASE WHEN next.id IS NULL THEN NULL ELSE b.position % 2 + 1 END,
+               tournament_phase = length(ltrim((b.total + 1)::int::bit(32)::text, '0'))
+                                  - length(ltrim((b.total - b.position)::int::bit(32)::text, '0'))
+           FROM bracket AS b
+           LEFT JOIN bracket AS next
+             ON next.tournament_id = b.tournament_id
+            AND next.position = (b.total + 1) / 2 + b.position / 2
+            AND b.position < b.total - 1
+           WHERE m.id = b.id AND b.total > 1 AND (b.total + 1) & b.total = 0"""
+    ]),
+]
+
+def applied_versions() -> set[int]:
+    """
+    Returns the migration versions already applied to the database.
+    """
+    return {version for version, in database.read_query("SELECT version FROM schema_migrations")}
+
+def apply_migrations(migrations: list[Migration] = MIGRATIONS) -> list[int]:
+    """
+    Applies the pending migrations in version order, in one transaction, and
+    returns their versions. Concurrent runners wait on a table lock, so each
+    migration is applied once.
+    """
+    with database.transaction() as tx:
+        tx.update_query(
+            """CREATE TABLE IF NOT EXISTS schema_migrations (
+                 version INTEGER PRIMARY KEY,
+                 name VARCHAR NOT NULL,
+                 applied_at TIMESTAMP NOT NULL DEFAULT now()
+               )"""
+        )
+        tx.update_query("LOCK TABLE schema_migrations IN EXCLUSIVE MODE")
+        done = applied_versions()
+
+        applied = []
+        for migration in sorted(migrations, key=lambda m: m.version):
+            if migration.version in done:
+                continue
+            for statement in migration.statements:
+                tx.update_query(statement)
+            tx.update_query(
+                "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                (migration.version, migration.name)
+            )
+            logger.info("Applied migration %s: %s", migration.version, migration.name)
+            applied.append(migration.version)
+
+    return applied
@@ -4,8 +4,21 @@ Module containing models and utilities for tournament-related data.
 from collections import namedtuple
 from datetime import date
 from enum import Enum
+from functools import lru_cache
 import re
-from pydantic import BaseModel
+from typing import Annotated
+from pydantic import BaseModel, PlainSerializer
+from werkzeug.http import http_date
+
+@lru_cache(maxsize=4096)
+def format_http_date(value: date) -> str:
+    """
+    Formats a date as an HTTP date, like Flask's JSON provider does. Results
+    are cached since responses repeat the same few dates many times.
+    """
+    return http_date(value)
+
+HttpDate = Annotated[date, PlainSerializer(format_http_date, return_type=str, when_used='json')]
 
 PlayerData = namedtuple('PlayerData', ['id', 'first_name', 'second_name', 'country', 'team'])
 UserInfo = namedtuple('UserInfo', ['id', 'email', 'password', 'role', 'name'])
@@ -24,6 +37,7 @@ TournamentData = namedtuple(
         'id', 'title', 'prize', 'format_id', 'winner', 'players', 'matchups'
     ]
 )
+Page = namedtuple('Page', ['items', 'next_key'])
 
 class Team(BaseModel):
     """
@@ -60,6 +74,43 @@ class Player(BaseModel):
         """
         return cls(**player_data._asdict())
 
+class PlayerStats(BaseModel):
+    """
+    Represents a player's career statistics.
+
+    Attributes:
+        player_id (int): The player's ID.
+        first_name (str | None): The player's first name.
+        second_name (str | None): The player's second name.
+        matches_played (int): The number of scored matches and matchups played.
+        wins (int): The number of matches and matchups won.
+        total_points (int): The points scored over the career.
+        average_points (float): The points scored per match played.
+        titles (int): The number of tournaments won.
+    """
+    player_id: int
+    first_name: str | None = None
+    second_name: str | None = None
+    matches_played: int = 0
+    wins: int = 0
+    total_points: int = 0
+    average_points: float = 0.0
+    titles: int = 0
+
+    @classmethod
+    def from_query_result(cls, player_id: int, first_name: str | None, second_name: str | None,
+                          matches_played: int, wins: int, total_points: int,
+                          titles: int) -> "PlayerStats":
+        """
+        Creates a PlayerStats instance from query results.
+        """
+        return cls(
+            player_id=player_id, first_name=first_name, second_name=second_name,
+            matches_played=matches_played, wins=wins, total_points=total_points,
+            average_points=total_points / matches_played if matches_played else 0.0,
+            titles=titles
+        )
+
 class Role(str, Enum):
     """
     Enum representing the possible roles a user can have.
@@ -177,7 +228,7 @@ class Match(BaseModel):
     """
     id: int | None = None
     title: str | None = None
-    played_at: date = None
+    played_at: HttpDate = None
     match_format_id: int | None
 
     @classmethod
@@ -205,7 +256,7 @@ class PlayerMatch(BaseModel):
     """
     match_id: int
     title: str
-    played_at: date
+    played_at: HttpDate
     match_format_name: str
     player_id: list[int]
     player_name: list[str]
@@ -231,7 +282,7 @@ class TeamMatch(BaseModel):
     """
     match_id: int
     title: str
-    played_at: date
+    played_at: HttpDate
     match_format_name: str
     team_id: list[int]
     team_name: list[str]
@@ -303,7 +354,7 @@ class MatchUpdate(BaseModel):
         played_at (date): The new date the match was played, if updated.
     """
     title: str | None
-    played_at: date
+    played_at: HttpDate
 
 class MatchFormat(BaseModel):
     """
@@ -360,15 +411,19 @@ class MatchUp(BaseModel):
         player_two (int | None): The ID of the second player.
         player_one_score (int | None): The score of the first player in the matchup.
         player_two_score (int | None): The score of the second player in the matchup.
+        next_matchup_id (int | None): The knockout matchup the winner advances to, if any.
+        next_slot (int | None): The player slot (1 or 2) the winner takes in the next matchup.
     """
     id: int | None = None
     tournament_id: int | None = None
-    played_at: date | None = None
+    played_at: HttpDate | None = None
     tournament_phase: int | None = None
     player_one: int | None = None
     player_two: int | None = None
     player_one_score: int | None = None
     player_two_score: int | None = None
+    next_matchup_id: int | None = None
+    next_slot: int | None = None
 
 class Tournament(BaseModel):
     """
@@ -397,6 +452,31 @@ class Tournament(BaseModel):
         """
         return cls(**tournament_data._asdict())
 
+class LeagueStanding(BaseModel):
+    """
+    Model representing a player's standing in a league tournament.
+
+    Attributes:
+        player_id (int): The ID of the player.
+        first_name (str | None): The player's first name.
+        second_name (str | None): The player's second name.
+        played (int): The number of scored matchups the player took part in.
+        wins (int): The number of matchups won.
+        losses (int): The number of matchups lost.
+        points_for (int): The points scored by the player.
+        points_against (int): The points scored against the player.
+        point_differential (int): The points scored minus the points conceded.
+    """
+    player_id: int
+    first_name: str | None = None
+    second_name: str | None = None
+    played: int = 0
+    wins: int = 0
+    losses: int = 0
+    points_for: int = 0
+    points_against: int = 0
+    point_differential: int = 0
+
 class TournamentResponseModel(BaseModel):
     """
     Model representing the response data for a tournament.
@@ -0,0 +1,97 @@
+"""
+This module listens to PostgreSQL notifications on a dedicated connection.
+
+A `Listener` runs in a daemon thread outside the connection pool, since a
+listening connection must stay open and idle. It waits on the connection's
+socket and passes the payload of every notification on its channel to a
+callback. After a connection error it reconnects; notifications sent while
+it was disconnected are lost, so state derived from them can be read again
+in `on_listen`, which runs on every (re)connection once LISTEN is active.
+"""
+
+import logging
+import select
+import threading
+from typing import Callable
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT, connection
+from data.database import CONNECTION_SETTINGS
+from data.pool import PoolTimeout
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 5.0
+RETRY_DELAY = 1.0
+
+def _connect() -> connection:
+    return psycopg2.connect(**CONNECTION_SETTINGS)
+
+class Listener:
+    """
+    Calls `callback` with the payload of every notification on `channel`.
+    """
+    def __init__(self, channel: str, callback: Callable[[str], None],
+                 on_listen: Callable[[], None] | None = None,
+                 connect: Callable[[], connection] = _connect,
+                 poll_interval: float = POLL_INTERVAL, retry_delay: float = RETRY_DELAY) -> None:
+        if not channel.isidentifier():
+            raise ValueError(f"Invalid channel name: {channel}")
+        self.channel = channel
+        self._callback = callback
+        self._on_listen = on_listen
+        self._connect = connect
+        self._poll_interval = poll_interval
+        self._retry_delay = retry_delay
+        self._stopped = threading.Event()
+        self.listening = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"listen-{channel}", daemon=True)
+
+    def start(self) -> None:
+        """
+        Starts listening in the background.
+        """
+        self._thread.start()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Stops listening and waits up to `timeout` seconds for the thread to exit.
+        """
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            conn = None
+            try:
+                conn = self._connect()
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.channel}")
+                if self._on_listen is not None:
+                    self._on_listen()
+                self.listening.set()
+                self._receive(conn)
+            except (psycopg2.Error, PoolTimeout):
+                logger.warning("Listening on %s failed, reconnecting", self.channel, exc_info=True)
+                self._stopped.wait(self._retry_delay)
+            finally:
+                self.listening.clear()
+                if conn is not None:
+                    conn.close()
+
+    def _receive(self, conn: connection) -> None:
+        """
+        Dispatches notifications until the listener is stopped.
+        """
+        while not self._stopped.is_set():
+            readable, _, _ = select.select([conn], [], [], self._poll_interval)
+            if not readable:
+                continue
+            conn.poll()
+            while conn.notifies:
+                notification = conn.notifies.pop(0)
+                try:
+                    self._callback(notification.payload)
+                except Exception:
+                    logger.exception("Notification handler failed on %s", self.channel)
@@ -0,0 +1,229 @@
+"""
+This module provides a thread-safe connection pool used by the database layer
+to reuse PostgreSQL connections instead of opening a new one for every query.
+"""
+
+import threading
+import time
+from collections import deque, namedtuple
+from contextlib import contextmanager
+from typing import Callable, Iterator
+import psycopg2
+from psycopg2.extensions import connection
+
+PoolStats = namedtuple(
+    'PoolStats', [
+        'min_size', 'max_size', 'size', 'idle', 'in_use', 'peak_in_use',
+        'checkouts', 'waits', 'wait_time', 'created', 'discarded'
+    ]
+)
+
+class PoolTimeout(Exception):
+    """
+    Raised when no connection becomes available within the checkout timeout.
+    """
+
+class ConnectionPool:
+    """
+    A bounded pool of database connections.
+
+    Connections are created lazily up to `max_size` and kept idle between
+    checkouts. Idle connections are health checked before being handed out,
+    and broken ones are replaced transparently.
+
+    Attributes:
+        min_size (int): Connections opened on first use and kept open while idle.
+        max_size (int): Upper bound of connections open at the same time.
+        timeout (float): Seconds a checkout waits for a free connection.
+        health_check_after (float): Idle seconds after which a connection is pinged.
+    """
+    def __init__(self, connect: Callable[[], connection], min_size: int = 1,
+                 max_size: int = 10, timeout: float = 30.0,
+                 health_check_after: float = 30.0) -> None:
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool size: min={min_size}, max={max_size}")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_after = health_check_after
+
+        self._connect = connect
+        self._idle: deque[tuple[connection, float]] = deque()
+        self._in_use: set[int] = set()
+        self._size = 0
+        self._opened = False
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self._peak_in_use = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._created = 0
+        self._discarded = 0
+
+    def _open_connection(self) -> connection:
+        """
+        Opens a new connection. The caller must have reserved a slot in `_size`.
+        """
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._created += 1
+        return conn
+
+    def _warm_up(self) -> None:
+        """
+        Opens `min_size` idle connections the first time the pool is used.
+        """
+        with self._condition:
+            if self._opened:
+                return
+            self._opened = True
+            missing = max(self.min_size - self._size, 0)
+            self._size += missing
+
+        for _ in range(missing):
+            conn = self._open_connection()
+            with self._condition:
+                self._idle.append((conn, time.monotonic()))
+                self._condition.notify()
+
+    def _is_healthy(self, conn: connection, idle_since: float) -> bool:
+        """
+        Checks whether an idle connection can still be used.
+        """
+        if conn.closed:
+            return False
+        if time.monotonic() - idle_since < self.health_check_after:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn: connection) -> None:
+        """
+        Closes a connection and frees its slot in the pool.
+        """
+        try:
+            if not conn.closed:
+                conn.close()
+        except psycopg2.Error:
+            pass
+
+        with self._condition:
+            self._size -= 1
+            self._discarded += 1
+            self._condition.notify()
+
+    def getconn(self) -> connection:
+        """
+        Checks out a healthy connection, waiting up to `timeout` seconds
+        when the pool is exhausted.
+        """
+        if self._closed:
+            raise PoolTimeout("Connection pool is closed")
+        if not self._opened:
+            self._warm_up()
+
+        started = time.monotonic()
+        waited = False
+        while True:
+            with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    remaining = self.timeout - (time.monotonic() - started)
+                    if remaining <= 0:
+                        raise PoolTimeout(
+                            f"No connection available within {self.timeout} seconds"
+                        )
+                    waited = True
+                    self._condition.wait(remaining)
+
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                else:
+                    conn, idle_since = None, 0.0
+                    self._size += 1
+
+            if conn is None:
+                conn = self._open_connection()
+            elif not self._is_healthy(conn, idle_since):
+                self._discard(conn)
+                continue
+
+            with self._condition:
+                self._in_use.add(id(conn))
+                self._checkouts += 1
+                self._peak_in_use = max(self._peak_in_use, len(self._in_use))
+                if waited:
+                    self._waits += 1
+                    self._wait_time += time.monotonic() - started
+            return conn
+
+    def putconn(self, conn: connection) -> None:
+        """
+        Returns a connection to the pool. Closed connections are discarded.
+        """
+        with self._condition:
+            self._in_use.discard(id(conn))
+
+        if self._closed or conn.closed:
+            self._discard(conn)
+            return
+
+        with self._condition:
+            self._idle.append((conn, time.monotonic()))
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[connection]:
+        """
+        Context manager that checks out a connection and always returns it.
+        """
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def close(self) -> None:
+        """
+        Closes all idle connections. Connections in use are closed on return.
+        """
+        with self._condition:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+
+        for conn in idle:
+            self._discard(conn)
+
+    def stats(self) -> PoolStats:
+        """
+        Returns a snapshot of the pool counters.
+        """
+        with self._condition:
+            return PoolStats(
+                min_size=self.min_size,
+                max_size=self.max_size,
+                size=self._size,
+                idle=len(self._idle),
+                in_use=len(self._in_use),
+                peak_in_use=self._peak_in_use,
+                checkouts=self._checkouts,
+                waits=self._waits,
+                wait_time=self._wait_time,
+                created=self._created,
+                discarded=self._discarded
+            )
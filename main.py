@@ -1,10 +1,18 @@
 """
 This is the main application file for the Flask web application.
 It sets up the routes and registers the blueprints for different modules such 
-as players, teams, and tournaments.
+as players, teams, and tournaments. Pending schema migrations are applied when the
+app is run directly, or with `flask --app main migrate` before starting another server.
+The response cache reads its size and shared socket from the `RESPONSE_CACHE_MAX_BYTES`
+and `RESPONSE_CACHE_SOCKET` settings, in the app config or the environment.
 """
 
+import logging
 from flask import Flask, render_template
+from common.json_provider import FastJSONProvider
+from common.request_stats import add_query_headers, finish_request_stats, start_request_stats
+from common.response_cache import configure_response_cache_from
+from data.migrations import apply_migrations
 from routers.player import player_blueprint
 from routers.team import team_blueprint
 from routers.user import user_blueprint
@@ -12,10 +20,21 @@ from routers.requests_router import requests_blueprint
 from routers.match import match_blueprint
 from routers.match_format import match_format_blueprint
 from routers.tournaments import tournaments_blueprint
+from routers.stats import stats_blueprint
+from utils import add_auth_timing, load_user
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///users.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+configure_response_cache_from(app.config)
+app.before_request(start_request_stats)
+app.before_request(load_user)
+app.after_request(add_query_headers)
+app.after_request(add_auth_timing)
+app.teardown_request(finish_request_stats)
+
+logging.basicConfig(level=logging.INFO, format='%(message)s')
 
 @app.route('/')
 @app.route('/home')
@@ -32,6 +51,15 @@ app.register_blueprint(requests_blueprint)
 app.register_blueprint(match_blueprint)
 app.register_blueprint(match_format_blueprint)
 app.register_blueprint(tournaments_blueprint)
+app.register_blueprint(stats_blueprint)
+
+@app.cli.command('migrate')
+def migrate():
+    """
+    Applies the pending schema migrations.
+    """
+    apply_migrations()
 
 if __name__ == '__main__':
+    apply_migrations()
     app.run(debug=True)
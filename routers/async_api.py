@@ -0,0 +1,255 @@
+"""
+This module defines the async read endpoints of the ASGI application. They
+answer on the same paths, with the same JSON and error responses, as the
+corresponding Flask views, but await the database through
+`services.async_services` instead of blocking a worker thread.
+"""
+
+from functools import wraps
+from typing import Any, AsyncIterator, Callable
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import StreamingResponse
+from werkzeug.http import http_date, quote_etag
+from werkzeug.sansio.http import is_resource_modified
+from common.broker import KEEP_ALIVE, AsyncSubscription
+from common.json_provider import dumps_bytes
+from common.pagination import encode_cursor, read_page_params
+from common.streaming import SSE_HEADERS, SSE_KEEP_ALIVE_INTERVAL
+from routers.match import match_data
+from routers.player import player_data
+from routers.team import team_data
+from routers.tournaments import tournament_data
+from routers.user import user_data
+from services import async_services, scoreboard_service, version_service
+
+async_router = APIRouter()
+
+class FlaskJSONResponse(Response):
+    """
+    JSON response encoded like the Flask app's JSON provider: compact, with
+    dates as HTTP dates and a trailing newline. Models are serialized directly.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content) + b"\n"
+
+def _bad_request(content: str) -> Response:
+    return Response(content, status_code=400, media_type="text/html")
+
+def _not_found(content: str) -> Response:
+    return Response(content, status_code=404, media_type="text/html")
+
+def _int_arg(request: Request, name: str, default: int) -> int:
+    """
+    Reads an integer query parameter, falling back to `default` like Flask's `type=int`.
+    """
+    try:
+        return int(request.query_params.get(name, default))
+    except ValueError:
+        return default
+
+def _conditional_get(*families: str) -> Callable:
+    """
+    Answers conditional requests from the versions of `families`, like
+    `common.conditional.conditional_get` does for the Flask views. The
+    handler must take the request as `request`.
+    """
+    def decorator(handler: Callable) -> Callable:
+        @wraps(handler)
+        async def wrapper(**kwargs) -> Response:
+            validators = version_service.validators(*families)
+            if validators is None:
+                return await handler(**kwargs)
+
+            etag, last_modified = validators
+            headers = kwargs["request"].headers
+            if is_resource_modified(http_if_none_match=headers.get("if-none-match"),
+                                    http_if_modified_since=headers.get("if-modified-since"),
+                                    etag=etag, last_modified=last_modified):
+                response = await handler(**kwargs)
+                if response.status_code != 200:
+                    return response
+            else:
+                response = Response(status_code=304)
+
+            response.headers["ETag"] = quote_etag(etag, weak=True)
+            response.headers["Last-Modified"] = http_date(last_modified)
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return wrapper
+    return decorator
+
+async def _event_frames(subscription: AsyncSubscription) -> AsyncIterator[bytes]:
+    """
+    Yields the frames of a subscription with keep-alive comments until it is
+    closed or the client disconnects.
+    """
+    try:
+        yield KEEP_ALIVE
+        while not subscription.closed:
+            frame = await subscription.get(timeout=SSE_KEEP_ALIVE_INTERVAL)
+            yield KEEP_ALIVE if frame is None else frame
+    finally:
+        subscription.close()
+
+def _event_stream(topic: str) -> StreamingResponse:
+    subscription = scoreboard_service.subscribe_async(topic)
+    return StreamingResponse(_event_frames(subscription), media_type="text/event-stream",
+                             headers=SSE_HEADERS)
+
+@async_router.get('/tournaments/all')
+@_conditional_get('tournaments', 'players')
+async def all_tournaments(request: Request) -> Response:
+    """
+    Retrieve one page of tournaments as JSON.
+    """
+    try:
+        limit, after = read_page_params(request.query_params)
+        page = await async_services.tournaments_page(limit, after)
+    except ValueError as e:
+        return _bad_request(str(e))
+
+    tournaments_data = [tournament_data(t) for t in page.items]
+    return FlaskJSONResponse(
+        {"tournaments": tournaments_data, "next_cursor": encode_cursor(page.next_key)}
+    )
+
+@async_router.get('/tournaments/{tournament_id:int}')
+async def get_tournament_by_id(tournament_id: int) -> Response:
+    """
+    Retrieve details of a specific tournament by ID.
+    """
+    tournament = await async_services.get_by_tournament_id(tournament_id)
+    if not tournament:
+        return _not_found('Not such tournament')
+
+    return FlaskJSONResponse(tournament)
+
+@async_router.get('/tournaments/{tournament_id:int}/live')
+async def watch_tournament(tournament_id: int) -> Response:
+    """
+    Stream the score, advance and winner events of a tournament as Server-Sent Events.
+    """
+    return _event_stream(scoreboard_service.tournament_topic(tournament_id))
+
+@async_router.get('/tournaments/league/{tournament_id:int}/standings')
+async def get_league_standings(tournament_id: int) -> Response:
+    """
+    Retrieve the standings of a league tournament, best first.
+    """
+    standings = await async_services.get_league_standings(tournament_id)
+    if not standings:
+        return _not_found('No standings for this league')
+
+    return FlaskJSONResponse({"standings": standings})
+
+@async_router.get('/match/playerMatch')
+@_conditional_get('matches', 'players')
+async def get_all_player_matches(request: Request) -> Response:
+    """
+    Retrieve one page of player matches ordered by date.
+    """
+    try:
+        limit, after = read_page_params(request.query_params)
+        page = await async_services.player_matches_page(limit, after)
+    except ValueError as e:
+        return _bad_request(str(e))
+
+    return FlaskJSONResponse({
+        "matches": [match_data(match, match.player_name) for match in page.items],
+        "next_cursor": encode_cursor(page.next_key)
+    })
+
+@async_router.get('/match/teamMatch')
+@_conditional_get('matches', 'teams')
+async def get_all_team_matches(request: Request) -> Response:
+    """
+    Retrieve one page of team matches ordered by date.
+    """
+    try:
+        limit, after = read_page_params(request.query_params)
+        page = await async_services.team_matches_page(limit, after)
+    except ValueError as e:
+        return _bad_request(str(e))
+
+    return FlaskJSONResponse({
+        "matches": [match_data(match, match.team_name) for match in page.items],
+        "next_cursor": encode_cursor(page.next_key)
+    })
+
+@async_router.get('/match/{match_id:int}/live')
+async def watch_match(match_id: int) -> Response:
+    """
+    Stream the score events of a player or team match as Server-Sent Events.
+    """
+    return _event_stream(scoreboard_service.match_topic(match_id))
+
+@async_router.get('/player/all')
+@_conditional_get('players', 'teams')
+async def all_players(request: Request) -> Response:
+    """
+    Retrieve one page of players.
+    """
+    try:
+        limit, after = read_page_params(request.query_params)
+        page = await async_services.players_page(limit, after)
+    except ValueError as e:
+        return _bad_request(str(e))
+
+    players_data = [player_data(player) for player in page.items]
+    return FlaskJSONResponse({"players": players_data, "next_cursor": encode_cursor(page.next_key)})
+
+@async_router.get('/player/{player_id:int}/stats')
+async def player_stats(player_id: int) -> Response:
+    """
+    Retrieve the career statistics of a player.
+    """
+    stats = await async_services.get_player_stats(player_id)
+    if not stats:
+        return _not_found("Player does not exist")
+
+    return FlaskJSONResponse(stats)
+
+@async_router.get('/player/leaderboard')
+async def leaderboard(request: Request) -> Response:
+    """
+    Retrieve the best players by `by` (wins, points or titles).
+    """
+    by = request.query_params.get('by', 'wins')
+    limit = _int_arg(request, 'limit', 10)
+    try:
+        players = await async_services.stats_leaderboard(by, limit)
+    except ValueError as e:
+        return _bad_request(str(e))
+
+    return FlaskJSONResponse({"by": by, "players": players})
+
+@async_router.get('/team/all')
+@_conditional_get('teams')
+async def all_teams(request: Request) -> Response:
+    """
+    Retrieve one page of teams.
+    """
+    try:
+        limit, after = read_page_params(request.query_params)
+        page = await async_services.teams_page(limit, after)
+    except ValueError as e:
+        return _bad_request(str(e))
+
+    teams_data = [team_data(team) for team in page.items]
+    return FlaskJSONResponse({"teams": teams_data, "next_cursor": encode_cursor(page.next_key)})
+
+@async_router.get('/user/all')
+async def all_users(request: Request) -> Response:
+    """
+    Retrieve one page of registered users.
+    """
+    try:
+        limit, after = read_page_params(request.query_params)
+        page = await async_services.users_page(limit, after)
+    except ValueError as e:
+        return _bad_request(str(e))
+
+    users_data = [user_data(user) for user in page.items]
+    return FlaskJSONResponse({"users": users_data, "next_cursor": encode_cursor(page.next_key)})
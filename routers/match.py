@@ -13,52 +13,109 @@ only authorized users (admins or directors) can perform certain actions.
 
 from datetime import datetime, date
 from flask import request, Blueprint, render_template
-from services import match_service, team_service
+from services import match_service, scoreboard_service, team_service
 from data.models import PlayerMatchDetailUpdate, Match, TeamMatchDetailUpdate, Sort
-from utils import authenticate_user
-from common.responses import BadRequest, NotFound, Unauthorized, Successful, InternalServerError
+from utils import require_admin_or_director
+from common.responses import BadRequest, NotFound, Successful, InternalServerError
+from common.pagination import encode_cursor, page_params
+from common.streaming import STREAM_FORMATS, event_stream_response, stream_response
+from common.conditional import conditional_get
+from common.response_cache import cached_response
 
 match_blueprint = Blueprint('match', __name__, url_prefix='/match')
 
 @match_blueprint.get('/playerMatch')
-def get_all_player_matches(sort: Sort | None = None) -> list[dict[str, str | int]]:
+@conditional_get('matches', 'players')
+@cached_response('matches', 'players')
+def get_all_player_matches(sort: Sort | None = None) -> dict:
     """
-    Retrieve all player matches, optionally sorted.
+    Retrieve one page of player matches ordered by date, optionally sorted
+    within the page. Accepts `limit` and `cursor` query parameters.
     """
-    matches = match_service.all_player_matches()
-    sorted_matches = match_service.sort(matches, reverse=sort == 'desc') if sort else matches
+    try:
+        limit, after = page_params()
+        page = match_service.player_matches_page(limit, after)
+    except ValueError as e:
+        return BadRequest(str(e))
 
-    return [
-        {
-            "match_id": match.match_id,
-            "title": match.title,
-            "played_at": match.played_at,
-            "match_format_name": match.match_format_name,
-            "players": match.player_name,
-        }
-        for match in sorted_matches
-    ]
+    sorted_matches = match_service.sort(page.items, reverse=sort == 'desc') if sort else page.items
+
+    return {
+        "matches": [match_data(match, match.player_name) for match in sorted_matches],
+        "next_cursor": encode_cursor(page.next_key)
+    }
 
 @match_blueprint.get('/teamMatch')
-def get_all_team_matches(sort: str | None = None) -> list[dict[str, str | int]]:
+@conditional_get('matches', 'teams')
+@cached_response('matches', 'teams')
+def get_all_team_matches(sort: str | None = None) -> dict:
+    """
+    Retrieve one page of team matches ordered by date, optionally sorted
+    within the page. Accepts `limit` and `cursor` query parameters.
+    """
+    try:
+        limit, after = page_params()
+        page = match_service.team_matches_page(limit, after)
+    except ValueError as e:
+        return BadRequest(str(e))
+
+    sorted_matches = match_service.sort(page.items, reverse=sort == 'desc') if sort else page.items
+
+    return {
+        "matches": [match_data(match, match.team_name) for match in sorted_matches],
+        "next_cursor": encode_cursor(page.next_key)
+    }
+
+@match_blueprint.get('/playerMatch/export')
+def export_player_matches():
     """
-    Retrieve all team matches, optionally sorted.
+    Stream every player match as JSON, or as NDJSON with `?format=ndjson`.
     """
-    matches = match_service.all_team_matches()
-    sorted_matches = match_service.sort(matches, reverse=sort == 'desc') if sort else matches
+    fmt = request.args.get('format', 'json')
+    if fmt not in STREAM_FORMATS:
+        return BadRequest(f"Unsupported format: {fmt}")
 
-    return [
-        {
-            "match_id": match.match_id,
-            "title": match.title,
-            "played_at": match.played_at,
-            "match_format_name": match.match_format_name,
-            "players": match.team_name,
-        }
-        for match in sorted_matches
-    ]
+    matches = match_service.stream_player_matches()
+    return stream_response(
+        "matches", (match_data(match, match.player_name) for match in matches), fmt
+    )
+
+@match_blueprint.get('/teamMatch/export')
+def export_team_matches():
+    """
+    Stream every team match as JSON, or as NDJSON with `?format=ndjson`.
+    """
+    fmt = request.args.get('format', 'json')
+    if fmt not in STREAM_FORMATS:
+        return BadRequest(f"Unsupported format: {fmt}")
+
+    matches = match_service.stream_team_matches()
+    return stream_response(
+        "matches", (match_data(match, match.team_name) for match in matches), fmt
+    )
+
+@match_blueprint.get('/<int:match_id>/live')
+def watch_match(match_id: int):
+    """
+    Stream the score events of a player or team match as Server-Sent Events.
+    """
+    subscription = scoreboard_service.subscribe(scoreboard_service.match_topic(match_id))
+    return event_stream_response(subscription)
+
+def match_data(match, participants: list[str]) -> dict:
+    """
+    Builds the JSON representation of a player or team match.
+    """
+    return {
+        "match_id": match.match_id,
+        "title": match.title,
+        "played_at": match.played_at,
+        "match_format_name": match.match_format_name,
+        "players": participants,
+    }
 
 @match_blueprint.route('/playerMatches/', methods=['GET', 'POST'])
+@require_admin_or_director("Insufficient permissions to create a match.", methods=('POST',))
 def create_player_match() -> str:
     """
     Create a player match or render the form for adding a match.
@@ -68,13 +125,10 @@ def create_player_match() -> str:
 
     data = request.get_json()
     participants = data.get('participants', [])
-    user = authenticate_user()
 
     error_message = None
     if len(participants) < 2:
         error_message = "At least 2 players are required to create a match."
-    elif not user.is_admin() and not user.is_director():
-        error_message = "Insufficient permissions to create a match."
     elif not data.get('title'):
         error_message = "Match title is required."
     else:
@@ -100,6 +154,7 @@ def create_player_match() -> str:
         return BadRequest(f"Error: {e}")
 
 @match_blueprint.route('/teamMatches/', methods=['GET', 'POST'])
+@require_admin_or_director("Insufficient permissions to create a match.", methods=('POST',))
 def create_team_match() -> str:
     """
     Create a team match or render the form for adding a team match.
@@ -109,17 +164,15 @@ def create_team_match() -> str:
 
     data = request.get_json()
     teams = data.get('teams', [])
-    user = authenticate_user()
+    team_names = set(team_service.get_team_names())
 
     error_message = None
     if len(teams) < 2:
         error_message = "At least 2 teams are required to create a match."
-    elif not user.is_admin() and not user.is_director():
-        error_message = "Insufficient permissions to create a match."
     elif not data.get('title'):
         error_message = "Match title is required."
-    elif any(team not in team_service.get_team_names() for team in teams):
-        invalid_team = next(team for team in teams if team not in team_service.get_team_names())
+    elif any(team not in team_names for team in teams):
+        invalid_team = next(team for team in teams if team not in team_names)
         error_message = f"No such team: {invalid_team}"
     else:
         try:
@@ -144,15 +197,11 @@ def create_team_match() -> str:
         return BadRequest(f"Validation error: {e}")
 
 @match_blueprint.put('/playerMatchScore/<int:match_id>')
+@require_admin_or_director("Insufficient permissions to update the match.")
 def update_player_match_score(match_id: int) -> str:
     """
     Update player match scores.
     """
-    user = authenticate_user()
-
-    if not user.is_admin() and not user.is_director():
-        return Unauthorized("Insufficient permissions to update the match.")
-
     try:
         data = request.get_json()
 
@@ -178,19 +227,17 @@ def update_player_match_score(match_id: int) -> str:
     try:
         match_service.update_player_match_score(match_id, match_update)
         return Successful("Player match scores updated successfully!")
+    except ValueError as e:
+        return BadRequest(f"Invalid value: {str(e)}")
     except RuntimeError as e:
         return InternalServerError(f"Failed to update match scores: {str(e)}")
 
 @match_blueprint.put('/teamMatchScore/<int:team_id>')
+@require_admin_or_director("Insufficient permissions to update the match.")
 def update_team_match_score(team_id: int) -> str:
     """
     Update team match scores.
     """
-    user = authenticate_user()
-
-    if not user.is_admin() and not user.is_director():
-        return Unauthorized("Insufficient permissions to update the match.")
-
     try:
         data = request.get_json()
 
@@ -213,5 +260,56 @@ def update_team_match_score(team_id: int) -> str:
     if not match:
         return NotFound('No such match!')
 
-    match_service.update_team_match_score(team_id, match_update)
+    try:
+        match_service.update_team_match_score(team_id, match_update)
+    except ValueError as e:
+        return BadRequest(f"Invalid request data: {str(e)}")
     return Successful("Team match score updated successfully!")
+
+@match_blueprint.put('/playerMatchScores')
+@require_admin_or_director("Insufficient permissions to update the match.")
+def update_player_match_scores() -> str:
+    """
+    Update the player scores of several matches at once. Expects
+    `{"matches": [{"match_id": ..., "player_ids": [...], "score": [...]}, ...]}`.
+    """
+    try:
+        updates = {
+            int(entry["match_id"]): PlayerMatchDetailUpdate(**entry)
+            for entry in _score_entries(request.get_json())
+        }
+        count = match_service.update_player_match_scores(updates)
+    except (KeyError, TypeError, ValueError) as e:
+        return BadRequest(f"Invalid value: {str(e)}")
+
+    return Successful(f"Updated {count} player match scores.")
+
+@match_blueprint.put('/teamMatchScores')
+@require_admin_or_director("Insufficient permissions to update the match.")
+def update_team_match_scores() -> str:
+    """
+    Update the team scores of several matches at once. Expects
+    `{"matches": [{"match_id": ..., "team_ids": [...], "score": [...]}, ...]}`.
+    """
+    try:
+        updates = {
+            int(entry["match_id"]): TeamMatchDetailUpdate(**entry)
+            for entry in _score_entries(request.get_json())
+        }
+        count = match_service.update_team_match_scores(updates)
+    except (KeyError, TypeError, ValueError) as e:
+        return BadRequest(f"Invalid request data: {str(e)}")
+
+    return Successful(f"Updated {count} team match scores.")
+
+def _score_entries(data) -> list[dict]:
+    """
+    Returns the per-match entries of a bulk score request.
+    Raises ValueError if the body is not in the expected shape.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get("matches"), list) \
+            or not data["matches"]:
+        raise ValueError("Expected a JSON object with a non-empty 'matches' list.")
+    if not all(isinstance(entry, dict) for entry in data["matches"]):
+        raise ValueError("Each entry of 'matches' must be a JSON object.")
+    return data["matches"]
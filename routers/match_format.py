@@ -4,10 +4,12 @@ This module defines routes for handling match format operations.
 
 from flask import Blueprint, jsonify
 from services import match_format_service
+from common.conditional import conditional_get
 
 match_format_blueprint = Blueprint('match_format', __name__, url_prefix='/match_format')
 
 @match_format_blueprint.route('/', methods=['GET'])
+@conditional_get('match_formats')
 def all_formats():
     """
     Retrieve all match formats with their details.
@@ -3,15 +3,19 @@ This module defines routes for managing players in the application.
 It includes functionality to add, retrieve, delete, and get statistics for players.
 """
 
-from flask import request, Blueprint, render_template, redirect, url_for, jsonify
-from utils import authenticate_user
+from flask import g, request, Blueprint, render_template, redirect, url_for, jsonify
+from utils import require_admin_or_director, require_role
 from services import player_service
 from data.models import Player
-from common.responses import BadRequest, NotFound, Successful, Unauthorized
+from common.responses import BadRequest, NotFound, Successful
+from common.pagination import encode_cursor, page_params
+from common.conditional import conditional_get
+from common.response_cache import cached_response
 
 player_blueprint = Blueprint('player', __name__, url_prefix='/player')
 
 @player_blueprint.route('/', methods=['GET', 'POST'])
+@require_admin_or_director("Only directors and admins can add players", methods=('POST',))
 def add_player():
     """
     Add a new player or render the form for adding a player.
@@ -21,8 +25,6 @@ def add_player():
     if request.method == 'GET':
         return render_template('add_player.html')
 
-    user = authenticate_user()
-
     first_name = request.form.get('first_name')
     second_name = request.form.get('second_name')
     country = request.form.get('country')
@@ -37,45 +39,94 @@ def add_player():
     if not result:
         return BadRequest("Invalid team or player data")
 
-    role_route = f'user.dashboard_{user.role.lower()}'
+    role_route = f'user.dashboard_{g.user.role.lower()}'
     return redirect(url_for(role_route))
 
 @player_blueprint.route('/all', methods=['GET'])
+@conditional_get('players', 'teams')
+@cached_response('players', 'teams')
 def all_players():
     """
-    Retrieve all players from the database.
+    Retrieve one page of players from the database.
+    Accepts `limit` and `cursor` query parameters.
     Returns:
-        A JSON response containing details of all players.
+        A JSON response containing a page of players and the next cursor.
+    """
+    try:
+        limit, after = page_params()
+        page = player_service.players_page(limit, after)
+    except ValueError as e:
+        return BadRequest(str(e))
+
+    players_data = [player_data(player) for player in page.items]
+    return jsonify({"players": players_data, "next_cursor": encode_cursor(page.next_key)})
+
+def player_data(player: Player) -> dict:
+    """
+    Builds the JSON representation of a player in a list.
     """
-    players = player_service.all_players()
-    players_data = [
-        {
-            "id": player.id,
-            "first_name": player.first_name,
-            "second_name": player.second_name,
-            "country": player.country,
-            "team": player.team
-        }
-        for player in players
-    ]
-    return jsonify({"players": players_data})
+    return {
+        "id": player.id,
+        "first_name": player.first_name,
+        "second_name": player.second_name,
+        "country": player.country,
+        "team": player.team
+    }
 
 @player_blueprint.route('/<int:player_id>', methods=['DELETE'])
+@require_admin_or_director("Only directors and admins can delete players")
 def delete_player(player_id: int) -> str:
     """
     Delete a player by their ID.
     Returns:
         A success message if deleted, or an error if not authorized or player does not exist.
     """
-    user = authenticate_user()
-
     exists = player_service.get_player_by_id(player_id)
     if not exists:
         return NotFound("Player does not exist")
 
-    if not user.is_admin() and not user.is_director():
-        return Unauthorized("Only directors and admins can delete players")
-
     player_service.delete_player(player_id)
 
     return Successful(f"Player with ID={exists} successfully deleted!")
+
+@player_blueprint.route('/<int:player_id>/stats', methods=['GET'])
+def player_stats(player_id: int):
+    """
+    Retrieve the career statistics of a player.
+    Returns:
+        A JSON response with the statistics, or an error if the player does not exist.
+    """
+    stats = player_service.get_player_stats(player_id)
+    if not stats:
+        return NotFound("Player does not exist")
+
+    return jsonify(stats)
+
+@player_blueprint.route('/leaderboard', methods=['GET'])
+def leaderboard():
+    """
+    Retrieve the best players by `by` (wins, points or titles).
+    Accepts `by` and `limit` query parameters.
+    Returns:
+        A JSON response with the leaderboard.
+    """
+    by = request.args.get('by', 'wins')
+    limit = request.args.get('limit', 10, type=int)
+    try:
+        players = player_service.stats_leaderboard(by, limit)
+    except ValueError as e:
+        return BadRequest(str(e))
+
+    return jsonify({"by": by, "players": players})
+
+@player_blueprint.route('/stats/rebuild', methods=['POST'])
+@require_role('admin', message="Only admins can rebuild player statistics")
+def rebuild_stats():
+    """
+    Recompute every player's statistics from all recorded scores.
+    Returns:
+        A success message with the number of players with statistics.
+    """
+    count = player_service.rebuild_player_stats()
+
+    return Successful(f"Statistics rebuilt for {count} players")
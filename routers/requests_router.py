@@ -3,13 +3,14 @@ Module for handling user promotion requests.
 """
 
 from flask import request, Blueprint, render_template, jsonify
-from utils import authenticate_user
+from utils import require_admin_or_director
 from services import user_service
-from common.responses import NotFound, Unauthorized, BadRequest
+from common.responses import NotFound, BadRequest
 
 requests_blueprint = Blueprint('requests', __name__, url_prefix='/requests')
 
 @requests_blueprint.route('/', methods=['GET', 'POST'])
+@require_admin_or_director("You do not have permission to promote users", methods=('POST',))
 def promote_user():
     """
     Handle user promotion requests.
@@ -20,10 +21,6 @@ def promote_user():
     if request.method == 'GET':
         return render_template('promote_user.html')
 
-    user = authenticate_user()
-    if not user.is_admin() and not user.is_director():
-        return Unauthorized("You do not have permission to promote users")
-
     data = request.get_json()
     user_id = data.get('user_id')
     user_to_promote = user_service.get_user_by_id(user_id)
@@ -0,0 +1,24 @@
+"""
+This module defines the admin route reporting the runtime statistics of the
+application process: the state of the database connection pool, the time
+spent authenticating requests and the hit ratio of the response cache.
+"""
+
+from flask import Blueprint, jsonify
+from common.response_cache import response_cache_stats
+from data import database
+from utils import auth_stats, require_role
+
+stats_blueprint = Blueprint('stats', __name__, url_prefix='/stats')
+
+@stats_blueprint.route('/', methods=['GET'])
+@require_role('admin', message="Only admins can view statistics")
+def get_stats():
+    """
+    Retrieve the statistics of this process.
+    """
+    return jsonify({
+        "pool": database.pool_stats()._asdict(),
+        "auth": auth_stats()._asdict(),
+        "response_cache": response_cache_stats()._asdict(),
+    })
@@ -2,15 +2,19 @@
 Module for team-related routes, including adding, retrieving, and deleting teams.
 """
 
-from flask import request, Blueprint, jsonify, render_template, redirect, url_for
-from utils import authenticate_user
+from flask import g, request, Blueprint, jsonify, render_template, redirect, url_for
+from utils import require_admin_or_director
 from services import team_service, player_service
 from data.models import Team
-from common.responses import BadRequest, NotFound, Successful, Unauthorized
+from common.responses import BadRequest, NotFound, Successful
+from common.pagination import encode_cursor, page_params
+from common.conditional import conditional_get
+from common.response_cache import cached_response
 
 team_blueprint = Blueprint('team', __name__, url_prefix='/team')
 
 @team_blueprint.route('/', methods=['GET', 'POST'])
+@require_admin_or_director("Only directors and admins can create teams", methods=('POST',))
 def add_team():
     """
     Handle adding a new team.
@@ -21,10 +25,6 @@ def add_team():
     if request.method == 'GET':
         return render_template('add_team.html')
 
-    user = authenticate_user()
-    if not user.is_admin() and not user.is_director():
-        return Unauthorized("Only directors and admins can create teams")
-
     team_name = request.form.get('name')
     if not team_name:
         raise BadRequest("Team data is required")
@@ -35,31 +35,42 @@ def add_team():
     if not result:
         return BadRequest("Team name already taken")
 
-    role_route = f'user.dashboard_{user.role.lower()}'
+    role_route = f'user.dashboard_{g.user.role.lower()}'
     return redirect(url_for(role_route))
 
 @team_blueprint.route('/all', methods=['GET'])
+@conditional_get('teams')
+@cached_response('teams')
 def all_teams():
     """
-    Retrieve all teams as JSON.
+    Retrieve one page of teams as JSON.
+    Accepts `limit` and `cursor` query parameters.
     Returns:
-        A JSON object containing a list of all teams.
+        A JSON object containing a page of teams and the next cursor.
+    """
+    try:
+        limit, after = page_params()
+        page = team_service.teams_page(limit, after)
+    except ValueError as e:
+        return BadRequest(str(e))
+
+    teams_data = [team_data(team) for team in page.items]
+    return jsonify({"teams": teams_data, "next_cursor": encode_cursor(page.next_key)})
+
+def team_data(team: Team) -> dict:
+    """
+    Builds the JSON representation of a team in a list.
     """
-    teams = team_service.all_teams()
-    teams_data = [{"id": team.id, "name": team.name} for team in teams]
-    return jsonify({"teams": teams_data})
+    return {"id": team.id, "name": team.name}
 
 @team_blueprint.route('/<int:team_id>', methods=['DELETE'])
+@require_admin_or_director("Only directors and admins can delete teams")
 def delete_team(team_id: int) -> str:
     """
     Delete a team by its ID.
     Returns:
         JSON response indicating the result of the deletion.
     """
-    user = authenticate_user()
-    if not user.is_admin() and not user.is_director():
-        return Unauthorized("Only directors and admins can delete teams")
-
     team = team_service.get_team_by_id(team_id)
     if not team:
         return NotFound("Team does not exist")
@@ -6,22 +6,54 @@ viewing, and setting scores for knockouts and leagues.
 from datetime import date, datetime
 import random
 from flask import request, Blueprint, jsonify, render_template
-from utils import authenticate_user
+from utils import require_admin_or_director
 from data.models import Tournament
-from services import tournaments_service
-from common.responses import NoContent, NotFound, BadRequest, Successful, Unauthorized
+from services import scoreboard_service, tournaments_service
+from common.responses import NoContent, NotFound, BadRequest, Successful
+from common.pagination import encode_cursor, page_params
+from common.conditional import conditional_get
+from common.response_cache import cached_response
+from common.streaming import STREAM_FORMATS, event_stream_response, stream_response
 
 tournaments_blueprint = Blueprint('tournaments', __name__, url_prefix='/tournaments')
 
 @tournaments_blueprint.route('/all', methods=['GET'])
+@conditional_get('tournaments', 'players')
+@cached_response('tournaments', 'players')
 def all_tournaments():
     """
-    Retrieve all tournaments as JSON.
+    Retrieve one page of tournaments as JSON.
+    Accepts `limit` and `cursor` query parameters.
     Returns:
-        A JSON object containing a list of all tournaments.
+        A JSON object containing a page of tournaments and the next cursor.
     """
-    tournaments = tournaments_service.all_tournaments()
-    tournaments_data = [{
+    try:
+        limit, after = page_params()
+        page = tournaments_service.tournaments_page(limit, after)
+    except ValueError as e:
+        return BadRequest(str(e))
+
+    tournaments_data = [tournament_data(t) for t in page.items]
+
+    return jsonify({"tournaments": tournaments_data, "next_cursor": encode_cursor(page.next_key)})
+
+@tournaments_blueprint.route('/export', methods=['GET'])
+def export_tournaments():
+    """
+    Stream every tournament as JSON, or as NDJSON with `?format=ndjson`.
+    """
+    fmt = request.args.get('format', 'json')
+    if fmt not in STREAM_FORMATS:
+        return BadRequest(f"Unsupported format: {fmt}")
+
+    tournaments = tournaments_service.stream_tournaments()
+    return stream_response("tournaments", (tournament_data(t) for t in tournaments), fmt)
+
+def tournament_data(t: dict) -> dict:
+    """
+    Builds the JSON representation of a tournament in a list.
+    """
+    return {
         "id": t["id"],
         "title": t["title"],
         "prize": t["prize"],
@@ -29,25 +61,35 @@ def all_tournaments():
         "winner": t["winner"],
         "players": t["players"],
         "matches": t["matches"]
-    } for t in tournaments]
+    }
 
-    return jsonify({"tournaments": tournaments_data})
-
-@tournaments_blueprint.get('/{id}')
+@tournaments_blueprint.get('/<int:tournament_id>')
 def get_tournament_by_id(tournament_id: int) -> dict:
     """
     Retrieve details of a specific tournament by ID.
 
-    :param id: Tournament ID.
+    :param tournament_id: Tournament ID.
     :return: JSON response with tournament details or an error message.
     """
     tournament = tournaments_service.get_by_tournament_id(tournament_id)
     if not tournament:
         return NotFound('Not such tournament')
 
-    return tournament
+    return jsonify(tournament)
+
+@tournaments_blueprint.get('/<int:tournament_id>/live')
+def watch_tournament(tournament_id: int):
+    """
+    Stream the score, advance and winner events of a tournament as Server-Sent Events.
+
+    :param tournament_id: Tournament ID.
+    :return: An event stream that stays open until the client disconnects.
+    """
+    subscription = scoreboard_service.subscribe(scoreboard_service.tournament_topic(tournament_id))
+    return event_stream_response(subscription)
 
 @tournaments_blueprint.route('/knockout', methods=['GET', 'POST'])
+@require_admin_or_director('You are not authorized to create tournaments', methods=('POST',))
 def create_knockout_tournament() -> str:
     """
     Create a new knockout tournament.
@@ -69,10 +111,6 @@ def create_knockout_tournament() -> str:
 
     tournament = Tournament(title=title, prize=prize, format_id=format_id, winner=None)
 
-    user = authenticate_user()
-    if not (user.is_admin() or user.is_director()):
-        return Unauthorized('You are not authorized to create tournaments')
-
     if len(participants) not in [4, 8, 16, 32, 64, 128, 256]:
         return BadRequest('Participants count must be one of [4, 8, 16, 32, 64, 128, 256].')
 
@@ -86,6 +124,8 @@ def create_knockout_tournament() -> str:
     return Successful("Success")
 
 @tournaments_blueprint.route('/set_winner/<int:tournament_id>', methods=['GET', 'PUT'])
+@require_admin_or_director('You are not authorized to set tournament winners!',
+                           methods=('PUT',))
 def set_tournament_winner(tournament_id: int) -> str:
     """
     Sets the winner for a given tournament.
@@ -100,10 +140,6 @@ def set_tournament_winner(tournament_id: int) -> str:
     if not winner_id:
         return BadRequest("Winner ID is required!")
 
-    user = authenticate_user()
-    if not (user.is_admin() or user.is_director()):
-        return Unauthorized('You are not authorized to set tournament winners!')
-
     tournament = tournaments_service.get_by_tournament_id(tournament_id)
     if not tournament:
         return NotFound("Tournament not found!")
@@ -116,9 +152,11 @@ def set_tournament_winner(tournament_id: int) -> str:
     return Successful("Winner set successfully!")
 
 @tournaments_blueprint.put('/knockout/set_score/matchup/<int:match_id>')
+@require_admin_or_director('You do not have permission to set scores.')
 def set_scores(match_id: int) -> str:
     """
     Set scores for a specific matchup in a knockout tournament.
+    The winner advances to the next matchup, or wins the tournament after the final.
     """
     scores = request.get_json()
     score_one, score_two = scores.get('score_one', -1), scores.get('score_two', -1)
@@ -126,18 +164,21 @@ def set_scores(match_id: int) -> str:
     if score_one < 0 or score_two < 0 or score_one == score_two:
         return BadRequest('Invalid scores: Ensure scores are positive and not equal.')
 
-    user = authenticate_user()
-    if not user.is_admin() and not user.is_director():
-        return Unauthorized('You do not have permission to set scores.')
-
     matchup = tournaments_service.get_matchup(match_id)
     if not matchup:
         return NotFound('Matchup not found.')
+    if matchup.player_one is None or matchup.player_two is None:
+        return BadRequest('Both players of the matchup must be known before setting scores.')
+
+    tournament_format = tournaments_service.get_tournament_format(matchup.tournament_id)
+    if (tournament_format or "").lower() != "knockout":
+        return BadRequest('You can not set league tournament scores from here.')
 
-    tournaments_service.set_matchup_score(match_id, [score_one, score_two])
+    tournaments_service.set_knockout_score(match_id, [score_one, score_two])
     return Successful('Scores updated successfully.')
 
 @tournaments_blueprint.route('/league', methods=['GET', 'POST'])
+@require_admin_or_director('You are not authorized to create leagues', methods=('POST',))
 def create_league() -> str:
     """
     Creates a new league tournament.
@@ -163,10 +204,6 @@ def create_league() -> str:
     if starting_date < date.today():
         return BadRequest('Invalid date, cannot create tournaments in the past.')
 
-    user = authenticate_user()
-    if not (user.is_admin() or user.is_director()):
-        return Unauthorized('You are not authorized to create leagues')
-
     tournament = Tournament(title=title, prize=prize, format_id=format_id, winner=None)
 
     tournaments_service.create_league(
@@ -178,6 +215,7 @@ def create_league() -> str:
     return Successful("Success")
 
 @tournaments_blueprint.put('/league/set_score/matchup/<int:league_id>')
+@require_admin_or_director('You are not authorized to set scores!')
 def set_league_score(league_id: int) -> str:
     """
     Updates the scores for a specific matchup in a league tournament.
@@ -189,20 +227,30 @@ def set_league_score(league_id: int) -> str:
     if score_one < 0 or score_two < 0 or score_one == score_two:
         return BadRequest('Invalid scores: Ensure scores are positive and not equal.')
 
-    user = authenticate_user()
-    if not (user.is_admin() or user.is_director()):
-        return Unauthorized('You are not authorized to set scores!')
-
     matchup = tournaments_service.get_matchup(league_id)
     if not matchup:
         return NoContent('Non existing matchup!')
     if not matchup.id:
         return BadRequest('Invalid matchup ID!')
 
-    knockout = tournaments_service.get_by_tournament_id(matchup.tournament_id)
-    if not knockout.format == "league":
+    tournament_format = tournaments_service.get_tournament_format(matchup.tournament_id)
+    if (tournament_format or "").lower() != "league":
         return "You can not set knockout tournament scores from here"
 
     tournaments_service.set_matchup_score(matchup.id, [score_one, score_two])
 
     return Successful("Scores updated successfully!")
+
+@tournaments_blueprint.get('/league/<int:tournament_id>/standings')
+def get_league_standings(tournament_id: int):
+    """
+    Retrieve the standings of a league tournament, best first.
+
+    :param tournament_id: League tournament ID.
+    :return: JSON response with the standings or an error message.
+    """
+    standings = tournaments_service.get_league_standings(tournament_id)
+    if not standings:
+        return NotFound('No standings for this league')
+
+    return jsonify({"standings": standings})
@@ -5,7 +5,9 @@ Module for user-related operations, including registration, login, and dashboard
 from flask import request, Blueprint, render_template, redirect, url_for, make_response, jsonify, Response
 from services import user_service
 from services.user_service import create_token, find_user
-from data.models import LogInfo
+from data.models import LogInfo, User
+from common.pagination import encode_cursor, page_params
+from common.responses import BadRequest
 
 user_blueprint = Blueprint('user', __name__, url_prefix='/user')
 
@@ -95,29 +97,35 @@ def get_logged_in_user():
     token = request.cookies.get('access_token')
 
     if token:
-        loginfo = user_service.from_token(token)
-
-        if loginfo:
-            return user_service.find_user(loginfo)
+        return user_service.authenticated_user(token)
     return None
 
 @user_blueprint.route('/all', methods=['GET'])
 def all_users() -> Response:
     """
-    Retrieve all registered users as JSON.
+    Retrieve one page of registered users as JSON.
+    Accepts `limit` and `cursor` query parameters.
     Returns:
-        JSON object containing a list of users.
-    """
-    users = user_service.all_users()
-    users_data = [
-        {
-            "id": user.id,
-            "email": user.email,
-            "role": user.role
-        }
-        for user in users
-    ]
-    return jsonify({"users": users_data})
+        JSON object containing a page of users and the next cursor.
+    """
+    try:
+        limit, after = page_params()
+        page = user_service.users_page(limit, after)
+    except ValueError as e:
+        return BadRequest(str(e))
+
+    users_data = [user_data(user) for user in page.items]
+    return jsonify({"users": users_data, "next_cursor": encode_cursor(page.next_key)})
+
+def user_data(user: User) -> dict:
+    """
+    Builds the JSON representation of a user in a list.
+    """
+    return {
+        "id": user.id,
+        "email": user.email,
+        "role": user.role
+    }
 
 @user_blueprint.route('/dashboard_user')
 def dashboard_user() -> Response:
@@ -0,0 +1,104 @@
+"""
+This module provides the asyncio counterparts of the read services served by
+the ASGI application. Each function runs the SQL of its synchronous service
+through `data.async_database` and builds the same models from the rows, so
+both serving modes return identical data. The tournament detail cache is
+shared with the synchronous service.
+"""
+
+from data import async_database
+from data.models import LeagueStanding, Page, PlayerStats, TournamentResponseModel
+from services import match_service, player_service, team_service, tournaments_service, user_service
+
+async def tournaments_page(limit: int, after: tuple | None = None) -> Page:
+    """
+    Retrieves one page of tournaments ordered by ID.
+    """
+    rows = await async_database.read_query(
+        *tournaments_service.tournaments_page_query(limit, after)
+    )
+    return tournaments_service.tournaments_page_from_rows(rows, limit)
+
+async def get_by_tournament_id(tournament_id: int) -> TournamentResponseModel | None:
+    """
+    Retrieves detailed tournament information, including matchups and players, by tournament ID.
+    """
+    cached = tournaments_service.cached_tournament(tournament_id)
+    if cached is not None:
+        return cached
+
+    tournament_data = await async_database.read_query(
+        tournaments_service.TOURNAMENT_DETAIL_QUERY, (tournament_id,)
+    )
+    if not tournament_data:
+        return None
+
+    matchup_data = await async_database.read_query(
+        tournaments_service.TOURNAMENT_MATCHUPS_QUERY, (tournament_id,)
+    )
+    tournament = tournaments_service.tournament_detail(tournament_data[0], matchup_data)
+    tournaments_service.remember_tournament(tournament)
+    return tournament
+
+async def get_league_standings(tournament_id: int) -> list[LeagueStanding]:
+    """
+    Retrieves the standings of a league, best first.
+    """
+    rows = await async_database.read_query(
+        tournaments_service.LEAGUE_STANDINGS_QUERY, (tournament_id,)
+    )
+    return tournaments_service.league_standings_from_rows(rows)
+
+async def player_matches_page(limit: int, after: tuple | None = None) -> Page:
+    """
+    Fetches one page of player matches ordered by (played_at, match_id).
+    """
+    rows = await async_database.read_query(
+        *match_service.player_matches_page_query(limit, after)
+    )
+    return match_service.player_matches_page_from_rows(rows, limit)
+
+async def team_matches_page(limit: int, after: tuple | None = None) -> Page:
+    """
+    Fetches one page of team matches ordered by (played_at, match_id).
+    """
+    rows = await async_database.read_query(
+        *match_service.team_matches_page_query(limit, after)
+    )
+    return match_service.team_matches_page_from_rows(rows, limit)
+
+async def players_page(limit: int, after: tuple | None = None) -> Page:
+    """
+    Retrieves one page of players ordered by ID.
+    """
+    rows = await async_database.read_query(*player_service.players_page_query(limit, after))
+    return player_service.players_page_from_rows(rows, limit)
+
+async def get_player_stats(player_id: int) -> PlayerStats | None:
+    """
+    Retrieves the career statistics of a player, or None if the player does not exist.
+    """
+    data = await async_database.read_query(player_service.PLAYER_STATS_QUERY, (player_id,))
+    return PlayerStats.from_query_result(*data[0]) if data else None
+
+async def stats_leaderboard(by: str = 'wins', limit: int = 10) -> list[PlayerStats]:
+    """
+    Retrieves the `limit` best players by wins, points or titles.
+    Raises ValueError for other orderings.
+    """
+    data = await async_database.read_query(*player_service.leaderboard_query(by, limit))
+    return [PlayerStats.from_query_result(*row) for row in data]
+
+async def teams_page(limit: int, after: tuple | None = None) -> Page:
+    """
+    Retrieves one page of teams ordered by ID.
+    """
+    rows = await async_database.read_query(*team_service.teams_page_query(limit, after))
+    return team_service.teams_page_from_rows(rows, limit)
+
+async def users_page(limit: int, after: tuple | None = None) -> Page:
+    """
+    Fetches one page of users ordered by ID.
+    """
+    rows = await async_database.read_query(*user_service.users_page_query(limit, after))
+    return user_service.users_page_from_rows(rows, limit)
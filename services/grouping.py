@@ -0,0 +1,58 @@
+"""
+This module groups joined query rows (one row per parent/child pair) into one
+record per parent in a single pass. Rows must arrive sorted, or at least
+clustered, by the parent id in their first column.
+"""
+
+from itertools import islice
+from typing import Iterable, Iterator, TypeVar
+from pydantic import BaseModel, TypeAdapter
+
+MODEL_BATCH_SIZE = 1000
+
+M = TypeVar('M', bound=BaseModel)
+
+_adapters: dict[type, TypeAdapter] = {}
+
+def group_matches(rows: Iterable[tuple], ids_field: str, names_field: str) -> Iterator[dict]:
+    """
+    Groups (match_id, title, played_at, format, participant_id, participant_name)
+    rows into one dictionary per match, holding the participant ids and names
+    as lists under `ids_field` and `names_field`.
+    """
+    record = None
+    for match_id, title, played_at, match_format_name, participant_id, participant_name in rows:
+        if record is None or match_id != record["match_id"]:
+            if record is not None:
+                yield record
+            ids, names, seen = [], [], set()
+            record = {
+                "match_id": match_id,
+                "title": title,
+                "played_at": played_at,
+                "match_format_name": match_format_name,
+                ids_field: ids,
+                names_field: names,
+            }
+
+        if participant_id is not None and participant_id not in seen:
+            seen.add(participant_id)
+            ids.append(participant_id)
+            names.append(participant_name)
+
+    if record is not None:
+        yield record
+
+def build_models(model: type[M], records: Iterable[dict],
+                 batch_size: int = MODEL_BATCH_SIZE) -> Iterator[M]:
+    """
+    Validates `records` into `model` instances, `batch_size` at a time, so each
+    batch is handed to pydantic's validator in a single call.
+    """
+    adapter = _adapters.get(model)
+    if adapter is None:
+        adapter = _adapters[model] = TypeAdapter(list[model])
+
+    records = iter(records)
+    while batch := list(islice(records, batch_size)):
+        yield from adapter.validate_python(batch)
@@ -2,8 +2,8 @@
 Service layer for handling match format operations.
 """
 
-from data.database import read_query
 from data.models import MatchFormat
+from services import reference_service
 
 def all_formats():
     """
@@ -11,8 +11,7 @@ def all_formats():
     Returns:
         Generator of MatchFormat instances for all match formats.
     """
-    query = read_query("SELECT * from match_format")
-    return (MatchFormat(id=t[0], name=t[1]) for t in query)
+    return (MatchFormat(id=t[0], name=t[1]) for t in reference_service.match_formats.items())
 
 def get_by_id(match_format_id: int) -> MatchFormat | None:
     """
@@ -20,12 +19,8 @@ def get_by_id(match_format_id: int) -> MatchFormat | None:
     Returns:
         MatchFormat or None: The MatchFormat instance if found, otherwise None.
     """
-    format_data = read_query(
-        '''SELECT id, name
-           FROM match_format
-           WHERE id = %s''', (match_format_id,)
-    )
-    return next((MatchFormat.from_query_result(*row) for row in format_data), None)
+    name = reference_service.match_formats.name_of(match_format_id)
+    return MatchFormat.from_query_result(match_format_id, name) if name is not None else None
 
 def sort(categories: list[MatchFormat], *, attribute="name", reverse=False) -> list[MatchFormat]:
     """
@@ -4,69 +4,160 @@ for fetching and updating match details, as well as managing player and team mat
 statistics. It interfaces with the database to read and write match-related data.
 """
 
-from data.database import read_query, insert_query, update_query
+from typing import Iterable, Iterator
+from common.pagination import match_key
+from data.database import read_query, insert_many, transaction, stream_query
 from data.models import (
     Match, PlayerMatchDetailUpdate, TeamMatchDetailUpdate, TeamMatchInfo,
-    PlayerMatchInfo, TeamMatch, PlayerMatch, TeamMatchData, PlayerMatchData
+    PlayerMatchInfo, TeamMatch, PlayerMatch, Page
 )
-from services import player_service, team_service
+from services import player_service, scoreboard_service, team_service, version_service
+from services.grouping import build_models, group_matches
+from services.player_stats import merge_deltas, result_deltas
 
-def all_player_matches() -> tuple:
+def player_matches_page(limit: int, after: tuple | None = None) -> Page:
     """
-    Fetches all player matches from the database. Optionally filters matches based 
-    on the provided search string.
+    Fetches one page of player matches ordered by (played_at, match_id).
+    `after` is the sort key of the last match of the previous page.
     """
-    data = read_query(
-        '''SELECT m.id as match_id, title, played_at, mf.name as match_format_name, 
-            p.id as player_id, 
+    data = read_query(*player_matches_page_query(limit, after))
+    return player_matches_page_from_rows(data, limit)
+
+def player_matches_page_query(limit: int, after: tuple | None = None) -> tuple[str, tuple]:
+    """
+    Builds the query and parameters fetching the participants of one page of
+    player matches plus one match telling whether there is a next page.
+    """
+    where, params = _page_filter("player_match_detail", after)
+    sql = f'''WITH page AS (
+                SELECT m.id, m.title, m.played_at, m.match_format_id
+                FROM match AS m
+                WHERE {where}
+                ORDER BY m.played_at, m.id
+                LIMIT %s)
+            SELECT m.id as match_id, title, played_at, mf.name as match_format_name,
+                p.id as player_id,
+                concat(p.first_name,' ', p.second_name) as player_name
+            FROM page AS m
+            JOIN player_match_detail AS pmd ON m.id = pmd.match_id
+            JOIN player as p ON p.id = pmd.player_id
+            LEFT JOIN match_format as mf ON m.match_format_id = mf.id
+            ORDER BY m.played_at, m.id'''
+    return sql, params + (limit + 1,)
+
+def player_matches_page_from_rows(rows: list[tuple], limit: int) -> Page:
+    """
+    Builds a page of player matches from the rows of `player_matches_page_query`.
+    """
+    return _page(list(_player_matches(rows)), limit)
+
+def stream_player_matches() -> Iterator[PlayerMatch]:
+    """
+    Streams every player match ordered by ID, grouping the participants of
+    each match as its rows arrive from a server-side cursor.
+    """
+    rows = stream_query(
+        '''SELECT m.id as match_id, title, played_at, mf.name as match_format_name,
+            p.id as player_id,
             concat(p.first_name,' ', p.second_name) as player_name
-            FROM match AS m 
-            LEFT JOIN player_match_detail AS pmd ON m.id = pmd.match_id
+            FROM match AS m
+            JOIN player_match_detail AS pmd ON m.id = pmd.match_id
             JOIN player as p ON p.id = pmd.player_id
-            LEFT JOIN match_format as mf ON m.match_format_id = mf.id''')
+            LEFT JOIN match_format as mf ON m.match_format_id = mf.id
+            ORDER BY m.id''')
 
-    flattened = {}
-    for match_id, title, played_at, match_format_name, player_id, player_name in data:
-        if match_id not in flattened:
-            flattened[match_id] = (match_id, title, played_at, match_format_name, [], [])
+    return _player_matches(rows)
 
-        if player_id not in flattened:
-            flattened[match_id][-2].append(player_id)
+def team_matches_page(limit: int, after: tuple | None = None) -> Page:
+    """
+    Fetches one page of team matches ordered by (played_at, match_id).
+    `after` is the sort key of the last match of the previous page.
+    """
+    data = read_query(*team_matches_page_query(limit, after))
+    return team_matches_page_from_rows(data, limit)
 
-        if player_name not in flattened:
-            flattened[match_id][5].append(player_name)
+def team_matches_page_query(limit: int, after: tuple | None = None) -> tuple[str, tuple]:
+    """
+    Builds the query and parameters fetching the participants of one page of
+    team matches plus one match telling whether there is a next page.
+    """
+    where, params = _page_filter("team_match_detail", after)
+    sql = f'''WITH page AS (
+                SELECT m.id, m.title, m.played_at, m.match_format_id
+                FROM match AS m
+                WHERE {where}
+                ORDER BY m.played_at, m.id
+                LIMIT %s)
+            SELECT m.id as match_id, title, played_at, mf.name as match_format_name,
+                t.id as team_id, t.name as team_name
+            FROM page AS m
+            JOIN team_match_detail AS tmd ON m.id = tmd.match_id
+            JOIN team as t ON t.id = tmd.team_id
+            LEFT JOIN match_format as mf ON m.match_format_id = mf.id
+            ORDER BY m.played_at, m.id'''
+    return sql, params + (limit + 1,)
 
-    return (PlayerMatch.from_query_result(PlayerMatchData(*obj)) for obj in flattened.values())
+def team_matches_page_from_rows(rows: list[tuple], limit: int) -> Page:
+    """
+    Builds a page of team matches from the rows of `team_matches_page_query`.
+    """
+    return _page(list(_team_matches(rows)), limit)
 
-def all_team_matches() -> tuple:
+def stream_team_matches() -> Iterator[TeamMatch]:
     """
-    Fetches all team matches from the database. Optionally filters matches based 
-    on the provided search string.
+    Streams every team match ordered by ID, grouping the participants of
+    each match as its rows arrive from a server-side cursor.
     """
-    data = read_query(
-        '''SELECT m.id as match_id, title, played_at, mf.name as match_format_name, 
+    rows = stream_query(
+        '''SELECT m.id as match_id, title, played_at, mf.name as match_format_name,
             t.id as team_id, t.name as team_name
-            FROM match AS m 
-            LEFT JOIN team_match_detail AS tmd ON m.id = tmd.match_id
+            FROM match AS m
+            JOIN team_match_detail AS tmd ON m.id = tmd.match_id
             JOIN team as t ON t.id = tmd.team_id
-            LEFT JOIN match_format as mf ON m.match_format_id = mf.id''')
+            LEFT JOIN match_format as mf ON m.match_format_id = mf.id
+            ORDER BY m.id''')
 
-    flattened = {}
-    for match_id, title, played_at, match_format_name, team_id, team_name, in data:
-        if match_id not in flattened:
-            flattened[match_id] = (match_id, title, played_at, match_format_name, [], [])
+    return _team_matches(rows)
 
-        if team_id not in flattened:
-            flattened[match_id][-2].append(team_id)
+def _page_filter(detail_table: str, after: tuple | None) -> tuple[str, tuple]:
+    """
+    Builds the WHERE clause selecting matches with rows in `detail_table`
+    that sort after the keyset `after`. Raises ValueError if `after` is not a
+    valid (played_at, match_id) key.
+    """
+    conditions = [f"EXISTS (SELECT 1 FROM {detail_table} AS d WHERE d.match_id = m.id)"]
+    params = ()
+    if after:
+        conditions.append("(m.played_at, m.id) > (%s, %s)")
+        params = match_key(after)
+    return " AND ".join(conditions), params
+
+def _player_matches(rows: Iterable[tuple]) -> Iterator[PlayerMatch]:
+    """
+    Builds PlayerMatch models from player match rows clustered by match ID.
+    """
+    return build_models(PlayerMatch, group_matches(rows, "player_id", "player_name"))
 
-        if team_name not in flattened:
-            flattened[match_id][5].append(team_name)
+def _team_matches(rows: Iterable[tuple]) -> Iterator[TeamMatch]:
+    """
+    Builds TeamMatch models from team match rows clustered by match ID.
+    """
+    return build_models(TeamMatch, group_matches(rows, "team_id", "team_name"))
 
-    return (TeamMatch.from_query_result(TeamMatchData(*obj)) for obj in flattened.values())
+def _page(matches: list, limit: int) -> Page:
+    """
+    Trims a list fetched with `limit + 1` rows and computes the next sort key.
+    """
+    if len(matches) <= limit:
+        return Page(matches, None)
+    last = matches[limit - 1]
+    return Page(matches[:limit], (last.played_at, last.match_id))
 
 def sort(categories: list[Match], *, attribute="title", reverse=False) -> list:
     """
-    Sorts a list of Match objects by a specified attribute.
+    Sorts a list of Match objects by a specified attribute. The list endpoints
+    pass one page at a time, so matches are only ordered within that page;
+    pages themselves follow the keyset order (date, then id).
     """
     if attribute == 'title':
         def sort_fn(m: Match):
@@ -169,85 +260,148 @@ def create_match_with_players(match: Match, participants: list[dict]) -> None:
             raise ValueError(f"Player with ID '{player_id}' does not exist.")
         match_players.append(player)
 
-    generated_id = insert_query(
-        'INSERT INTO match (title, played_at, match_format_id) VALUES (%s, %s, %s) RETURNING id',
-        (match.title, match.played_at, match.match_format_id)
-    )
-    match.id = generated_id
-
-    for player in match_players:
-        insert_query(
-            'INSERT INTO player_match_detail (player_id, match_id) VALUES (%s, %s)',
-            (player.id, match.id)
+    with transaction() as tx:
+        match.id = tx.insert_query(
+            'INSERT INTO match (title, played_at, match_format_id) VALUES (%s, %s, %s) RETURNING id',
+            (match.title, match.played_at, match.match_format_id)
         )
+        tx.insert_many(
+            'INSERT INTO player_match_detail (player_id, match_id) VALUES %s',
+            [(player.id, match.id) for player in match_players]
+        )
+        version_service.bump('matches')
 
 def create_with_teams(match: Match, teams: list[str]) -> None:
     """
     Creates a new match and associates it with a list of team participants.
     """
-    generated_id = insert_query(
-        'INSERT INTO match (title, played_at, match_format_id) VALUES (%s,%s,%s)',
-        (match.title, match.played_at, match.match_format_id))
-    match.id = generated_id
-
     team_ids = [team_service.get_team_id(t) for t in teams]
-    for team_id in team_ids:
-        insert_query(
-            'INSERT INTO team_match_detail (team_id, match_id) VALUES (%s,%s)',
-            (team_id, match.id)
+
+    with transaction() as tx:
+        match.id = tx.insert_query(
+            'INSERT INTO match (title, played_at, match_format_id) VALUES (%s,%s,%s) RETURNING id',
+            (match.title, match.played_at, match.match_format_id))
+        tx.insert_many(
+            'INSERT INTO team_match_detail (team_id, match_id) VALUES %s',
+            [(team_id, match.id) for team_id in team_ids]
         )
+        version_service.bump('matches')
 
-def player_match_exists(match_id: int, player_id: int) -> bool:
+def update_player_match_score(match_id: int, match_update: PlayerMatchDetailUpdate) -> None:
     """
-    Checks if a specific player has a record for a given match.
+    Updates the scores for player participants in a specific match.
+    If a player does not already have a record for the match, a new entry is created.
     """
-    data = read_query(
-        'SELECT 1 FROM player_match_detail WHERE match_id = %s AND player_id = %s',
-        (match_id, player_id)
-    )
-    return len(data) > 0
+    update_player_match_scores({match_id: match_update})
 
-def match_exists(match_id: int) -> bool:
+def update_player_match_scores(updates: dict[int, PlayerMatchDetailUpdate]) -> int:
     """
-    Checks if a match exists in player_match_detail.
+    Applies the player scores of several matches, keyed by match ID, in a single
+    UPSERT statement and updates the players' career statistics in the same
+    transaction. Returns the number of rows inserted or updated.
     """
-    data = read_query(
-        'SELECT 1 FROM player_match_detail WHERE match_id = %s LIMIT 1',
-        (match_id,)
-    )
-    return len(data) > 0
+    for match_id, match_update in updates.items():
+        _check_score_count(match_id, match_update.player_ids, match_update.score)
+
+    with transaction():
+        existing = read_query(
+            """SELECT match_id, player_id, score FROM player_match_detail
+               WHERE match_id = ANY(%s) FOR UPDATE""",
+            (list(updates),)
+        )
+        old_scores: dict[int, dict[int, int | None]] = {}
+        for match_id, player, score in existing:
+            old_scores.setdefault(match_id, {})[player] = score
+        missing = set(updates) - old_scores.keys()
+        if missing:
+            raise ValueError(f"Match {min(missing)} does not exist in player_match_detail!")
+
+        scores = {
+            (player, match_id): score
+            for match_id, match_update in updates.items()
+            for player, score in zip(match_update.player_ids, match_update.score)
+        }
+        affected = insert_many(
+            """INSERT INTO player_match_detail (player_id, match_id, score) VALUES %s
+               ON CONFLICT (player_id, match_id) DO UPDATE SET score = EXCLUDED.score""",
+            [(player, match_id, score) for (player, match_id), score in scores.items()]
+        )
 
-def update_player_match_score(match_id: int, match_update: PlayerMatchDetailUpdate) -> None:
+        new_scores = {match_id: dict(old) for match_id, old in old_scores.items()}
+        for (player, match_id), score in scores.items():
+            new_scores[match_id][player] = score
+        player_service.apply_stat_deltas(merge_deltas(*(
+            result_deltas(old_scores[match_id], new_scores[match_id]) for match_id in updates
+        )))
+        scoreboard_service.publish(_score_events(scores, "player_id"))
+        version_service.bump('matches')
+
+    return affected
+
+def update_team_match_score(match_id: int, match_update: TeamMatchDetailUpdate) -> int:
     """
-    Updates the scores for player participants in a specific match.
-    If a player does not already have a record for the match, a new entry is created.
+    Updates the scores for team participants in a specific match.
     """
-    if not match_exists(match_id):
-        raise ValueError(f"Match {match_id} does not exist in player_match_detail!")
-
-    for player, score in zip(match_update.player_ids, match_update.score):
-        if player_match_exists(match_id, player):
-            update_query(
-                """UPDATE player_match_detail
-                   SET score = %s 
-                   WHERE player_id = %s AND match_id = %s""",
-                (score, player, match_id)
-            )
-        else:
-            insert_query(
-                """INSERT INTO player_match_detail (player_id, match_id, score) 
-                   VALUES (%s, %s, %s)""",
-                (player, match_id, score)
-            )
+    return update_team_match_scores({match_id: match_update})
 
-def update_team_match_score(match_id: int, match_update: TeamMatchDetailUpdate) -> None:
+def update_team_match_scores(updates: dict[int, TeamMatchDetailUpdate]) -> int:
     """
-    Updates the scores for team participants in a specific match.
+    Applies the team scores of several matches, keyed by match ID, in a single
+    UPSERT statement. Only the teams already playing in a match can be scored.
+    Returns the number of rows updated.
     """
-    for team, score in zip(match_update.team_ids, match_update.score):
-        match = update_query("""UPDATE team_match_detail
-            SET score = %s WHERE team_id = %s and match_id = %s""",
-            (score, team, match_id)
+    for match_id, match_update in updates.items():
+        _check_score_count(match_id, match_update.team_ids, match_update.score)
+
+    scores = {
+        (team, match_id): score
+        for match_id, match_update in updates.items()
+        for team, score in zip(match_update.team_ids, match_update.score)
+    }
+    with transaction():
+        existing = read_query(
+            """SELECT match_id, team_id FROM team_match_detail
+               WHERE match_id = ANY(%s) FOR UPDATE""",
+            (list(updates),)
+        )
+        participants = {(team, match_id) for match_id, team in existing}
+        missing = set(updates) - {match_id for _, match_id in participants}
+        if missing:
+            raise ValueError(f"Match {min(missing)} does not exist in team_match_detail!")
+        outsiders = scores.keys() - participants
+        if outsiders:
+            team, match_id = min(outsiders, key=lambda key: (key[1], key[0]))
+            raise ValueError(f"Team {team} does not play in match {match_id}!")
+
+        affected = insert_many(
+            """INSERT INTO team_match_detail (match_id, team_id, score) VALUES %s
+               ON CONFLICT (match_id, team_id) DO UPDATE SET score = EXCLUDED.score""",
+            [(match_id, team, score) for (team, match_id), score in scores.items()]
         )
+        scoreboard_service.publish(_score_events(scores, "team_id"))
+        version_service.bump('matches')
+
+    return affected
 
-    return match
+def _check_score_count(match_id: int, participant_ids: list[int], scores: list[int]) -> None:
+    """
+    Raises ValueError unless there is exactly one score per participant.
+    """
+    if len(participant_ids) != len(scores):
+        raise ValueError(
+            f"Match {match_id}: got {len(scores)} scores for {len(participant_ids)} participants!"
+        )
+
+def _score_events(scores: dict[tuple[int, int], int],
+                  participant: str) -> list[tuple[str, str, dict]]:
+    """
+    Builds one live event per match with the new scores of its participants,
+    given scores keyed by (participant ID, match ID).
+    """
+    by_match: dict[int, list[dict]] = {}
+    for (participant_id, match_id), score in scores.items():
+        by_match.setdefault(match_id, []).append({participant: participant_id, "score": score})
+    return [
+        (scoreboard_service.match_topic(match_id), "score", {"match_id": match_id, "scores": entries})
+        for match_id, entries in by_match.items()
+    ]
@@ -3,19 +3,27 @@ Service layer for player-related operations, including CRUD functionality,
 team management, and player statistics.
 """
 
+import numpy as np
+from common.pagination import id_key
 from data import database
-from data.models import Player, User, UserInfo, PlayerData
-from services import team_service
+from data.models import Player, User, UserInfo, PlayerData, Page, PlayerStats
+from services import reference_service, team_service, version_service
+from services.player_stats import StatDelta, aggregate_results
+
+LEADERBOARD_COLUMNS = {
+    'wins': 'wins',
+    'points': 'total_points',
+    'titles': 'titles'
+}
+MAX_LEADERBOARD_SIZE = 100
 
 def country_names() -> list[str]:
-    """Fetch all country names from the database."""
-    names = database.read_query("SELECT name from country")
-    return [i[0] for i in names]
+    """Fetch all country names from the reference cache."""
+    return reference_service.countries.names()
 
-def country_id(name: str) -> int:
-    """Fetch the ID of a country given its name."""
-    c_id = database.read_query("SELECT id from country where name = %s", (name,))
-    return c_id[0][0]
+def country_id(name: str) -> int | None:
+    """Fetch the ID of a country given its name from the reference cache."""
+    return reference_service.countries.id_of(name)
 
 def create_player(player: Player) -> Player | None:
     """Create a new player in the database."""
@@ -24,11 +32,13 @@ def create_player(player: Player) -> Player | None:
         return None
 
     team_id = team_service.get_team_id(player.team) if player.team else None
-    generated_id = database.insert_query(
-        """INSERT INTO player (first_name, second_name, team_id, country_id)
-        VALUES (%s, %s, %s, %s)""",
-        (player.first_name, player.second_name, team_id, country_id(player.country))
-    )
+    with database.transaction():
+        generated_id = database.insert_query(
+            """INSERT INTO player (first_name, second_name, team_id, country_id)
+            VALUES (%s, %s, %s, %s)""",
+            (player.first_name, player.second_name, team_id, country_id(player.country))
+        )
+        version_service.bump('players')
     player.id = generated_id
     return player
 
@@ -53,70 +63,85 @@ def all_players(country: str = None, team: str = None) -> list[Player]:
     players = database.read_query(query, params)
     return [Player.from_query_result(PlayerData(*p)) for p in players]
 
+def players_page(limit: int, after: tuple | None = None) -> Page:
+    """Retrieve one page of players ordered by ID, starting after the key `after`."""
+    return players_page_from_rows(database.read_query(*players_page_query(limit, after)), limit)
+
+def players_page_query(limit: int, after: tuple | None = None) -> tuple[str, tuple]:
+    """
+    Build the query and parameters fetching one page of players plus one extra
+    row. Raises ValueError if `after` is not a valid (id,) key.
+    """
+    after = id_key(after)
+    keyset, params = ("WHERE player.id > %s", after) if after else ("", ())
+    sql = f"""SELECT player.id, first_name, second_name, country.name, team.name
+            FROM player
+            LEFT JOIN team ON team_id = team.id
+            LEFT JOIN country ON country_id = country.id
+            {keyset}
+            ORDER BY player.id
+            LIMIT %s"""
+    return sql, params + (limit + 1,)
+
+def players_page_from_rows(rows: list[tuple], limit: int) -> Page:
+    """Build a page of players from the rows of `players_page_query`."""
+    items = [Player.from_query_result(PlayerData(*p)) for p in rows[:limit]]
+    return Page(items, (items[-1].id,) if len(rows) > limit else None)
+
+database.register_statement(
+    "player_by_id",
+    """SELECT player.id, first_name, second_name, country.name, team.name
+       FROM player
+       LEFT JOIN team ON team_id = team.id
+       LEFT JOIN country ON country_id = country.id
+       WHERE player.id = %s"""
+)
+
 def get_player_by_id(player_id: int) -> Player | None:
     """Retrieve a player by their ID."""
-    player = database.read_query(
+    player = database.execute_statement("player_by_id", (player_id,))
+
+    return Player.from_query_result(PlayerData(*player[0])) if player else None
+
+def get_players_by_ids(player_ids: list[int]) -> dict[int, Player]:
+    """Retrieve several players in a single query, keyed by their ID."""
+    players = database.read_query(
         """SELECT player.id, first_name, second_name, country.name, team.name
            FROM player
            LEFT JOIN team ON team_id = team.id
            LEFT JOIN country ON country_id = country.id
-           WHERE player.id = %s""",
-        (player_id,)
+           WHERE player.id = ANY(%s)""",
+        (list(player_ids),)
     )
-
-    player_data = PlayerData(*player[0])
-    return Player.from_query_result(player_data) if player else None
+    return {p[0]: Player.from_query_result(PlayerData(*p)) for p in players}
 
 def null_team(team_id: int) -> None:
     """Set the team_id of all players in a team to NULL."""
-    database.update_query("UPDATE player set team_id = %s where team_id = %s",
-        (None, team_id)
-    )
+    with database.transaction():
+        database.update_query("UPDATE player set team_id = %s where team_id = %s",
+            (None, team_id)
+        )
+        version_service.bump('players')
 
 def delete_player(player_id: int) -> None:
     """Delete a player by their ID."""
-    database.update_query("DELETE from player where id = %s",
-        (player_id,)
-    )
-
-def get_tournament_players(tournament_id: int) -> list[Player]:
-    """
-    Retrieve all players participating in a tournament.
-    """
-    player_data = database.read_query("""SELECT player_one, p.first_name, p.second_name,
-        c.name, t.name, player_two, pt.first_name, pt.second_name, ct.name, tt.name
-        from matchups 
-        LEFT JOIN player as p on matchups.player_one = p.id 
-        LEFT JOIN team as t on p.team_id = t.id 
-        LEFT JOIN country as c on p.country_id = c.id
-        LEFT JOIN player as pt on matchups.player_two = pt.id 
-        LEFT JOIN team as tt on pt.team_id = tt.id 
-        LEFT JOIN country as ct on pt.country_id = ct.id
-        where tournament_id = %s and player_one is not NULL and player_two is not NULL""",
-        (tournament_id,)
-    )
-
-    players = []
-    for d in player_data:
-        player_one_info = PlayerData(d[0], d[1], d[2], d[3], d[4])
-        player_two_info = PlayerData(d[5], d[6], d[7], d[8], d[9])
-        players.extend([Player.from_query_result(player_one_info),
-                        Player.from_query_result(player_two_info)])
+    with database.transaction():
+        database.update_query("DELETE from player where id = %s",
+            (player_id,)
+        )
+        version_service.bump('players')
 
-    unique_players = []
-    for p in players:
-        if p not in unique_players:
-            unique_players.append(p)
-
-    return unique_players
+database.register_statement(
+    "player_by_name",
+    '''SELECT * FROM player
+       WHERE first_name = %s and second_name = %s'''
+)
 
 def get_player_by_name(fullname: str) -> Player | None:
     """Retrieve a player by their full name."""
     first_name, second_name = fullname.split(" ")
 
-    data = database.read_query(
-                '''SELECT * FROM player
-                    WHERE first_name = %s and second_name = %s''', (first_name,second_name))
+    data = database.execute_statement("player_by_name", (first_name, second_name))
 
     if not data:
         return None
@@ -126,11 +151,13 @@ def get_player_by_name(fullname: str) -> Player | None:
 
 def create_player_by_name(fullname: str) -> None:
     """Create a player profile using only their name."""
-    database.insert_query(
-        """INSERT INTO player (first_name, second_name, team_id, country_id)
-        values (%s,%s,%s,%s)""",
-        (fullname[0], fullname[1], None, None)
-    )
+    with database.transaction():
+        database.insert_query(
+            """INSERT INTO player (first_name, second_name, team_id, country_id)
+            values (%s,%s,%s,%s)""",
+            (fullname[0], fullname[1], None, None)
+        )
+        version_service.bump('players')
 
 def create_unknown_participants_profile(participants: list[str]) -> list[list[str]]:
     """
@@ -147,3 +174,105 @@ def create_unknown_participants_profile(participants: list[str]) -> list[list[st
             new_names.append([participant_first_name, participant_second_name])
 
     return new_names
+
+PLAYER_STATS_QUERY = """SELECT player.id, first_name, second_name,
+                  COALESCE(s.matches_played, 0), COALESCE(s.wins, 0),
+                  COALESCE(s.total_points, 0), COALESCE(s.titles, 0)
+           FROM player
+           LEFT JOIN player_stats AS s ON s.player_id = player.id
+           WHERE player.id = %s"""
+
+def get_player_stats(player_id: int) -> PlayerStats | None:
+    """Retrieve the career statistics of a player, or None if the player does not exist."""
+    data = database.read_query(PLAYER_STATS_QUERY, (player_id,))
+    return PlayerStats.from_query_result(*data[0]) if data else None
+
+def stats_leaderboard(by: str = 'wins', limit: int = 10) -> list[PlayerStats]:
+    """
+    Retrieve the `limit` best players by wins, points or titles. Each ordering
+    is served by its own index on player_stats. Raises ValueError for other orderings.
+    """
+    data = database.read_query(*leaderboard_query(by, limit))
+    return [PlayerStats.from_query_result(*row) for row in data]
+
+def leaderboard_query(by: str, limit: int) -> tuple[str, tuple]:
+    """
+    Build the query and parameters of a leaderboard. Raises ValueError for an
+    unknown ordering or a limit outside 1..MAX_LEADERBOARD_SIZE.
+    """
+    column = LEADERBOARD_COLUMNS.get(by)
+    if column is None:
+        raise ValueError(f"Leaderboard must be one of: {', '.join(LEADERBOARD_COLUMNS)}")
+    if not 1 <= limit <= MAX_LEADERBOARD_SIZE:
+        raise ValueError(f"limit must be between 1 and {MAX_LEADERBOARD_SIZE}")
+
+    sql = f"""SELECT s.player_id, p.first_name, p.second_name,
+                   s.matches_played, s.wins, s.total_points, s.titles
+            FROM player_stats AS s
+            JOIN player AS p ON p.id = s.player_id
+            ORDER BY s.{column} DESC, s.player_id
+            LIMIT %s"""
+    return sql, (limit,)
+
+def apply_stat_deltas(deltas: dict[int, StatDelta]) -> None:
+    """
+    Add per-player statistic deltas in one upsert. Call it inside the transaction
+    that changes the scores so both are committed together.
+    """
+    if not deltas:
+        return
+    database.insert_many(
+        """INSERT INTO player_stats (player_id, matches_played, wins, total_points, titles)
+           VALUES %s
+           ON CONFLICT (player_id) DO UPDATE SET
+               matches_played = player_stats.matches_played + EXCLUDED.matches_played,
+               wins = player_stats.wins + EXCLUDED.wins,
+               total_points = player_stats.total_points + EXCLUDED.total_points,
+               titles = player_stats.titles + EXCLUDED.titles""",
+        [(player_id, *delta) for player_id, delta in sorted(deltas.items())]
+    )
+
+def rebuild_player_stats() -> int:
+    """
+    Recompute every player's statistics from all scored matches, matchups and
+    tournament winners. Returns the number of players with statistics.
+    """
+    with database.transaction() as tx:
+        # Score updates wait for the rebuild and then apply their deltas on top.
+        tx.update_query("LOCK TABLE player_stats IN EXCLUSIVE MODE")
+        rows = tx.read_query(
+            """SELECT match_id * 2, player_id, score FROM player_match_detail
+               WHERE score IS NOT NULL
+               UNION ALL
+               SELECT id * 2 + 1, player_one, player_one_score FROM matchups
+               WHERE player_one IS NOT NULL AND player_one_score IS NOT NULL
+               UNION ALL
+               SELECT id * 2 + 1, player_two, player_two_score FROM matchups
+               WHERE player_two IS NOT NULL AND player_two_score IS NOT NULL"""
+        )
+        titles = dict(tx.read_query(
+            """SELECT winner, count(*) FROM tournament
+               WHERE winner IS NOT NULL GROUP BY winner"""
+        ))
+
+        results = np.array(rows, dtype=np.int64).reshape(-1, 3)
+        player_ids, played, wins, points = aggregate_results(
+            results[:, 0], results[:, 1], results[:, 2]
+        )
+        stats = {
+            player_id: [matches, won, total, titles.pop(player_id, 0)]
+            for player_id, matches, won, total in zip(
+                player_ids.tolist(), played.tolist(), wins.tolist(), points.tolist()
+            )
+        }
+        stats.update((player_id, [0, 0, 0, count]) for player_id, count in titles.items())
+
+        tx.update_query("DELETE FROM player_stats")
+        if stats:
+            tx.insert_many(
+                """INSERT INTO player_stats (player_id, matches_played, wins, total_points, titles)
+                   VALUES %s""",
+                [(player_id, *values) for player_id, values in sorted(stats.items())]
+            )
+
+    return len(stats)
@@ -0,0 +1,96 @@
+"""
+This module turns scored results into per-player career statistics: as
+additive deltas when a single result changes, or for every result at once
+with a vectorized NumPy pass when the statistics are rebuilt.
+
+A game is a match or a tournament matchup. Every participant with a score has
+played it, and the participant with the single highest score has won it.
+"""
+
+from collections import namedtuple
+import numpy as np
+
+StatDelta = namedtuple('StatDelta', ['matches_played', 'wins', 'total_points', 'titles'])
+
+def result_stats(scores: dict[int, int | None]) -> dict[int, tuple[int, int, int]]:
+    """
+    Returns the (played, wins, points) each participant gets from one game,
+    given their scores keyed by player ID. Unscored participants get nothing.
+    """
+    scored = {player_id: score for player_id, score in scores.items() if score is not None}
+    if not scored:
+        return {}
+
+    top = max(scored.values())
+    sole_winner = len(scored) > 1 and list(scored.values()).count(top) == 1
+    return {
+        player_id: (1, int(sole_winner and score == top), score)
+        for player_id, score in scored.items()
+    }
+
+def result_deltas(old: dict[int, int | None],
+                  new: dict[int, int | None]) -> dict[int, StatDelta]:
+    """
+    Computes how each participant's statistics change when a game's scores go
+    from `old` to `new`. Participants whose statistics do not change are left out.
+    """
+    before, after = result_stats(old), result_stats(new)
+    deltas = {}
+    for player_id in before.keys() | after.keys():
+        removed = before.get(player_id, (0, 0, 0))
+        added = after.get(player_id, (0, 0, 0))
+        delta = StatDelta(*(a - r for a, r in zip(added, removed)), 0)
+        if any(delta):
+            deltas[player_id] = delta
+    return deltas
+
+def title_deltas(old_winner: int | None, new_winner: int | None) -> dict[int, StatDelta]:
+    """
+    Computes the change in titles when a tournament's winner is replaced.
+    """
+    if old_winner == new_winner:
+        return {}
+    deltas = {}
+    if old_winner is not None:
+        deltas[old_winner] = StatDelta(0, 0, 0, -1)
+    if new_winner is not None:
+        deltas[new_winner] = StatDelta(0, 0, 0, 1)
+    return deltas
+
+def merge_deltas(*deltas: dict[int, StatDelta]) -> dict[int, StatDelta]:
+    """
+    Sums several sets of deltas per player, dropping those that cancel out.
+    """
+    merged: dict[int, StatDelta] = {}
+    for delta_set in deltas:
+        for player_id, delta in delta_set.items():
+            current = merged.get(player_id)
+            merged[player_id] = delta if current is None else StatDelta(
+                *(c + d for c, d in zip(current, delta))
+            )
+    return {player_id: delta for player_id, delta in merged.items() if any(delta)}
+
+def aggregate_results(games: np.ndarray, players: np.ndarray,
+                      scores: np.ndarray) -> tuple[np.ndarray, ...]:
+    """
+    Aggregates one row per (game, player, score) into career statistics.
+    Returns arrays of player IDs and their matches played, wins and total points.
+    """
+    if players.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty, empty
+
+    # Sort by game, highest score first, so each game's leader opens its run.
+    order = np.lexsort((-scores, games))
+    games, players, scores = games[order], players[order], scores[order]
+
+    starts = np.flatnonzero(np.r_[True, games[1:] != games[:-1]])
+    sizes = np.diff(np.r_[starts, games.size])
+    runner_up = scores[np.minimum(starts + 1, games.size - 1)]
+    winner_rows = starts[(sizes > 1) & (scores[starts] > runner_up)]
+
+    player_ids, inverse = np.unique(players, return_inverse=True)
+    played = np.bincount(inverse, minlength=player_ids.size)
+    wins = np.bincount(inverse[winner_rows], minlength=player_ids.size)
+    points = np.bincount(inverse, weights=scores, minlength=player_ids.size).astype(np.int64)
+    return player_ids, played, wins, points
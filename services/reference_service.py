@@ -0,0 +1,102 @@
+"""
+In-process cache for small reference tables (countries, teams, match and
+tournament formats). Each table is read in full once and served from memory
+until its TTL expires or it is invalidated by a write.
+"""
+
+import threading
+import time
+from collections import namedtuple
+from data import database
+
+REFERENCE_TTL = 300.0
+
+CacheStats = namedtuple('CacheStats', ['hits', 'misses', 'loads', 'size'])
+
+class ReferenceTable:
+    """
+    Cached name <-> id maps of a table with `id` and `name` columns.
+
+    Attributes:
+        table (str): The name of the cached table.
+        ttl (float): Seconds after which the table is read again.
+    """
+    def __init__(self, table: str, ttl: float = REFERENCE_TTL) -> None:
+        self.table = table
+        self.ttl = ttl
+        self._ids_by_name: dict[str, int] = {}
+        self._names_by_id: dict[int, str] = {}
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._loads = 0
+
+    def _maps(self) -> tuple[dict[str, int], dict[int, str]]:
+        """
+        Returns the current maps, reloading the table when missing or expired.
+        """
+        with self._lock:
+            if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+                self._hits += 1
+                return self._ids_by_name, self._names_by_id
+            self._misses += 1
+
+        rows = database.read_query(f"SELECT id, name FROM {self.table} ORDER BY id")
+        ids_by_name = {name: row_id for row_id, name in rows}
+        names_by_id = {row_id: name for row_id, name in rows}
+
+        with self._lock:
+            self._ids_by_name, self._names_by_id = ids_by_name, names_by_id
+            self._loaded_at = time.monotonic()
+            self._loads += 1
+        return ids_by_name, names_by_id
+
+    def names(self) -> list[str]:
+        """
+        Returns all names in the table, ordered by id.
+        """
+        return list(self._maps()[1].values())
+
+    def id_of(self, name: str) -> int | None:
+        """
+        Returns the id of the row with the given name, or None if there is none.
+        """
+        return self._maps()[0].get(name)
+
+    def name_of(self, row_id: int) -> str | None:
+        """
+        Returns the name of the row with the given id, or None if there is none.
+        """
+        return self._maps()[1].get(row_id)
+
+    def items(self) -> list[tuple[int, str]]:
+        """
+        Returns all (id, name) pairs in the table, ordered by id.
+        """
+        return list(self._maps()[1].items())
+
+    def invalidate(self) -> None:
+        """
+        Drops the cached maps so the next lookup reads the table again.
+        """
+        with self._lock:
+            self._loaded_at = None
+
+    def stats(self) -> CacheStats:
+        """
+        Returns the hit and miss counters of the table.
+        """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._loads, len(self._names_by_id))
+
+countries = ReferenceTable('country')
+teams = ReferenceTable('team')
+match_formats = ReferenceTable('match_format')
+tournament_formats = ReferenceTable('tournament_format')
+
+def all_stats() -> dict[str, CacheStats]:
+    """
+    Returns the cache statistics of every reference table.
+    """
+    return {t.table: t.stats() for t in (countries, teams, match_formats, tournament_formats)}
@@ -0,0 +1,88 @@
+"""
+This module pushes live score updates to clients watching a tournament or a match.
+
+Services publish delta events inside the transaction that changes the scores.
+They are sent with PostgreSQL NOTIFY, so they are delivered only if the
+transaction commits and reach every worker process. Each process runs one
+listener, started by its first subscriber, which hands the events to an
+in-process broker: a published event is encoded once and fanned out to all
+watchers of its topic, however many there are.
+"""
+
+import json
+import threading
+from common.broker import AsyncSubscription, Broker, Subscription
+from data import database
+from data.notifications import Listener
+
+CHANNEL = 'scoreboard'
+
+_broker = Broker()
+_listener: Listener | None = None
+_listener_lock = threading.Lock()
+
+def tournament_topic(tournament_id: int) -> str:
+    """
+    Returns the topic of the events of a tournament.
+    """
+    return f"tournament:{tournament_id}"
+
+def match_topic(match_id: int) -> str:
+    """
+    Returns the topic of the events of a match.
+    """
+    return f"match:{match_id}"
+
+def publish(events: list[tuple[str, str, dict]]) -> None:
+    """
+    Publishes (topic, event, data) events in one statement. Inside a
+    transaction they are delivered when it commits.
+    """
+    database.notify(CHANNEL, [
+        json.dumps({"topic": topic, "event": event, "data": data}, separators=(',', ':'))
+        for topic, event, data in events
+    ])
+
+def dispatch(payload: str) -> int:
+    """
+    Fans a notification payload out to the local subscribers of its topic and
+    returns how many received it.
+    """
+    message = json.loads(payload)
+    return _broker.publish(
+        message["topic"], message["event"], json.dumps(message["data"], separators=(',', ':'))
+    )
+
+def subscribe(topic: str) -> Subscription:
+    """
+    Subscribes a blocking consumer to `topic`.
+    """
+    start_listener()
+    return _broker.subscribe(topic)
+
+def subscribe_async(topic: str) -> AsyncSubscription:
+    """
+    Subscribes a consumer running on the current event loop to `topic`.
+    """
+    start_listener()
+    return _broker.subscribe_async(topic)
+
+def start_listener() -> None:
+    """
+    Starts listening for score events in this process, if not started yet.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = Listener(CHANNEL, dispatch)
+            _listener.start()
+
+def stop_listener() -> None:
+    """
+    Stops listening for score events in this process.
+    """
+    global _listener
+    with _listener_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
@@ -3,25 +3,31 @@ This module handles the operations for managing teams, such as creating, fetchin
 deleting, and listing team data.
 """
 
-from data import database
-from data.models import Team
 from typing import Generator
+import psycopg2
+from common.pagination import id_key
+from data import database
+from data.models import Page, Team
+from services import reference_service, version_service
 
 def create_team(team: Team) -> Team | None:
     """
     Creates a new team if it does not already exist.
     """
-    existing_team = database.read_query(
-        "SELECT * FROM team WHERE name=%s", 
-        (team.name,)
-    )
-    if existing_team:
+    if reference_service.teams.id_of(team.name) is not None:
         return None
 
-    generated_id = database.insert_query(
-        "INSERT INTO team (name) VALUES (%s) RETURNING id", 
-        (team.name,)
-    )
+    try:
+        with database.transaction():
+            generated_id = database.insert_query(
+                "INSERT INTO team (name) VALUES (%s) RETURNING id",
+                (team.name,)
+            )
+            version_service.bump('teams')
+    except psycopg2.IntegrityError:
+        return None
+    finally:
+        reference_service.teams.invalidate()
     team.id = generated_id
 
     return team
@@ -33,31 +39,54 @@ def all_teams() -> Generator[Team, None, None]:
     query = database.read_query("SELECT * from team")
     return (Team(id=t[0], name=t[1]) for t in query)
 
+def teams_page(limit: int, after: tuple | None = None) -> Page:
+    """
+    Retrieves one page of teams ordered by ID, starting after the key `after`.
+    """
+    return teams_page_from_rows(database.read_query(*teams_page_query(limit, after)), limit)
+
+def teams_page_query(limit: int, after: tuple | None = None) -> tuple[str, tuple]:
+    """
+    Builds the query and parameters fetching one page of teams plus one extra row.
+    Raises ValueError if `after` is not a valid (id,) key.
+    """
+    after = id_key(after)
+    keyset, params = ("WHERE id > %s", after) if after else ("", ())
+    return f"SELECT id, name FROM team {keyset} ORDER BY id LIMIT %s", params + (limit + 1,)
+
+def teams_page_from_rows(rows: list[tuple], limit: int) -> Page:
+    """
+    Builds a page of teams from the rows of `teams_page_query`.
+    """
+    teams = [Team(id=t[0], name=t[1]) for t in rows[:limit]]
+    return Page(teams, (teams[-1].id,) if len(rows) > limit else None)
+
 def get_team_by_id(team_id: int) -> list[Team] | None:
     """
-    Retrieves a team by its ID.
+    Retrieves a team by its ID from the reference cache.
     """
-    query = database.read_query("SELECT * FROM team WHERE id = %s", (team_id,))
-    if not query:
+    name = reference_service.teams.name_of(team_id)
+    if name is None:
         return None
-    return [Team(id=t[0], name=t[1]) for t in query]
+    return [Team(id=team_id, name=name)]
 
 def get_team_names() -> list[str]:
     """
-    Retrieves the names of all teams.
+    Retrieves the names of all teams from the reference cache.
     """
-    team_names = database.read_query("SELECT name from team")
-    return [i[0] for i in team_names]
+    return reference_service.teams.names()
 
-def get_team_id(name: str) -> int:
+def get_team_id(name: str) -> int | None:
     """
-    Retrieves a team's ID by its name.
+    Retrieves a team's ID by its name from the reference cache.
     """
-    team_id = database.read_query("SELECT id from team where name = %s", (name,))
-    return team_id[0][0]
+    return reference_service.teams.id_of(name)
 
 def delete_team(team_id: int) -> None:
     """
     Deletes a team by its ID.
     """
-    database.update_query("DELETE from team where id = %s", (team_id,))
+    with database.transaction():
+        database.update_query("DELETE from team where id = %s", (team_id,))
+        version_service.bump('teams')
+    reference_service.teams.invalidate()
@@ -5,122 +5,222 @@ and handling knockout and league formats.
 """
 
 from datetime import date, timedelta
+from typing import Iterator
 from flask import jsonify
-from data.models import MatchUp, Tournament, TournamentResponseModel
-from data.database import insert_query, read_query, update_query
-from services import player_service
+from common.cache import TTLCache
+from common.pagination import id_key
+from data.models import (
+    LeagueStanding, MatchUp, Page, Player, PlayerData, Tournament, TournamentResponseModel
+)
+from data.database import (
+    insert_query, read_query, transaction, stream_query,
+    register_statement, execute_statement
+)
+from services import player_service, reference_service, scoreboard_service, version_service
+from services.player_stats import result_deltas, title_deltas
+
+DETAIL_CACHE_TTL = 60
+
+_detail_cache = TTLCache(max_size=1000)
+
+_SUMMARY_QUERY = '''SELECT t.id, t.title, t.prize, t.tournament_format_id,
+              p.first_name, p.second_name,
+              COALESCE(array_agg(DISTINCT mp.player_id)
+                       FILTER (WHERE mp.player_id IS NOT NULL), '{{}}') AS players,
+              COALESCE(array_agg(DISTINCT m.id)
+                       FILTER (WHERE m.id IS NOT NULL), '{{}}') AS matches
+       FROM {source} AS t
+       LEFT JOIN player AS p ON t.winner = p.id
+       LEFT JOIN matchups AS m ON m.tournament_id = t.id
+       LEFT JOIN LATERAL (VALUES (m.player_one), (m.player_two)) AS mp(player_id) ON true
+       GROUP BY t.id, t.title, t.prize, t.tournament_format_id, p.first_name, p.second_name
+       ORDER BY t.id'''
 
 def all_tournaments() -> list[dict]:
     """
     Retrieves all tournaments and returns them as a list of dictionaries,
     including the full name of the winner.
     """
-    data = read_query(
-        '''SELECT t.id, t.title, t.prize, t.tournament_format_id, 
-                  p.first_name, p.second_name,
-                  m.player_one, m.player_two, m.id as match_id
-           FROM tournament AS t
-           LEFT JOIN player AS p ON t.winner = p.id
-           LEFT JOIN matchups AS m ON m.tournament_id = t.id'''
-    )
+    data = read_query(_SUMMARY_QUERY.format(source="tournament"))
+
+    return [_tournament_summary(row) for row in data]
+
+def tournaments_page(limit: int, after: tuple | None = None) -> Page:
+    """
+    Retrieves one page of tournaments ordered by ID. `after` is the sort key
+    of the last tournament of the previous page.
+    """
+    return tournaments_page_from_rows(read_query(*tournaments_page_query(limit, after)), limit)
+
+def tournaments_page_query(limit: int, after: tuple | None = None) -> tuple[str, tuple]:
+    """
+    Builds the query and parameters fetching one page of tournaments plus one
+    row telling whether there is a next page. Raises ValueError if `after` is
+    not a valid (id,) key.
+    """
+    after = id_key(after)
+    keyset, params = ("WHERE id > %s", after) if after else ("", ())
+    sql = f'''WITH page AS (
+                SELECT id, title, prize, tournament_format_id, winner
+                FROM tournament {keyset}
+                ORDER BY id
+                LIMIT %s)
+           ''' + _SUMMARY_QUERY.format(source="page")
+    return sql, params + (limit + 1,)
+
+def tournaments_page_from_rows(rows: list[tuple], limit: int) -> Page:
+    """
+    Builds a page of tournaments from the rows of `tournaments_page_query`.
+    """
+    tournaments = [_tournament_summary(row) for row in rows]
+    if len(tournaments) <= limit:
+        return Page(tournaments, None)
+    return Page(tournaments[:limit], (tournaments[limit - 1]["id"],))
+
+def stream_tournaments() -> Iterator[dict]:
+    """
+    Streams every tournament ordered by ID as the rows arrive from a
+    server-side cursor.
+    """
+    rows = stream_query(_SUMMARY_QUERY.format(source="tournament"))
+
+    return map(_tournament_summary, rows)
 
-    flattened = {}
-    for (tour_id, title, prize, tournament_format, first_name, second_name,
-        player_one, player_two, match_id) in data:
-        if tour_id not in flattened:
-            winner_name = f"{first_name} {second_name}" if first_name else "No winner yet"
-            flattened[tour_id] = {
-                "id": tour_id,
-                "title": title,
-                "prize": prize,
-                "tournament_format": tournament_format,
-                "winner": winner_name,
-                "players": [],
-                "matches": []
-            }
-        if player_one is not None and player_one not in flattened[tour_id]["players"]:
-            flattened[tour_id]["players"].append(player_one)
-        if player_two is not None and player_two not in flattened[tour_id]["players"]:
-            flattened[tour_id]["players"].append(player_two)
-        if match_id is not None:
-            flattened[tour_id]["matches"].append(match_id)
-
-    return list(flattened.values())
+def _tournament_summary(row: tuple) -> dict:
+    """
+    Converts one aggregated tournament row into its list representation.
+    """
+    tour_id, title, prize, tournament_format, first_name, second_name, players, matches = row
+    return {
+        "id": tour_id,
+        "title": title,
+        "prize": prize,
+        "tournament_format": tournament_format,
+        "winner": f"{first_name} {second_name}" if first_name else "No winner yet",
+        "players": players,
+        "matches": matches
+    }
+
+register_statement(
+    "matchup_by_id",
+    """SELECT id, tournament_id, played_at, tournament_phase, player_one,
+    player_two, player_one_score, player_two_score, next_matchup_id, next_slot
+    from matchups where id = %s"""
+)
 
 def get_matchup(matchup_id: int) -> MatchUp | None:
     """
     Retrieves a specific matchup by its ID.
     """
-    data = read_query(
-        """SELECT id, tournament_id, played_at, tournament_phase, player_one, 
-        player_two, player_one_score, player_two_score from matchups
-        where id = %s""",
-        (matchup_id,)
-    )
+    data = execute_statement("matchup_by_id", (matchup_id,))
     if not data:
         return None
     m = data[0]
     return MatchUp(
         id=m[0],tournament_id=m[1], played_at=m[2], tournament_phase=m[3],
-        player_one=m[4], player_two=m[5], player_one_score=m[6], player_two_score=m[7]
+        player_one=m[4], player_two=m[5], player_one_score=m[6], player_two_score=m[7],
+        next_matchup_id=m[8], next_slot=m[9]
     )
 
-def get_tournament_matchups(tournament_id: int) -> list[MatchUp] | None:
-    """
-    Retrieves all matchups for a specific tournament.
-    """
-    data = read_query(
-        """SELECT * from matchups
-        where tournament_id = %s order by tournament_phase""",
-        (tournament_id,)
-    )
-    if not data:
-        return None
-    return [
-        MatchUp(id=m[0],tournament_id=m[1], played_at=m[2], tournament_phase=m[3],
-            player_one=m[4], player_two=m[5], player_one_score=m[6], player_two_score=m[7]
-        )
-        for m in data
-    ]
+TOURNAMENT_DETAIL_QUERY = '''SELECT id, title, prize, tournament_format_id, winner
+        FROM tournament
+        WHERE id = %s'''
+
+TOURNAMENT_MATCHUPS_QUERY = '''SELECT m.id, m.tournament_id, m.played_at, m.tournament_phase,
+               m.player_one, m.player_two, m.player_one_score, m.player_two_score,
+               m.next_matchup_id, m.next_slot,
+               p.first_name, p.second_name, c.name, t.name,
+               pt.first_name, pt.second_name, ct.name, tt.name
+        FROM matchups AS m
+        LEFT JOIN player AS p ON m.player_one = p.id
+        LEFT JOIN team AS t ON p.team_id = t.id
+        LEFT JOIN country AS c ON p.country_id = c.id
+        LEFT JOIN player AS pt ON m.player_two = pt.id
+        LEFT JOIN team AS tt ON pt.team_id = tt.id
+        LEFT JOIN country AS ct ON pt.country_id = ct.id
+        WHERE m.tournament_id = %s
+        ORDER BY m.tournament_phase, m.id'''
 
 def get_by_tournament_id(tournament_id: int) -> TournamentResponseModel | None:
     """
     Retrieves detailed tournament information, including matchups and players, by tournament ID.
+    Results are cached for DETAIL_CACHE_TTL seconds and dropped when a score or
+    the winner of the tournament changes.
     """
-    tournament_data = read_query(
-        '''SELECT  t.id, title, t.prize, t.tournament_format_id, t.winner
-        FROM tournament as t WHERE t.id = %s''',
-        (tournament_id,)
-    )
+    cached = cached_tournament(tournament_id)
+    if cached is not None:
+        return cached
 
-    players = player_service.get_tournament_players(tournament_id)
-    matchups = get_tournament_matchups(tournament_id) or []
-    tournament_format = get_tournament_format(tournament_id)
+    tournament = load_tournament_detail(tournament_id)
+    if tournament is not None:
+        remember_tournament(tournament)
+    return tournament
 
+def load_tournament_detail(tournament_id: int) -> TournamentResponseModel | None:
+    """
+    Loads a tournament with its matchups and players in two queries,
+    skipping the second one if the tournament does not exist.
+    """
+    tournament_data = read_query(TOURNAMENT_DETAIL_QUERY, (tournament_id,))
     if not tournament_data:
         return None
-    tournament_data = tournament_data[0]
+
+    matchup_data = read_query(TOURNAMENT_MATCHUPS_QUERY, (tournament_id,))
+    return tournament_detail(tournament_data[0], matchup_data)
+
+def tournament_detail(tournament_row: tuple, matchup_rows: list[tuple]) -> TournamentResponseModel:
+    """
+    Builds the detailed tournament from the rows of TOURNAMENT_DETAIL_QUERY and
+    TOURNAMENT_MATCHUPS_QUERY. The format name comes from the reference cache.
+    """
+    t_id, title, prize, format_id, winner = tournament_row
+    tournament_format = reference_service.tournament_formats.name_of(format_id)
+
+    matchups = []
+    players: dict[int, Player] = {}
+    for m in matchup_rows:
+        matchups.append(MatchUp(
+            id=m[0], tournament_id=m[1], played_at=m[2], tournament_phase=m[3],
+            player_one=m[4], player_two=m[5], player_one_score=m[6], player_two_score=m[7],
+            next_matchup_id=m[8], next_slot=m[9]
+        ))
+        if m[4] is None or m[5] is None:
+            continue
+        for player_info in (PlayerData(m[4], *m[10:14]), PlayerData(m[5], *m[14:18])):
+            if player_info.id not in players:
+                players[player_info.id] = Player.from_query_result(player_info)
 
     return TournamentResponseModel(
-        id=tournament_data[0], title=tournament_data[1], prize=tournament_data[2],
-        format=tournament_format,winner=tournament_data[4],players=players,
-        matchups=matchups
+        id=t_id, title=title, prize=prize, format=tournament_format, winner=winner,
+        players=list(players.values()), matchups=matchups
     )
 
+def cached_tournament(tournament_id: int) -> TournamentResponseModel | None:
+    """
+    Returns the cached details of a tournament, or None if they are not cached.
+    """
+    return _detail_cache.get(tournament_id)
+
+def remember_tournament(tournament: TournamentResponseModel) -> None:
+    """
+    Caches the details of a tournament for DETAIL_CACHE_TTL seconds.
+    """
+    _detail_cache.set(tournament.id, tournament, DETAIL_CACHE_TTL)
+
+def forget_tournament(tournament_id: int) -> None:
+    """
+    Drops the cached details of a tournament.
+    """
+    _detail_cache.discard(tournament_id)
+
 def get_tournament_format(tournament_id: int) -> str | None:
     """
     Retrieves the format of a tournament by its ID.
     """
-    data = read_query(
-                '''SELECT  t_f.name
-                    FROM tournament_format as t_f
-                    LEFT JOIN tournament as t
-                    ON t_f.id = t.tournament_format_id
-                    WHERE t.id = %s''', (tournament_id,))
+    data = read_query('SELECT tournament_format_id FROM tournament WHERE id = %s', (tournament_id,))
     if not data:
         return None
-    tournament_format = data[0]
-    return tournament_format[0]
+    return reference_service.tournament_formats.name_of(data[0][0])
 
 def check_for_existing_player(player_id: int) -> bool:
     """
@@ -132,48 +232,61 @@ def create_tournament(tournament: Tournament) -> Tournament:
     """
     Creates a new tournament and inserts it into the database.
     """
-    generated_id = insert_query(
-        "INSERT INTO tournament (title, prize, tournament_format_id) values (%s,%s,%s)",
-        (tournament.title, tournament.prize, tournament.format_id)
-    )
+    with transaction():
+        generated_id = insert_query(
+            "INSERT INTO tournament (title, prize, tournament_format_id) values (%s,%s,%s) RETURNING id",
+            (tournament.title, tournament.prize, tournament.format_id)
+        )
+        version_service.bump('tournaments')
     tournament.id = generated_id
     return tournament
 
-def create_random_matchups(tournament: Tournament, home: str, away: str, starting_date: date) -> None:
+def build_knockout_bracket(player_ids: list[int]) -> list[tuple[int, int | None, int | None]]:
     """
-    Creates a random matchup between two players and inserts it into the matchups table.
+    Builds every matchup of a knockout bracket as (phase, player_one, player_two).
+    The first phase pairs the participants in order; later phases are left empty
+    until the winners are known.
     """
-    player1 = player_service.get_player_by_name(home)
-    player2 = player_service.get_player_by_name(away)
+    bracket = [(1, player_ids[i], player_ids[i + 1]) for i in range(0, len(player_ids) - 1, 2)]
 
-    insert_query('''insert into matchups (tournament_id, played_at, tournament_phase,
-        player_one, player_two, player_one_score, player_two_score)
-        values (%s, %s, %s, %s, %s, %s, %s)''',
-        (tournament.id, starting_date, 1, player1.id, player2.id, None, None)
-    )
+    phase, matchup_count = 2, len(player_ids) // 4
+    while matchup_count >= 1:
+        bracket.extend((phase, None, None) for _ in range(matchup_count))
+        phase += 1
+        matchup_count //= 2
 
-def create_empty_matchup(tournament: Tournament, matchup_date: date, phase: int) -> None:
-    """
-    Creates an empty matchup entry in the database for the given tournament and phase.
-    """
-    insert_query('''insert into matchups (tournament_id, played_at, tournament_phase,
-        player_one, player_two, player_one_score, player_two_score)
-        values (%s, %s, %s, %s, %s, %s, %s)''',
-        (tournament.id, matchup_date, phase, None, None, None, None)
-    )
+    return bracket
 
-def create_empty_phase(tournament: Tournament, tournament_date: date, phase: int, p_count: int) -> None:
+def link_knockout_bracket(
+    bracket: list[tuple[int, int | None, int | None]]
+) -> list[tuple[int | None, int | None]]:
     """
-    Creates empty matchups for a specific phase in a tournament.
+    Computes, for every matchup of a bracket built by `build_knockout_bracket`,
+    the position of the matchup its winner advances to and the slot (1 or 2)
+    taken there. The final gets (None, None).
     """
-    matchup_count = p_count//2
-    for _ in range(matchup_count):
-        create_empty_matchup(tournament, tournament_date, phase)
+    phase_starts: dict[int, int] = {}
+    for index, (phase, _, _) in enumerate(bracket):
+        phase_starts.setdefault(phase, index)
+
+    links = []
+    for index, (phase, _, _) in enumerate(bracket):
+        next_start = phase_starts.get(phase + 1)
+        if next_start is None:
+            links.append((None, None))
+            continue
+        position = index - phase_starts[phase]
+        links.append((next_start + position // 2, position % 2 + 1))
+
+    return links
 
 def create_knockout_tournament(tournament: Tournament,
                                participants: list[str], starting_date: date) -> None:
     """
     Creates a knockout tournament with matchups based on the given participants and starting date.
+    All participants are fetched in one query and every phase is inserted in one statement.
+    Matchup IDs are reserved up front so each matchup is stored with the matchup
+    and slot its winner advances to.
     """
     try:
         participant_ids = [int(pid) for pid in participants]
@@ -183,116 +296,244 @@ def create_knockout_tournament(tournament: Tournament,
     if len(participant_ids) not in [4, 8, 16, 32, 64, 128, 256]:
         return jsonify({"error": "Participants should be 4, 8, 16, 32, 64, 128 or 256 count!"}), 401
 
-    players = []
+    players = player_service.get_players_by_ids(participant_ids)
     for player_id in participant_ids:
-        player = player_service.get_player_by_id(player_id)
-        if player is None:
+        if player_id not in players:
             raise ValueError(f"Player with ID '{player_id}' does not exist.")
-        players.append(player)
-
-    create_tournament(tournament)
-
-    phase = 1
-    p_count = len(players) // 2
-    while len(players) > 1:
-        player1 = players[0].first_name + ' ' + players[0].second_name
-        player2 = players[1].first_name + ' ' + players[1].second_name
-        create_random_matchups(tournament, player1,
-                               player2, starting_date)
-        players.pop(0)
-        players.pop(0)
-
-    while p_count > 1:
-        create_empty_phase(tournament, starting_date, phase, p_count)
-        phase += 1
-        p_count //= 2
+
+    bracket = build_knockout_bracket(participant_ids)
+    links = link_knockout_bracket(bracket)
+
+    with transaction() as tx:
+        create_tournament(tournament)
+        ids = [row[0] for row in tx.read_query(
+            "SELECT nextval(pg_get_serial_sequence('matchups', 'id')) FROM generate_series(1, %s)",
+            (len(bracket),)
+        )]
+        tx.insert_many(
+            '''insert into matchups (id, tournament_id, played_at, tournament_phase,
+            player_one, player_two, player_one_score, player_two_score,
+            next_matchup_id, next_slot)
+            VALUES %s''',
+            [(ids[index], tournament.id, starting_date, phase, player_one, player_two,
+              None, None, None if next_index is None else ids[next_index], next_slot)
+             for index, ((phase, player_one, player_two), (next_index, next_slot))
+             in enumerate(zip(bracket, links))]
+        )
 
     return jsonify({"message": "Knockout tournament created successfully!"}), 201
 
 def set_matchup_score(matchup_id: int, scores: list[int]) -> None:
     """
-    Updates the scores for a given matchup.
-    """
-    update_query('''
-        UPDATE matchups
-        SET player_one_score = %s, player_two_score = %s
-        WHERE id = %s''',
-        (scores[0], scores[1], matchup_id)
-    )
+    Updates the scores for a given league matchup and, in the same transaction,
+    moves its players' standings by the difference from the previous scores.
+    """
+    with transaction() as tx:
+        data = tx.read_query('''
+            UPDATE matchups AS m
+            SET player_one_score = %s, player_two_score = %s
+            FROM (SELECT id, player_one_score, player_two_score
+                  FROM matchups WHERE id = %s FOR UPDATE) AS old
+            WHERE m.id = old.id
+            RETURNING m.tournament_id, m.player_one, m.player_two,
+                      old.player_one_score, old.player_two_score''',
+            (scores[0], scores[1], matchup_id)
+        )
+        if not data:
+            return
+        tournament_id, player_one, player_two, old_one, old_two = data[0]
+        scoreboard_service.publish([
+            _score_event(tournament_id, matchup_id, player_one, player_two, scores)
+        ])
+        version_service.bump('tournaments')
+
+        if player_one is not None and player_two is not None:
+            player_service.apply_stat_deltas(result_deltas(
+                {player_one: old_one, player_two: old_two},
+                {player_one: scores[0], player_two: scores[1]}
+            ))
+            old = (old_one, old_two) if old_one is not None and old_two is not None else None
+            deltas = standing_deltas(old, (scores[0], scores[1]))
+            tx.insert_many(
+                '''INSERT INTO league_standings (tournament_id, player_id, played, wins,
+                losses, points_for, points_against)
+                VALUES %s
+                ON CONFLICT (tournament_id, player_id) DO UPDATE SET
+                    played = league_standings.played + EXCLUDED.played,
+                    wins = league_standings.wins + EXCLUDED.wins,
+                    losses = league_standings.losses + EXCLUDED.losses,
+                    points_for = league_standings.points_for + EXCLUDED.points_for,
+                    points_against = league_standings.points_against + EXCLUDED.points_against''',
+                [(tournament_id, player_one, *deltas[0]), (tournament_id, player_two, *deltas[1])]
+            )
+
+    forget_tournament(tournament_id)
 
-def get_matchup_ids_next_phase(matchup: MatchUp) -> list[int]:
+def _score_event(tournament_id: int, matchup_id: int, player_one: int | None,
+                 player_two: int | None, scores: list[int]) -> tuple[str, str, dict]:
     """
-    Retrieves the matchup IDs for the next phase of the tournament.
+    Builds the live event announcing the new scores of a matchup.
     """
-    data = read_query("SELECT id from matchups where tournament_id = %s and tournament_phase = %s",
-                    (matchup.tournament_id, matchup.tournament_phase + 1)
-                )
+    return (scoreboard_service.tournament_topic(tournament_id), "score", {
+        "matchup_id": matchup_id,
+        "player_one": player_one,
+        "player_two": player_two,
+        "player_one_score": scores[0],
+        "player_two_score": scores[1]
+    })
 
-    return [i[0] for i in data]
+def _standing_row(own: int, other: int) -> tuple[int, int, int, int, int]:
+    """
+    Returns the (played, wins, losses, points_for, points_against) one result adds.
+    """
+    return (1, int(own > other), int(own < other), own, other)
 
-def get_right_id(matchup: MatchUp, current_ids: list[list[int]], next_ids: list[int]) -> int | None:
+def standing_deltas(old: tuple[int, int] | None,
+                    new: tuple[int, int]) -> tuple[tuple[int, ...], tuple[int, ...]]:
     """
-    Retrieves the ID of the correct next matchup for a given current matchup.
+    Computes how the standings of both players change when a matchup's scores go
+    from `old` (None if it was unscored) to `new`.
     """
-    if len(next_ids) > 0:
-        target_id = next((i for i in range(len(current_ids)) if matchup.id in current_ids[i]), None)
-        return next_ids[target_id] if target_id is not None else None
+    deltas = []
+    for own, other in ((0, 1), (1, 0)):
+        added = _standing_row(new[own], new[other])
+        removed = _standing_row(old[own], old[other]) if old else (0, 0, 0, 0, 0)
+        deltas.append(tuple(a - r for a, r in zip(added, removed)))
+    return deltas[0], deltas[1]
 
-    return None
+LEAGUE_STANDINGS_QUERY = '''SELECT s.player_id, p.first_name, p.second_name, s.played, s.wins,
+               s.losses, s.points_for, s.points_against, s.point_differential
+        FROM league_standings AS s
+        LEFT JOIN player AS p ON p.id = s.player_id
+        WHERE s.tournament_id = %s
+        ORDER BY s.wins DESC, s.point_differential DESC, s.points_for DESC, s.player_id'''
 
-def create_phase(league: Tournament, participants: list[str], phase, starting_date: date) -> None:
+def get_league_standings(tournament_id: int) -> list[LeagueStanding]:
     """
-    Creates a phase with matchups for a league tournament.
+    Retrieves the standings of a league, best first, from the maintained
+    league_standings table.
     """
-    phase %= (len(participants)-1)
-    if phase:
-        participants = participants[:1] + participants[-phase:] + participants[1:-phase]
-    half = len(participants)//2
-    phase_matchups = list(zip(participants[:half], participants[half:][::-1]))
+    return league_standings_from_rows(read_query(LEAGUE_STANDINGS_QUERY, (tournament_id,)))
 
-    for m in phase_matchups:
-        player1 = m[0].first_name + ' ' + m[0].second_name
-        player2 = m[1].first_name + ' ' + m[1].second_name
-        player_one = player_service.get_player_by_name(player1)
-        player_two = player_service.get_player_by_name(player2)
+def league_standings_from_rows(rows: list[tuple]) -> list[LeagueStanding]:
+    """
+    Builds league standings from the rows of LEAGUE_STANDINGS_QUERY.
+    """
+    return [
+        LeagueStanding(player_id=row[0], first_name=row[1], second_name=row[2], played=row[3],
+                       wins=row[4], losses=row[5], points_for=row[6], points_against=row[7],
+                       point_differential=row[8])
+        for row in rows
+    ]
 
-        insert_query('''insert into matchups
-            (tournament_id, played_at, tournament_phase, player_one, player_two,
-            player_one_score, player_two_score)
-            values (%s, %s, %s, %s, %s, %s, %s)''',
-            (league.id, starting_date+timedelta(days=7*phase), phase + 1,
-                player_one.id, player_two.id, None, None)
+def set_knockout_score(matchup_id: int, scores: list[int]) -> int | None:
+    """
+    Updates the scores of a knockout matchup and advances its winner into the
+    slot of the next matchup, or sets the tournament winner when the matchup is
+    in the last phase of the tournament.
+    Returns the ID of the advancing player, or None if the matchup does not exist.
+    """
+    with transaction() as tx:
+        data = tx.read_query('''
+            UPDATE matchups AS m
+            SET player_one_score = %s, player_two_score = %s
+            FROM (SELECT id, player_one_score, player_two_score
+                  FROM matchups WHERE id = %s FOR UPDATE) AS old
+            WHERE m.id = old.id
+            RETURNING m.tournament_id, m.player_one, m.player_two, m.next_matchup_id,
+                      m.next_slot, old.player_one_score, old.player_two_score,
+                      m.tournament_phase = (SELECT max(tournament_phase) FROM matchups
+                                            WHERE tournament_id = m.tournament_id)''',
+            (scores[0], scores[1], matchup_id)
         )
+        if not data:
+            return None
+        (tournament_id, player_one, player_two, next_matchup_id, next_slot,
+         old_one, old_two, is_final) = data[0]
+        winner_id = player_one if scores[0] > scores[1] else player_two
+        player_service.apply_stat_deltas(result_deltas(
+            {player_one: old_one, player_two: old_two},
+            {player_one: scores[0], player_two: scores[1]}
+        ))
+        events = [_score_event(tournament_id, matchup_id, player_one, player_two, scores)]
+
+        if next_matchup_id is None:
+            if is_final:
+                set_tournament_winner(tournament_id, winner_id)
+        else:
+            tx.update_query('''
+                UPDATE matchups
+                SET player_one = CASE WHEN %s = 1 THEN %s ELSE player_one END,
+                    player_two = CASE WHEN %s = 2 THEN %s ELSE player_two END
+                WHERE id = %s''',
+                (next_slot, winner_id, next_slot, winner_id, next_matchup_id)
+            )
+            events.append((scoreboard_service.tournament_topic(tournament_id), "advance", {
+                "matchup_id": next_matchup_id, "slot": next_slot, "player_id": winner_id
+            }))
+        scoreboard_service.publish(events)
+        version_service.bump('tournaments')
 
-def get_phases(participants: list[str]) -> list[int]:
+    forget_tournament(tournament_id)
+    return winner_id
+
+def generate_round_robin(player_ids: list[int]) -> list[list[tuple[int, int]]]:
     """
-    Retrieves the phases for a league tournament based on the number of participants.
+    Generates a round-robin schedule with the circle method. Every player meets
+    every other player exactly once. With an odd number of players one player
+    sits out each round.
     """
-    phase = 1
-    phases = [phase+1*i for i in range(len(participants)-1)]
-    return phases
+    rotation = list(player_ids)
+    if len(rotation) % 2:
+        rotation.append(None)
+
+    rounds = []
+    half = len(rotation) // 2
+    for _ in range(len(rotation) - 1):
+        pairs = zip(rotation[:half], reversed(rotation[half:]))
+        rounds.append([(home, away) for home, away in pairs
+                       if home is not None and away is not None])
+        rotation = rotation[:1] + rotation[-1:] + rotation[1:-1]
+
+    return rounds
 
-def create_league(league: Tournament, participants: list[str], starting_date: date) -> None:
+def create_league(league: Tournament, participants: list[str],
+                  starting_date: date) -> list[list[tuple[int, int]]]:
     """
-    Creates a league tournament with phases and matchups based on the participants.
+    Creates a league tournament with a full round-robin schedule. Rounds are one
+    week apart and every matchup is written in a single bulk insert, followed by
+    an empty standings row per participant.
+    Returns the generated schedule.
     """
     try:
         participant_ids = [int(pid) for pid in participants]
     except ValueError:
         print("Participants must be a comma-separated list of numeric IDs.")
 
-    players = []
+    players = player_service.get_players_by_ids(participant_ids)
     for player_id in participant_ids:
-        player = player_service.get_player_by_id(player_id)
-        if player is None:
+        if player_id not in players:
             raise ValueError(f"Player with ID '{player_id}' does not exist.")
-        players.append(player)
 
-    create_tournament(league)
+    schedule = generate_round_robin(participant_ids)
+
+    with transaction() as tx:
+        create_tournament(league)
+        tx.insert_many(
+            '''insert into matchups (tournament_id, played_at, tournament_phase,
+            player_one, player_two, player_one_score, player_two_score)
+            VALUES %s''',
+            [(league.id, starting_date + timedelta(days=7 * index), index + 1,
+              player_one, player_two, None, None)
+             for index, pairs in enumerate(schedule)
+             for player_one, player_two in pairs]
+        )
+        tx.insert_many(
+            '''insert into league_standings (tournament_id, player_id) VALUES %s''',
+            [(league.id, player_id) for player_id in participant_ids]
+        )
 
-    days = get_phases(players)
-    for day in days:
-        create_phase(league, players, day, starting_date)
+    return schedule
 
 def get_league_tournament_matchups(tournament_id: int):
     """
@@ -309,13 +550,25 @@ def get_league_tournament_matchups(tournament_id: int):
 
 def set_tournament_winner(tournament_id: int, winner_id: int) -> bool:
     """
-    Updates the tournament table to set a winner for a given tournament.
-    """
-    result = update_query('''
-        UPDATE tournament
-        SET winner = %s
-        WHERE id = %s''',
-        (winner_id, tournament_id)
-    )
-
-    return result > 0
+    Updates the tournament table to set a winner for a given tournament and moves
+    the title in the players' career statistics.
+    """
+    with transaction():
+        data = read_query('''
+            UPDATE tournament AS t
+            SET winner = %s
+            FROM (SELECT id, winner FROM tournament WHERE id = %s FOR UPDATE) AS old
+            WHERE t.id = old.id
+            RETURNING old.winner''',
+            (winner_id, tournament_id)
+        )
+        if data:
+            player_service.apply_stat_deltas(title_deltas(data[0][0], winner_id))
+            scoreboard_service.publish([(
+                scoreboard_service.tournament_topic(tournament_id), "winner",
+                {"tournament_id": tournament_id, "winner": winner_id}
+            )])
+            version_service.bump('tournaments')
+    forget_tournament(tournament_id)
+
+    return bool(data)
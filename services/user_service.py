@@ -5,13 +5,75 @@ profiles, promoting users to specific roles, and linking user accounts with play
 profiles.
 """
 
+import threading
+import time
 from datetime import datetime, timedelta, timezone
-from hashlib import blake2s
+from hashlib import blake2s, sha256
 import jwt
-from data.models import LogInfo, User, UserInfo
+from common.cache import TTLCache, TTLCacheStats
+from common.pagination import id_key
+from data.models import LogInfo, Page, User, UserInfo
 from data import database
 from data.secrets import SALT, SECRET_KEY, ALGO
 
+USER_CACHE_TTL = 300.0
+TOKEN_LIFETIME = timedelta(minutes=60)
+TOKEN_VERSION_REFRESH = 30.0
+
+_user_cache = TTLCache()
+
+class TokenVersions:
+    """
+    In-memory copy of the token_versions table. A token is revoked when its
+    `ver` claim is lower than the current version of its user. The copy is
+    read again every `refresh` seconds, so revocations made by other
+    processes apply within that delay.
+
+    Attributes:
+        refresh (float): Seconds after which the table is read again.
+    """
+    def __init__(self, refresh: float = TOKEN_VERSION_REFRESH) -> None:
+        self.refresh = refresh
+        self._versions: dict[int, int] = {}
+        self._loaded_at: float | None = None
+        self._lock = threading.Lock()
+
+    def current(self, user_id: int) -> int:
+        """
+        Returns the current token version of a user, 0 if they were never revoked.
+        """
+        with self._lock:
+            fresh = self._loaded_at is not None \
+                and time.monotonic() - self._loaded_at < self.refresh
+        if not fresh:
+            self.reload()
+        return self._versions.get(user_id, 0)
+
+    def reload(self) -> None:
+        """
+        Reads the token_versions table.
+        """
+        rows = database.read_query("SELECT user_id, version FROM token_versions")
+        with self._lock:
+            self._versions = dict(rows)
+            self._loaded_at = time.monotonic()
+
+    def bump(self, user_id: int) -> int:
+        """
+        Increments the token version of a user, revoking their existing tokens.
+        """
+        version = database.insert_query(
+            """INSERT INTO token_versions (user_id, version) VALUES (%s, 1)
+               ON CONFLICT (user_id) DO UPDATE SET version = token_versions.version + 1
+               RETURNING version""",
+            (user_id,)
+        )
+        with self._lock:
+            self._versions = {**self._versions, user_id: version}
+        return version
+
+token_versions = TokenVersions()
+
 def _hash(password: str) -> str:
     """
     Hashes the password using blake2s with a salt.
@@ -21,24 +83,83 @@ def _hash(password: str) -> str:
 
 def create_token(user: User) -> str:
     """
-    Generates a JWT token for the given user.
+    Generates a JWT token for the given user. It carries the user's ID, role
+    and current token version, but never their password.
     """
-    expiration = datetime.now(timezone.utc) + timedelta(minutes=60)
+    expiration = datetime.now(timezone.utc) + TOKEN_LIFETIME
     payload = {
+        "sub": str(user.id),
         "email": user.email,
-        "password": user.password,
+        "name": user.name,
         "role": user.role,
+        "ver": token_versions.current(user.id),
         "exp": expiration
     }
     token = jwt.encode(payload, SECRET_KEY, algorithm=ALGO)
     return token
 
-def from_token(token: str) -> LogInfo:
+def from_token(token: str) -> User | None:
+    """
+    Decodes a JWT token into the User its claims describe, or None if the
+    token is not in the current format.
+    Raises jwt.exceptions.ExpiredSignatureError if the token has expired.
+    """
+    return _user_from_claims(jwt.decode(token, SECRET_KEY, algorithms=ALGO))
+
+def _user_from_claims(claims: dict) -> User | None:
+    """
+    Builds a User from verified token claims, or returns None if any is missing.
+    """
+    try:
+        return User(id=int(claims["sub"]), email=claims["email"], password="",
+                    role=claims["role"], name=claims["name"])
+    except (KeyError, ValueError):
+        return None
+
+def authenticated_user(token: str) -> User | None:
+    """
+    Returns the user a JWT token belongs to, decided from its verified claims
+    alone. Decoded tokens are cached by digest until they expire, or for at
+    most USER_CACHE_TTL seconds. Returns None for revoked tokens.
+    Raises jwt.exceptions.ExpiredSignatureError if the token has expired.
+    """
+    if not token:
+        return None
+
+    digest = sha256(token.encode()).digest()
+    cached = _user_cache.get(digest)
+    if cached is None:
+        claims = jwt.decode(token, SECRET_KEY, algorithms=ALGO)
+        user = _user_from_claims(claims)
+        if user is None or "ver" not in claims:
+            return None
+        cached = (user, claims["ver"])
+        expires_in = claims["exp"] - datetime.now(timezone.utc).timestamp()
+        _user_cache.set(digest, cached, min(USER_CACHE_TTL, expires_in))
+
+    user, version = cached
+    if version < token_versions.current(user.id):
+        return None
+    return user
+
+def revoke_tokens(user_id: int) -> None:
+    """
+    Revokes every token issued to a user so far.
+    """
+    token_versions.bump(user_id)
+    forget_user(user_id)
+
+def forget_user(user_id: int) -> None:
+    """
+    Drops every cached session of a user, so their next request decodes its token again.
+    """
+    _user_cache.discard_if(lambda entry: entry[0].id == user_id)
+
+def user_cache_stats() -> TTLCacheStats:
     """
-    Decodes a JWT token into a LogInfo object.
+    Returns the hit and miss counters of the authenticated-user cache.
     """
-    decoded = jwt.decode(token, SECRET_KEY, algorithms=ALGO)
-    return LogInfo(email=decoded["email"], password=decoded["password"])
+    return _user_cache.stats()
 
 def create_user(loginfo: LogInfo, name: str, role: str = "user") -> User:
     """
@@ -59,14 +180,18 @@ def create_user(loginfo: LogInfo, name: str, role: str = "user") -> User:
 
     return User.from_query_result(user_info)
 
+database.register_statement(
+    "user_by_credentials",
+    "SELECT * from users where email = %s and password = %s"
+)
+
 def find_user(loginfo: LogInfo) -> User | None:
     """
     Finds a user by their email and password.
     """
     h_password = _hash(loginfo.password)
 
-    query = "SELECT * from users where email = %s and password = %s"
-    user = database.read_query(query, (loginfo.email, h_password))
+    user = database.execute_statement("user_by_credentials", (loginfo.email, h_password))
     if not user:
         return None
     user = user[0]
@@ -83,6 +208,7 @@ def promote_to_director(user: User) -> bool:
         "UPDATE users SET role = %s WHERE id = %s", 
         ('director', user.id)
     )
+    revoke_tokens(user.id)
     return updated > 0
 
 def all_users() -> list[User]:
@@ -92,6 +218,28 @@ def all_users() -> list[User]:
     query = database.read_query("SELECT * FROM users")
     return [User.from_query_result(UserInfo(*row)) for row in query]
 
+def users_page(limit: int, after: tuple | None = None) -> Page:
+    """
+    Fetches one page of users ordered by ID, starting after the key `after`.
+    """
+    return users_page_from_rows(database.read_query(*users_page_query(limit, after)), limit)
+
+def users_page_query(limit: int, after: tuple | None = None) -> tuple[str, tuple]:
+    """
+    Builds the query and parameters fetching one page of users plus one extra row.
+    Raises ValueError if `after` is not a valid (id,) key.
+    """
+    after = id_key(after)
+    keyset, params = ("WHERE id > %s", after) if after else ("", ())
+    return f"SELECT * FROM users {keyset} ORDER BY id LIMIT %s", params + (limit + 1,)
+
+def users_page_from_rows(rows: list[tuple], limit: int) -> Page:
+    """
+    Builds a page of users from the rows of `users_page_query`.
+    """
+    users = [User.from_query_result(UserInfo(*row)) for row in rows[:limit]]
+    return Page(users, (users[-1].id,) if len(rows) > limit else None)
+
 def get_user_by_id(user_id: int) -> User | None:
     """
     Fetches a user by their ID.
@@ -112,3 +260,4 @@ def delete_user(user_id: int) -> None:
     database.update_query("DELETE from users where id = %s",
         (user_id,)
     )
+    revoke_tokens(int(user_id))
@@ -0,0 +1,139 @@
+"""
+This module keeps a version counter per resource family, so the list
+endpoints can answer conditional GETs without reading the data.
+
+The counters live in the resource_versions table. Write paths bump them once
+the transaction that changes the data commits, in a statement of its own, so
+concurrent writers hold the row of a family only for that statement instead of
+until their commit. The new versions are sent with PostgreSQL NOTIFY in the
+same statement. A process stopping between the two commits leaves the
+versions unchanged until the next write to those families.
+Each process keeps an in-memory copy, read whenever its listener connects and
+then kept current by the notifications. While the listener is disconnected
+the copy may miss changes, so no version is reported and requests are served
+in full. Callbacks registered with `on_change` learn which families changed,
+e.g. to drop cached responses built from them.
+"""
+
+import json
+import threading
+from collections import namedtuple
+from datetime import datetime, timezone
+from typing import Callable
+from data import database
+from data.notifications import Listener
+
+CHANNEL = 'resource_versions'
+FAMILIES = ('tournaments', 'players', 'teams', 'match_formats', 'matches')
+
+ResourceVersion = namedtuple('ResourceVersion', ['version', 'modified_at'])
+
+BUMP_QUERY = '''WITH bumped AS (
+            UPDATE resource_versions SET version = version + 1, modified_at = clock_timestamp()
+            WHERE family = ANY(%s)
+            RETURNING family, version, modified_at
+        )
+        SELECT family, version, modified_at,
+               pg_notify(%s, json_build_object(
+                   'family', family, 'version', version,
+                   'modified_at', extract(epoch FROM modified_at)
+               )::text)
+        FROM bumped'''
+
+_versions: dict[str, ResourceVersion] = {}
+_versions_lock = threading.Lock()
+_change_callbacks: list[Callable[[set[str]], None]] = []
+_listener: Listener | None = None
+_listener_lock = threading.Lock()
+
+def bump(*families: str) -> None:
+    """
+    Increments the versions of `families` and announces them to every process.
+    Inside a transaction this happens once it commits, and not at all if it
+    is rolled back.
+    """
+    database.on_commit(lambda: _publish(families))
+
+def _publish(families: tuple[str, ...]) -> None:
+    """
+    Increments and announces the versions of `families` in one statement.
+    """
+    rows = database.read_query(BUMP_QUERY, (list(families), CHANNEL))
+    _apply([row[:3] for row in rows])
+
+def validators(*families: str) -> tuple[str, datetime] | None:
+    """
+    Returns the entity tag and last modification time of a response built
+    from `families`, or None while the versions are not known to be current.
+    """
+    if not start_listener().listening.is_set():
+        return None
+
+    with _versions_lock:
+        known = [_versions.get(family) for family in families]
+    if None in known:
+        return None
+
+    etag = "-".join(f"{family}.{known_version.version}"
+                    for family, known_version in zip(families, known))
+    return etag, max(known_version.modified_at for known_version in known)
+
+def dispatch(payload: str) -> None:
+    """
+    Applies a version announced by a notification.
+    """
+    message = json.loads(payload)
+    _apply([(message["family"], message["version"],
+             datetime.fromtimestamp(message["modified_at"], timezone.utc))])
+
+def reload() -> None:
+    """
+    Reads the resource_versions table into the in-memory copy.
+    """
+    _apply(database.read_query("SELECT family, version, modified_at FROM resource_versions"))
+
+def on_change(callback: Callable[[set[str]], None]) -> None:
+    """
+    Registers `callback` to be called with the families whose version changed.
+    """
+    _change_callbacks.append(callback)
+
+def _apply(rows: list[tuple[str, int, datetime]]) -> None:
+    """
+    Records (family, version, modified_at) rows, keeping the highest version
+    of every family, since notifications and reloads may arrive out of order.
+    """
+    changed = set()
+    with _versions_lock:
+        for family, version, modified_at in rows:
+            known = _versions.get(family)
+            if known is None or version > known.version:
+                _versions[family] = ResourceVersion(version, modified_at)
+                if known is not None:
+                    changed.add(family)
+
+    if changed:
+        for callback in _change_callbacks:
+            callback(changed)
+
+def start_listener() -> Listener:
+    """
+    Starts listening for version changes in this process, if not started yet,
+    and returns the listener.
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = Listener(CHANNEL, dispatch, on_listen=reload)
+            _listener.start()
+        return _listener
+
+def stop_listener() -> None:
+    """
+    Stops listening for version changes in this process.
+    """
+    global _listener
+    with _listener_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
@@ -0,0 +1,150 @@
+"""
+This module contains tests for the asyncio data layer in `data.async_database`
+and the async services in `services.async_services`.
+"""
+
+from datetime import date
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+from data import async_database
+from services import async_services, tournaments_service
+
+def _fake_pool(conn: MagicMock) -> MagicMock:
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    return pool
+
+class AsyncDatabaseShould(IsolatedAsyncioTestCase):
+    """
+    Unit tests for the asyncpg query helpers.
+    """
+    def setUp(self):
+        self.conn = MagicMock()
+        self.conn.fetch = AsyncMock(return_value=[{'id': 1}])
+        self.conn.transaction.return_value.__aenter__ = AsyncMock()
+        self.conn.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+        self.pool = _fake_pool(self.conn)
+        patcher = patch('data.async_database.open_pool', AsyncMock(return_value=self.pool))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_read_query_numbers_placeholders(self):
+        """
+        Tests that `%s` placeholders are sent as `$n` with positional arguments.
+        """
+        self.conn.fetch.return_value = [(1, 'Lakers')]
+
+        rows = await async_database.read_query(
+            "SELECT id, name FROM team WHERE id > %s LIMIT %s", (5, 10)
+        )
+
+        self.conn.fetch.assert_awaited_once_with(
+            "SELECT id, name FROM team WHERE id > $1 LIMIT $2", 5, 10
+        )
+        self.assertEqual(rows, [(1, 'Lakers')])
+
+    async def test_transaction_shares_one_connection(self):
+        """
+        Tests that queries inside a transaction, even nested ones, run on one connection.
+        """
+        async with async_database.transaction() as conn:
+            async with async_database.transaction() as inner:
+                await async_database.read_query("SELECT 1")
+            await async_database.read_query("SELECT 2")
+
+        self.assertIs(conn, inner)
+        self.assertEqual(self.pool.acquire.call_count, 1)
+        self.assertEqual(self.conn.fetch.await_count, 2)
+
+    async def test_execute_statement_rejects_unknown_name(self):
+        """
+        Tests that executing a statement that was never registered raises ValueError.
+        """
+        with self.assertRaises(ValueError):
+            await async_database.execute_statement("no_such_statement")
+
+class AsyncServicesShould(IsolatedAsyncioTestCase):
+    """
+    Unit tests for the async counterparts of the read services.
+    """
+    def setUp(self):
+        tournaments_service._detail_cache.clear()
+        patcher = patch('data.async_database.read_query', new_callable=AsyncMock)
+        self.read_query = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_player_matches_page_converts_cursor_date(self):
+        """
+        Tests that the ISO date of a decoded cursor is bound as a date and the
+        rows are grouped like in the synchronous service.
+        """
+        self.read_query.return_value = [
+            (3, "Final", date(2030, 1, 2), "1v1", 5, "Kobe Bryant"),
+            (3, "Final", date(2030, 1, 2), "1v1", 6, "Shaquille O'Neal"),
+        ]
+
+        page = await async_services.player_matches_page(10, ("2030-01-01", 2))
+
+        sql_params = self.read_query.await_args.args[1]
+        self.assertEqual(sql_params, (date(2030, 1, 1), 2, 11))
+        self.assertEqual(len(page.items), 1)
+        self.assertEqual(page.items[0].player_name, ["Kobe Bryant", "Shaquille O'Neal"])
+        self.assertIsNone(page.next_key)
+
+    async def test_player_matches_page_rejects_malformed_cursor(self):
+        """
+        Tests that a cursor without a valid date raises ValueError before querying.
+        """
+        with self.assertRaises(ValueError):
+            await async_services.player_matches_page(10, ("yesterday", 2))
+
+        self.read_query.assert_not_awaited()
+
+    async def test_teams_page_returns_next_key(self):
+        """
+        Tests that fetching one row more than the limit yields the next key.
+        """
+        self.read_query.return_value = [(1, "Lakers"), (2, "Bulls"), (3, "Celtics")]
+
+        page = await async_services.teams_page(2)
+
+        self.assertEqual([team.name for team in page.items], ["Lakers", "Bulls"])
+        self.assertEqual(page.next_key, (2,))
+
+    async def test_get_by_tournament_id_uses_shared_cache(self):
+        """
+        Tests that a loaded tournament is cached for both serving modes.
+        """
+        self.read_query.side_effect = [
+            [(1, "Cup", "1000 lv", 1, None)],
+            [(10, 1, date(2030, 1, 1), 1, None, None, None, None, None, None,
+              None, None, None, None, None, None, None, None)],
+        ]
+
+        with patch("services.reference_service.tournament_formats") as tournament_formats:
+            tournament_formats.name_of.return_value = "Knockout"
+            first = await async_services.get_by_tournament_id(1)
+            second = await async_services.get_by_tournament_id(1)
+
+        self.assertIs(first, second)
+        self.assertIs(tournaments_service.cached_tournament(1), first)
+        self.assertEqual(self.read_query.await_count, 2)
+        self.assertEqual([m.id for m in first.matchups], [10])
+        self.assertEqual(first.format, "Knockout")
+
+    async def test_get_by_tournament_id_missing_tournament(self):
+        """
+        Tests that a missing tournament returns None after a single query.
+        """
+        self.read_query.return_value = []
+
+        self.assertIsNone(await async_services.get_by_tournament_id(99))
+        self.assertEqual(self.read_query.await_count, 1)
+
+    async def test_stats_leaderboard_rejects_unknown_ordering(self):
+        """
+        Tests that an unknown leaderboard ordering raises ValueError.
+        """
+        with self.assertRaises(ValueError):
+            await async_services.stats_leaderboard("assists")
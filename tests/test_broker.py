@@ -0,0 +1,97 @@
+"""
+This module contains unit tests for the in-process publish/subscribe broker.
+"""
+
+import threading
+from unittest import IsolatedAsyncioTestCase, TestCase
+from common.broker import Broker, sse_frame
+
+class BrokerShould(TestCase):
+    """
+    Unit tests for the Broker class with blocking subscribers.
+    """
+    def test_fans_out_one_frame_to_every_subscriber_of_a_topic(self):
+        """
+        Tests that all subscribers of a topic receive the same encoded frame
+        and subscribers of other topics receive nothing.
+        """
+        broker = Broker()
+        first, second = broker.subscribe("tournament:1"), broker.subscribe("tournament:1")
+        other = broker.subscribe("tournament:2")
+
+        delivered = broker.publish("tournament:1", "score", '{"matchup_id":9}')
+
+        self.assertEqual(delivered, 2)
+        frame = first.get(timeout=0)
+        self.assertEqual(frame, b'event: score\ndata: {"matchup_id":9}\n\n')
+        self.assertIs(second.get(timeout=0), frame)
+        self.assertIsNone(other.get(timeout=0))
+
+    def test_closed_subscription_stops_receiving(self):
+        """
+        Tests that leaving the subscription block unsubscribes it.
+        """
+        broker = Broker()
+        with broker.subscribe("match:3"):
+            self.assertEqual(broker.stats().subscribers, 1)
+
+        self.assertEqual(broker.publish("match:3", "score", "{}"), 0)
+        self.assertEqual(broker.stats(), (0, 0, 1, 0))
+
+    def test_drops_subscriber_that_falls_behind(self):
+        """
+        Tests that a subscriber with a full queue is closed instead of blocking the publisher.
+        """
+        broker = Broker(max_pending=2)
+        slow = broker.subscribe("match:3")
+
+        for _ in range(3):
+            broker.publish("match:3", "score", "{}")
+
+        self.assertTrue(slow.closed)
+        self.assertEqual(broker.stats().subscribers, 0)
+        self.assertEqual(broker.stats().dropped, 1)
+
+    def test_blocking_get_wakes_up_on_publish(self):
+        """
+        Tests that a subscriber waiting in another thread receives a published frame.
+        """
+        broker = Broker()
+        subscription = broker.subscribe("match:3")
+        received = []
+        waiter = threading.Thread(target=lambda: received.append(subscription.get(timeout=5)))
+        waiter.start()
+
+        broker.publish("match:3", "score", "{}")
+        waiter.join(5)
+
+        self.assertEqual(received, [sse_frame("score", "{}")])
+
+class AsyncSubscriptionShould(IsolatedAsyncioTestCase):
+    """
+    Unit tests for subscriptions consumed from an event loop.
+    """
+    async def test_receives_frames_published_from_another_thread(self):
+        """
+        Tests that a frame published by a listener thread is handed to the event loop.
+        """
+        broker = Broker()
+        subscription = broker.subscribe_async("tournament:1")
+
+        publisher = threading.Thread(target=broker.publish, args=("tournament:1", "winner", "{}"))
+        publisher.start()
+        frame = await subscription.get(timeout=5)
+        publisher.join()
+
+        self.assertEqual(frame, sse_frame("winner", "{}"))
+
+    async def test_get_times_out_without_events(self):
+        """
+        Tests that waiting without events returns None after the timeout.
+        """
+        broker = Broker()
+        subscription = broker.subscribe_async("tournament:1")
+
+        self.assertIsNone(await subscription.get(timeout=0.01))
+        subscription.close()
+        self.assertEqual(broker.publish("tournament:1", "score", "{}"), 0)
@@ -0,0 +1,79 @@
+"""
+This module contains unit tests for the in-process TTL cache.
+"""
+
+from unittest import TestCase
+from unittest.mock import patch
+from common.cache import TTLCache
+
+class TTLCacheShould(TestCase):
+    """
+    Unit tests for the TTLCache class.
+    """
+    def test_returns_value_until_it_expires(self):
+        """
+        Tests that entries are served until their TTL passes.
+        """
+        cache = TTLCache()
+        with patch("common.cache.time.monotonic", return_value=100.0):
+            cache.set("key", "value", 10)
+        with patch("common.cache.time.monotonic", return_value=109.0):
+            self.assertEqual(cache.get("key"), "value")
+        with patch("common.cache.time.monotonic", return_value=110.0):
+            self.assertIsNone(cache.get("key"))
+
+        self.assertEqual(cache.stats().hits, 1)
+        self.assertEqual(cache.stats().misses, 1)
+        self.assertEqual(cache.stats().size, 0)
+
+    def test_ignores_non_positive_ttl(self):
+        """
+        Tests that values which would already be expired are not stored.
+        """
+        cache = TTLCache()
+        cache.set("key", "value", 0)
+
+        self.assertIsNone(cache.get("key"))
+
+    def test_evicts_least_recently_used_entry_when_full(self):
+        """
+        Tests that the entry read least recently is evicted first.
+        """
+        cache = TTLCache(max_size=2)
+        cache.set("a", 1, 60)
+        cache.set("b", 2, 60)
+        cache.get("a")
+        cache.set("c", 3, 60)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.stats().evictions, 1)
+
+    def test_discard_removes_single_key(self):
+        """
+        Tests that an entry is removed by its key and missing keys are ignored.
+        """
+        cache = TTLCache()
+        cache.set("a", 1, 60)
+        cache.set("b", 2, 60)
+
+        cache.discard("a")
+        cache.discard("missing")
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), 2)
+
+    def test_discard_if_removes_matching_values(self):
+        """
+        Tests that entries are removed by a predicate on their values.
+        """
+        cache = TTLCache()
+        cache.set("a", 1, 60)
+        cache.set("b", 2, 60)
+        cache.set("c", 1, 60)
+
+        removed = cache.discard_if(lambda value: value == 1)
+
+        self.assertEqual(removed, 2)
+        self.assertEqual(cache.get("b"), 2)
+        self.assertIsNone(cache.get("a"))
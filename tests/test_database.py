@@ -0,0 +1,376 @@
+"""
+This module contains tests for the connection pool and the query helpers
+in the `data.database` module.
+"""
+
+import threading
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+import psycopg2
+from data import database
+from data.pool import ConnectionPool, PoolTimeout
+
+def _fake_connection() -> MagicMock:
+    conn = MagicMock()
+    conn.closed = 0
+    conn.cursor.return_value.__enter__.return_value.rowcount = 1
+    return conn
+
+class ConnectionPoolShould(TestCase):
+    """
+    Unit tests for the ConnectionPool class.
+    """
+    def test_reuses_returned_connections(self):
+        """
+        Tests that a returned connection is handed out again instead of opening a new one.
+        """
+        connect = MagicMock(side_effect=_fake_connection)
+        pool = ConnectionPool(connect, min_size=1, max_size=2)
+
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(connect.call_count, 1)
+        self.assertEqual(pool.stats().checkouts, 2)
+
+    def test_opens_up_to_max_size_connections(self):
+        """
+        Tests that concurrent checkouts open new connections until max_size is reached.
+        """
+        pool = ConnectionPool(_fake_connection, min_size=0, max_size=2, timeout=0.05)
+
+        first = pool.getconn()
+        second = pool.getconn()
+
+        self.assertIsNot(first, second)
+        self.assertEqual(pool.stats().in_use, 2)
+        with self.assertRaises(PoolTimeout):
+            pool.getconn()
+
+    def test_waiting_checkout_receives_released_connection(self):
+        """
+        Tests that a checkout blocked on an exhausted pool gets the next returned connection.
+        """
+        pool = ConnectionPool(_fake_connection, min_size=0, max_size=1, timeout=2)
+        conn = pool.getconn()
+        received = []
+
+        waiter = threading.Thread(target=lambda: received.append(pool.getconn()))
+        waiter.start()
+        pool.putconn(conn)
+        waiter.join()
+
+        self.assertEqual(received, [conn])
+        self.assertEqual(pool.stats().waits, 1)
+
+    def test_replaces_closed_connections_on_checkout(self):
+        """
+        Tests that a connection closed while idle is discarded and replaced.
+        """
+        pool = ConnectionPool(_fake_connection, min_size=0, max_size=1)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        conn.closed = 1
+
+        replacement = pool.getconn()
+
+        self.assertIsNot(conn, replacement)
+        self.assertEqual(pool.stats().discarded, 1)
+        self.assertEqual(pool.stats().size, 1)
+
+    def test_replaces_connections_failing_health_check(self):
+        """
+        Tests that an idle connection failing the ping is discarded and replaced.
+        """
+        pool = ConnectionPool(_fake_connection, min_size=0, max_size=1, health_check_after=0)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        conn.cursor.return_value.__enter__.return_value.execute.side_effect = (
+            psycopg2.OperationalError("server closed the connection")
+        )
+
+        replacement = pool.getconn()
+
+        self.assertIsNot(conn, replacement)
+        self.assertEqual(pool.stats().created, 2)
+
+    def test_rejects_invalid_sizes(self):
+        """
+        Tests that a pool with min_size above max_size cannot be created.
+        """
+        with self.assertRaises(ValueError):
+            ConnectionPool(_fake_connection, min_size=3, max_size=2)
+
+class DatabaseShould(TestCase):
+    """
+    Unit tests for the query helpers running on the shared pool.
+    """
+    def setUp(self):
+        self.conn = _fake_connection()
+        self.cursor = self.conn.cursor.return_value.__enter__.return_value
+        pool = ConnectionPool(lambda: self.conn, min_size=0, max_size=1)
+        patcher = patch("data.database._pool", pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_read_query_returns_rows_and_releases_connection(self):
+        """
+        Tests that read_query returns all rows and puts the connection back.
+        """
+        self.cursor.fetchall.return_value = [(1, "Lakers")]
+
+        result = database.read_query("SELECT id, name FROM team")
+
+        self.assertEqual(result, [(1, "Lakers")])
+        self.assertEqual(database.pool_stats().in_use, 0)
+        self.conn.commit.assert_called()
+
+    def test_failed_query_rolls_back_and_releases_connection(self):
+        """
+        Tests that an error rolls back the transaction and returns the connection.
+        """
+        self.cursor.execute.side_effect = psycopg2.DatabaseError("boom")
+
+        with self.assertRaises(psycopg2.DatabaseError):
+            database.update_query("UPDATE team SET name = %s", ("x",))
+
+        self.conn.rollback.assert_called_once()
+        self.assertEqual(database.pool_stats().in_use, 0)
+
+class TransactionShould(TestCase):
+    """
+    Unit tests for the transaction API.
+    """
+    def setUp(self):
+        self.connect = MagicMock(side_effect=_fake_connection)
+        pool = ConnectionPool(self.connect, min_size=0, max_size=2)
+        patcher = patch("data.database._pool", pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_query_helpers_join_active_transaction(self):
+        """
+        Tests that statements issued inside a transaction share one connection and commit once.
+        """
+        with database.transaction():
+            database.insert_query("INSERT INTO team (name) VALUES (%s) RETURNING id", ("A",))
+            database.update_query("UPDATE team SET name = %s WHERE id = %s", ("B", 1))
+            with database.transaction():
+                database.read_query("SELECT * FROM team")
+
+        conn = database._pool.getconn()
+        self.assertEqual(self.connect.call_count, 1)
+        self.assertEqual(database.pool_stats().checkouts, 2)
+        conn.commit.assert_called_once()
+
+    def test_transaction_rolls_back_on_error(self):
+        """
+        Tests that an exception inside the block rolls back and skips the commit.
+        """
+        with self.assertRaises(ValueError):
+            with database.transaction() as tx:
+                tx.update_query("UPDATE team SET name = %s", ("x",))
+                raise ValueError("invalid participant")
+
+        conn = database._pool.getconn()
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+
+    def test_on_commit_callbacks_run_only_after_commit(self):
+        """
+        Tests that callbacks registered inside a transaction run after its commit
+        and are dropped when it rolls back.
+        """
+        committed = []
+        with database.transaction() as tx:
+            database.on_commit(lambda: committed.append(tx._conn.commit.called))
+            self.assertEqual(committed, [])
+
+        with self.assertRaises(ValueError):
+            with database.transaction():
+                database.on_commit(lambda: committed.append("rolled back"))
+                raise ValueError("invalid participant")
+
+        database.on_commit(lambda: committed.append("outside"))
+        self.assertEqual(committed, [True, "outside"])
+
+    def test_insert_many_expands_rows_and_returns_ids(self):
+        """
+        Tests that insert_many sends one multi-row statement and returns the generated ids.
+        """
+        with database.transaction() as tx:
+            cur = tx._conn.cursor.return_value.__enter__.return_value
+            cur.fetchall.return_value = [(7,), (8,)]
+            ids = tx.insert_many(
+                "INSERT INTO matchups (tournament_id, tournament_phase) VALUES %s RETURNING id",
+                [(1, 1), (1, 2)]
+            )
+
+        self.assertEqual(ids, [7, 8])
+        cur.execute.assert_called_once_with(
+            "INSERT INTO matchups (tournament_id, tournament_phase) "
+            "VALUES (%s, %s), (%s, %s) RETURNING id",
+            (1, 1, 1, 2)
+        )
+
+class StreamQueryShould(TestCase):
+    """
+    Unit tests for streaming rows through a server-side cursor.
+    """
+    def setUp(self):
+        self.conn = _fake_connection()
+        self.cursor = self.conn.cursor.return_value.__enter__.return_value
+        self.cursor.__iter__.return_value = iter([(1,), (2,), (3,)])
+        pool = ConnectionPool(lambda: self.conn, min_size=0, max_size=1)
+        patcher = patch("data.database._pool", pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_yields_rows_from_named_cursor(self):
+        """
+        Tests that rows come from a named cursor with the requested itersize.
+        """
+        rows = list(database.stream_query("SELECT id FROM match", itersize=500))
+
+        self.assertEqual(rows, [(1,), (2,), (3,)])
+        self.assertTrue(self.conn.cursor.call_args.kwargs["name"].startswith("stream_"))
+        self.assertEqual(self.cursor.itersize, 500)
+        self.assertEqual(database.pool_stats().in_use, 0)
+
+    def test_releases_connection_when_closed_early(self):
+        """
+        Tests that abandoning the stream ends the transaction and returns the connection.
+        """
+        stream = database.stream_query("SELECT id FROM match")
+        next(stream)
+        self.assertEqual(database.pool_stats().in_use, 1)
+
+        stream.close()
+
+        self.conn.rollback.assert_called_once()
+        self.assertEqual(database.pool_stats().in_use, 0)
+
+class QueryLogShould(TestCase):
+    """
+    Unit tests for recording statements in a query log.
+    """
+    def setUp(self):
+        self.conn = _fake_connection()
+        pool = ConnectionPool(lambda: self.conn, min_size=0, max_size=1)
+        patcher = patch("data.database._pool", pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_counts_queries_and_connections(self):
+        """
+        Tests that statements and connection checkouts inside the block are counted.
+        """
+        with database.track_queries() as log:
+            database.read_query("SELECT 1")
+            with database.transaction():
+                database.read_query("SELECT 2")
+                database.update_query("UPDATE x SET y = 1")
+
+        self.assertEqual(log.queries, 3)
+        self.assertEqual(log.connections, 2)
+        self.assertGreaterEqual(log.db_time, 0)
+
+    def test_flags_statements_repeated_with_different_params(self):
+        """
+        Tests that the same SQL run with many parameter sets is reported as N+1.
+        """
+        with database.track_queries() as log:
+            for player_id in range(database.N_PLUS_ONE_THRESHOLD):
+                database.read_query("SELECT * FROM player WHERE id = %s", (player_id,))
+            for _ in range(database.N_PLUS_ONE_THRESHOLD):
+                database.read_query("SELECT * FROM country")
+
+        self.assertEqual(
+            log.repeated(),
+            {"SELECT * FROM player WHERE id = %s": database.N_PLUS_ONE_THRESHOLD}
+        )
+
+    def test_records_nothing_outside_the_block(self):
+        """
+        Tests that statements after the block are not recorded.
+        """
+        with database.track_queries() as log:
+            database.read_query("SELECT 1")
+        database.read_query("SELECT 2")
+
+        self.assertEqual(log.queries, 1)
+
+class PreparedStatementShould(TestCase):
+    """
+    Unit tests for the prepared-statement registry.
+    """
+    def setUp(self):
+        database.register_statement("test_player_by_id", "SELECT * FROM player WHERE id = %s")
+        self.connections = []
+
+        def connect():
+            conn = _fake_connection()
+            self.connections.append(conn)
+            return conn
+
+        self.pool = ConnectionPool(connect, min_size=0, max_size=1)
+        patcher = patch("data.database._pool", self.pool)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _statements(self, conn: MagicMock) -> list[str]:
+        cursor = conn.cursor.return_value.__enter__.return_value
+        return [c.args[0] for c in cursor.execute.call_args_list]
+
+    def test_prepares_once_per_connection(self):
+        """
+        Tests that a statement is prepared on first use and executed by name afterwards.
+        """
+        database.execute_statement("test_player_by_id", (1,))
+        database.execute_statement("test_player_by_id", (2,))
+
+        self.assertEqual(self._statements(self.connections[0]), [
+            "PREPARE test_player_by_id AS SELECT * FROM player WHERE id = $1",
+            "EXECUTE test_player_by_id (%s)",
+            "EXECUTE test_player_by_id (%s)",
+        ])
+
+    def test_prepares_again_on_new_connection(self):
+        """
+        Tests that a connection replacing a closed one prepares the statement again.
+        """
+        database.execute_statement("test_player_by_id", (1,))
+        self.connections[0].closed = 1
+        database.execute_statement("test_player_by_id", (2,))
+
+        self.assertEqual(len(self.connections), 2)
+        self.assertTrue(self._statements(self.connections[1])[0].startswith("PREPARE"))
+
+    def test_prepares_again_when_server_forgot_statement(self):
+        """
+        Tests that a statement missing on the server is prepared again and retried.
+        """
+        database.execute_statement("test_player_by_id", (1,))
+        conn = self.connections[0]
+        cursor = conn.cursor.return_value.__enter__.return_value
+        cursor.execute.side_effect = [psycopg2.errors.InvalidSqlStatementName(), None, None]
+
+        database.execute_statement("test_player_by_id", (2,))
+
+        self.assertEqual(self._statements(conn)[-2:], [
+            "PREPARE test_player_by_id AS SELECT * FROM player WHERE id = $1",
+            "EXECUTE test_player_by_id (%s)",
+        ])
+        conn.rollback.assert_called_once()
+
+    def test_rejects_unknown_and_conflicting_statements(self):
+        """
+        Tests that unknown names and re-registrations with other SQL are refused.
+        """
+        with self.assertRaises(ValueError):
+            database.execute_statement("missing_statement")
+        with self.assertRaises(ValueError):
+            database.register_statement("test_player_by_id", "SELECT 1")
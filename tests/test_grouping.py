@@ -0,0 +1,52 @@
+"""
+This module contains unit tests for grouping joined rows into per-parent records.
+"""
+
+import unittest
+from data.models import PlayerMatch
+from services import grouping
+
+class GroupingShould(unittest.TestCase):
+    """
+    Unit tests for the grouping functions.
+    """
+    def test_group_matches_keeps_players_with_same_name(self):
+        """
+        Tests that distinct participants sharing a name are both kept.
+        """
+        rows = [
+            (1, 'Match 1', '2025-01-01', 'Format A', 1, 'John Doe'),
+            (1, 'Match 1', '2025-01-01', 'Format A', 2, 'John Doe'),
+            (1, 'Match 1', '2025-01-01', 'Format A', 1, 'John Doe'),
+        ]
+
+        result = list(grouping.group_matches(rows, 'player_id', 'player_name'))
+
+        self.assertEqual(result[0]['player_id'], [1, 2])
+        self.assertEqual(result[0]['player_name'], ['John Doe', 'John Doe'])
+
+    def test_group_matches_skips_null_participants(self):
+        """
+        Tests that a match without participants from an outer join gets empty lists.
+        """
+        rows = [(1, 'Match 1', '2025-01-01', 'Format A', None, None)]
+
+        result = list(grouping.group_matches(rows, 'team_id', 'team_name'))
+
+        self.assertEqual(result[0]['team_id'], [])
+        self.assertEqual(result[0]['team_name'], [])
+
+    def test_build_models_validates_in_batches(self):
+        """
+        Tests that records are turned into models across batch boundaries.
+        """
+        records = [
+            {'match_id': i, 'title': f'Match {i}', 'played_at': '2025-01-01',
+             'match_format_name': 'Format A', 'player_id': [i], 'player_name': [f'P{i}']}
+            for i in range(5)
+        ]
+
+        result = list(grouping.build_models(PlayerMatch, records, batch_size=2))
+
+        self.assertEqual([m.match_id for m in result], [0, 1, 2, 3, 4])
+        self.assertIsInstance(result[0], PlayerMatch)
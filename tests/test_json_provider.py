@@ -0,0 +1,80 @@
+"""
+This module contains tests for the JSON provider serializing pydantic models
+directly in `common.json_provider`.
+"""
+
+import json
+from datetime import date
+from unittest import TestCase
+from unittest.mock import patch
+from flask import Flask, jsonify
+from common.json_provider import FastJSONProvider, dumps_bytes
+from data.models import MatchUp, PlayerMatch
+
+PLAYED = date(2030, 1, 2)
+HTTP_PLAYED = "Wed, 02 Jan 2030 00:00:00 GMT"
+
+class FastJSONProviderShould(TestCase):
+    """
+    Unit tests for the FastJSONProvider class and dumps_bytes.
+    """
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.json = FastJSONProvider(self.app)
+        self.matchup = MatchUp(id=1, tournament_id=3, played_at=PLAYED, player_one=7)
+
+    def test_serializes_model_with_http_dates(self):
+        """
+        Tests that a model is serialized with its dates formatted as Flask does.
+        """
+        with self.app.app_context():
+            response = jsonify(self.matchup)
+
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertTrue(response.data.endswith(b"}\n"))
+        self.assertEqual(response.json["played_at"], HTTP_PLAYED)
+        self.assertEqual(self.matchup.model_dump()["played_at"], PLAYED)
+
+    def test_serializes_list_of_models(self):
+        """
+        Tests that a list of models of one type is serialized as a JSON array.
+        """
+        matches = [PlayerMatch(match_id=i, title="Final", played_at=PLAYED,
+                               match_format_name="Time limit", player_id=[1, 2],
+                               player_name=["A", "B"]) for i in range(3)]
+
+        body = json.loads(dumps_bytes(matches))
+
+        self.assertEqual([match["match_id"] for match in body], [0, 1, 2])
+        self.assertEqual(body[0]["played_at"], HTTP_PLAYED)
+
+    def test_nested_models_match_default_provider_output(self):
+        """
+        Tests that payloads mixing dicts, dates and models give the bytes the
+        default provider gives for their dumped form, with or without orjson.
+        """
+        payload = {"standings": [self.matchup], "updated": PLAYED, "name": "Купа"}
+        default_app = Flask(__name__)
+        default_app.json.compact = True
+        with default_app.app_context():
+            default_app.json.ensure_ascii = False
+            expected = jsonify({**payload, "standings": [self.matchup.model_dump()]}).data
+
+        with self.app.app_context():
+            body = jsonify(payload).data
+            with patch("common.json_provider.orjson", None):
+                fallback = jsonify(payload).data
+
+        self.assertEqual(body, expected)
+        self.assertEqual(fallback, expected)
+
+    def test_indents_responses_in_debug_mode(self):
+        """
+        Tests that debug responses are still pretty-printed.
+        """
+        self.app.debug = True
+
+        with self.app.app_context():
+            response = jsonify(self.matchup)
+
+        self.assertIn(b'\n  "played_at": "' + HTTP_PLAYED.encode(), response.data)
@@ -3,9 +3,11 @@ This module contains unit tests for the match service functionality in the sport
 """
 
 import unittest
+from datetime import date
 from unittest.mock import patch, MagicMock
 from services import match_service
 from data.models import Match, PlayerMatchDetailUpdate, TeamMatchDetailUpdate
+from services.player_stats import StatDelta
 
 class TestMatchService(unittest.TestCase):
     """
@@ -13,6 +15,14 @@ class TestMatchService(unittest.TestCase):
     Includes tests for sorting matches, creating player/team response objects, 
     and handling match creation and score updates.
     """
+    def setUp(self):
+        patcher = patch('services.scoreboard_service.publish')
+        self.publish = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('services.version_service.bump')
+        self.bump = patcher.start()
+        self.addCleanup(patcher.stop)
+
     def test_sort_matches_by_match_format_id(self):
         """
         Test sorting of matches by their match_format_id attribute.
@@ -27,9 +37,9 @@ class TestMatchService(unittest.TestCase):
         self.assertEqual(sorted_matches[1].match_format_id, 2)
 
     @patch('services.match_service.read_query')
-    def test_all_player_matches(self, mock_read_query):
+    def test_player_matches_page_groups_participants(self, mock_read_query):
         """
-        Test retrieval of all player matches.
+        Test that the participant rows of a page of player matches are grouped per match.
         """
         mock_read_query.return_value = [
             (1, 'Match 1', '2025-01-01', 'Format A', 1, 'Player 1'),
@@ -37,13 +47,58 @@ class TestMatchService(unittest.TestCase):
             (2, 'Match 2', '2025-02-01', 'Format B', 3, 'Player 3'),
         ]
 
-        result = list(match_service.all_player_matches())
+        result = match_service.player_matches_page(10).items
 
         self.assertEqual(len(result), 2)
         self.assertEqual(result[0].match_id, 1)
         self.assertIn('Player 1', list(result[0].player_name))
         self.assertIn('Player 2', list(result[0].player_name))
 
+    @patch('services.match_service.read_query')
+    def test_player_matches_page_returns_next_key(self, mock_read_query):
+        """
+        Test that a page fetched with one extra match is trimmed and returns the next key.
+        """
+        mock_read_query.return_value = [
+            (1, 'Match 1', '2025-01-01', 'Format A', 1, 'Player 1'),
+            (2, 'Match 2', '2025-02-01', 'Format B', 3, 'Player 3'),
+            (3, 'Match 3', '2025-03-01', 'Format B', 4, 'Player 4'),
+        ]
+
+        page = match_service.player_matches_page(2, ('2024-12-31', 9))
+
+        self.assertEqual([m.match_id for m in page.items], [1, 2])
+        self.assertEqual(page.next_key, (page.items[1].played_at, 2))
+        self.assertEqual(mock_read_query.call_args[0][1], (date(2024, 12, 31), 9, 3))
+
+    @patch('services.match_service.read_query')
+    def test_player_matches_page_rejects_cursor_without_date(self, mock_read_query):
+        """
+        Test that a cursor missing part of the (played_at, match_id) key raises
+        ValueError before querying.
+        """
+        with self.assertRaises(ValueError):
+            match_service.player_matches_page(2, (9,))
+
+        mock_read_query.assert_not_called()
+
+    @patch('services.match_service.stream_query')
+    def test_stream_player_matches_groups_consecutive_rows(self, mock_stream_query):
+        """
+        Test that streamed rows are grouped into one match per consecutive match id.
+        """
+        mock_stream_query.return_value = iter([
+            (1, 'Match 1', '2025-01-01', 'Format A', 1, 'Player 1'),
+            (1, 'Match 1', '2025-01-01', 'Format A', 2, 'Player 2'),
+            (2, 'Match 2', '2025-02-01', 'Format B', 3, 'Player 3'),
+        ])
+
+        result = list(match_service.stream_player_matches())
+
+        self.assertEqual([m.match_id for m in result], [1, 2])
+        self.assertEqual(result[0].player_name, ['Player 1', 'Player 2'])
+        self.assertEqual(result[1].player_id, [3])
+
     @patch('services.match_service.PlayerMatchInfo.from_query_result')
     def test_create_player_response_object(self, mock_from_query_result):
         """
@@ -92,9 +147,9 @@ class TestMatchService(unittest.TestCase):
             match_service.create_match_with_players(match, participants)
 
     @patch('services.match_service.read_query')
-    def test_all_team_matches(self, mock_read_query):
+    def test_team_matches_page_groups_participants(self, mock_read_query):
         """
-        Test retrieval of all team matches.
+        Test that the participant rows of a page of team matches are grouped per match.
         """
         mock_read_query.return_value = [
             (1, 'Match 1', '2025-01-01', 'Format A', 1, 'Team A'),
@@ -102,7 +157,7 @@ class TestMatchService(unittest.TestCase):
             (2, 'Match 2', '2025-02-01', 'Format B', 3, 'Team C'),
         ]
 
-        result = list(match_service.all_team_matches())
+        result = match_service.team_matches_page(10).items
 
         self.assertEqual(len(result), 2)
         self.assertEqual(result[0].match_id, 1)
@@ -166,14 +221,15 @@ class TestMatchService(unittest.TestCase):
         self.assertEqual(result['match_id'], 1)
         self.assertEqual(len(result['participants']), 2)
 
-    @patch('services.match_service.insert_query')
+    @patch('services.match_service.transaction')
     @patch('services.match_service.player_service.get_player_by_id')
-    def test_create_match_with_players(self, mock_get_player, mock_insert_query):
+    def test_create_match_with_players(self, mock_get_player, mock_transaction):
         """
-        Test creation of a match with valid players.
+        Test creation of a match with valid players in a single transaction.
         """
         mock_get_player.return_value = MagicMock(id=1, first_name="Player", second_name="One")
-        mock_insert_query.return_value = 1
+        tx = mock_transaction.return_value.__enter__.return_value
+        tx.insert_query.return_value = 1
 
         match = Match(id=None, title="Match 1", played_at="2025-01-01", match_format_id=1)
 
@@ -182,63 +238,97 @@ class TestMatchService(unittest.TestCase):
         match_service.create_match_with_players(match, participants)
 
         self.assertEqual(match.id, 1)
+        tx.insert_many.assert_called_once_with(
+            'INSERT INTO player_match_detail (player_id, match_id) VALUES %s', [(1, 1)]
+        )
 
-    @patch('services.match_service.insert_query')
+    @patch('services.match_service.transaction')
     @patch('services.match_service.team_service.get_team_id')
-    def test_create_with_teams(self, mock_get_team_id, mock_insert_query):
+    def test_create_with_teams(self, mock_get_team_id, mock_transaction):
         """
-        Test creation of a match with valid teams.
+        Test creation of a match with valid teams in a single transaction.
         """
-        mock_get_team_id.return_value = 1
-        mock_insert_query.return_value = 1
+        mock_get_team_id.side_effect = [1, 2]
+        tx = mock_transaction.return_value.__enter__.return_value
+        tx.insert_query.return_value = 1
 
         match = Match(id=None, title="Match 1", played_at="2025-01-01", match_format_id=1)
         teams = ["Team A", "Team B"]
 
         match_service.create_with_teams(match, teams)
 
-        mock_insert_query.assert_called_with(
-            'INSERT INTO team_match_detail (team_id, match_id) VALUES (%s,%s)', (1, 1)
+        tx.insert_many.assert_called_once_with(
+            'INSERT INTO team_match_detail (team_id, match_id) VALUES %s', [(1, 1), (2, 1)]
         )
 
+    @patch('services.player_service.apply_stat_deltas')
+    @patch('services.match_service.transaction')
+    @patch('services.match_service.insert_many')
     @patch('services.match_service.read_query')
-    def test_player_match_exists(self, mock_read_query):
+    def test_update_player_match_score(self, mock_read_query, mock_insert_many, _,
+                                       mock_apply_stat_deltas):
         """
-        Test checking if a player match exists.
+        Test that player match scores are applied in a single upsert.
         """
-        mock_read_query.return_value = [(1,)]
+        mock_read_query.return_value = [(1, 5, None), (1, 6, None)]
+        match_update = PlayerMatchDetailUpdate(player_ids=[5, 6], score=[10, 15])
 
-        result = match_service.player_match_exists(1, 1)
-        self.assertTrue(result)
+        match_service.update_player_match_score(1, match_update)
 
+        mock_insert_many.assert_called_once()
+        sql, rows = mock_insert_many.call_args.args
+        self.assertIn("ON CONFLICT (player_id, match_id) DO UPDATE", sql)
+        self.assertEqual(rows, [(5, 1, 10), (6, 1, 15)])
+        mock_apply_stat_deltas.assert_called_once_with({
+            5: StatDelta(1, 0, 10, 0), 6: StatDelta(1, 1, 15, 0)
+        })
+        self.publish.assert_called_once_with([("match:1", "score", {"match_id": 1, "scores": [
+            {"player_id": 5, "score": 10}, {"player_id": 6, "score": 15}
+        ]})])
+
+    @patch('services.player_service.apply_stat_deltas')
+    @patch('services.match_service.transaction')
+    @patch('services.match_service.insert_many')
     @patch('services.match_service.read_query')
-    def test_match_exists(self, mock_read_query):
+    def test_update_player_match_scores_moves_win_when_scores_change(
+        self, mock_read_query, _, __, mock_apply_stat_deltas):
         """
-        Test checking if a match exists.
+        Test that changing one player's score also updates the other participants' wins.
         """
-        mock_read_query.return_value = [(1,)]
+        mock_read_query.return_value = [(1, 5, 10), (1, 6, 15)]
 
-        result = match_service.match_exists(1)
-        self.assertTrue(result)
+        match_service.update_player_match_scores(
+            {1: PlayerMatchDetailUpdate(player_ids=[5], score=[20])}
+        )
+
+        mock_apply_stat_deltas.assert_called_once_with({
+            5: StatDelta(0, 1, 10, 0), 6: StatDelta(0, -1, 0, 0)
+        })
 
-    @patch('services.match_service.update_query')
-    def test_update_player_match_score(self, mock_update_query):
+    @patch('services.player_service.apply_stat_deltas')
+    @patch('services.match_service.transaction')
+    @patch('services.match_service.insert_many')
+    @patch('services.match_service.read_query')
+    def test_update_player_match_scores_raises_for_unknown_match(
+        self, mock_read_query, mock_insert_many, _, __):
         """
-        Test updating player match scores.
+        Test that no scores are written when one of the matches has no players.
         """
-        match_update = PlayerMatchDetailUpdate(player_ids=[5, 6], score=[10, 15])
+        mock_read_query.return_value = [(1, 5, None)]
+        updates = {
+            1: PlayerMatchDetailUpdate(player_ids=[5], score=[10]),
+            2: PlayerMatchDetailUpdate(player_ids=[6], score=[15]),
+        }
 
-        match_service.update_player_match_score(1, match_update)
+        with self.assertRaises(ValueError):
+            match_service.update_player_match_scores(updates)
 
-        mock_update_query.assert_called_with(
-            '''UPDATE player_match_detail
-                   SET score = %s 
-                   WHERE player_id = %s AND match_id = %s''',
-        (15, 6, 1)
-        )
+        mock_insert_many.assert_not_called()
 
-    @patch('services.match_service.update_query')
-    def test_update_team_match_score(self, mock_update_query):
+    @patch('services.match_service.read_query', return_value=[(1, 1), (1, 2)])
+    @patch('services.match_service.transaction')
+    @patch('services.match_service.insert_many')
+    def test_update_team_match_score(self, mock_insert_many, _, __):
         """
         Test updating team match scores.
         """
@@ -246,8 +336,81 @@ class TestMatchService(unittest.TestCase):
 
         match_service.update_team_match_score(1, match_update)
 
-        mock_update_query.assert_called_with(
-            '''UPDATE team_match_detail
-            SET score = %s WHERE team_id = %s and match_id = %s''',
-            (15, 2, 1)
-        )
+        sql, rows = mock_insert_many.call_args.args
+        self.assertIn("ON CONFLICT (match_id, team_id) DO UPDATE", sql)
+        self.assertEqual(rows, [(1, 1, 10), (1, 2, 15)])
+
+    @patch('services.match_service.read_query', return_value=[(1, 1), (1, 2), (2, 3)])
+    @patch('services.match_service.transaction')
+    @patch('services.match_service.insert_many')
+    def test_update_team_match_scores_publishes_one_event_per_match(self, _, __, ___):
+        """
+        Test that the new scores of every updated match are published to its watchers.
+        """
+        updates = {
+            1: TeamMatchDetailUpdate(team_ids=[1, 2], score=[10, 15]),
+            2: TeamMatchDetailUpdate(team_ids=[3], score=[7]),
+        }
+
+        match_service.update_team_match_scores(updates)
+
+        self.publish.assert_called_once_with([
+            ("match:1", "score", {"match_id": 1, "scores": [
+                {"team_id": 1, "score": 10}, {"team_id": 2, "score": 15}
+            ]}),
+            ("match:2", "score", {"match_id": 2, "scores": [{"team_id": 3, "score": 7}]}),
+        ])
+        self.bump.assert_called_once_with('matches')
+
+    @patch('services.match_service.read_query', return_value=[(1, 1), (2, 1)])
+    @patch('services.match_service.transaction')
+    @patch('services.match_service.insert_many')
+    def test_update_team_match_scores_keeps_last_score_per_team(self, mock_insert_many, _, __):
+        """
+        Test that a team repeated within a match is written once, with its last score.
+        """
+        updates = {
+            1: TeamMatchDetailUpdate(team_ids=[1, 1], score=[10, 12]),
+            2: TeamMatchDetailUpdate(team_ids=[1], score=[7]),
+        }
+
+        match_service.update_team_match_scores(updates)
+
+        self.assertEqual(mock_insert_many.call_args.args[1], [(1, 1, 12), (2, 1, 7)])
+
+    @patch('services.match_service.read_query')
+    @patch('services.match_service.transaction')
+    @patch('services.match_service.insert_many')
+    def test_update_team_match_scores_rejects_unknown_matches_and_outsiders(
+        self, mock_insert_many, _, mock_read_query):
+        """
+        Test that nothing is written for an unknown match or a team not playing in the match.
+        """
+        mock_read_query.return_value = [(1, 1), (1, 2)]
+
+        with self.assertRaises(ValueError):
+            match_service.update_team_match_scores({
+                1: TeamMatchDetailUpdate(team_ids=[1], score=[10]),
+                9: TeamMatchDetailUpdate(team_ids=[1], score=[10]),
+            })
+        with self.assertRaises(ValueError):
+            match_service.update_team_match_score(1, TeamMatchDetailUpdate(team_ids=[3], score=[10]))
+
+        self.assertIn("FOR UPDATE", mock_read_query.call_args.args[0])
+        mock_insert_many.assert_not_called()
+
+    @patch('services.match_service.read_query')
+    @patch('services.match_service.transaction')
+    def test_update_scores_rejects_score_count_mismatch(self, mock_transaction, mock_read_query):
+        """
+        Test that a score list not matching the participants is rejected before any query.
+        """
+        with self.assertRaises(ValueError):
+            match_service.update_team_match_score(1, TeamMatchDetailUpdate(team_ids=[1, 2], score=[10]))
+        with self.assertRaises(ValueError):
+            match_service.update_player_match_score(
+                1, PlayerMatchDetailUpdate(player_ids=[5], score=[10, 12])
+            )
+
+        mock_transaction.assert_not_called()
+        mock_read_query.assert_not_called()
@@ -0,0 +1,56 @@
+"""
+This module contains unit tests for the schema migration runner.
+"""
+
+import unittest
+from unittest.mock import patch, call
+from data import migrations
+from data.migrations import Migration
+
+class MigrationsShould(unittest.TestCase):
+    """
+    Unit tests for applying versioned migrations.
+    """
+    def test_versions_are_unique_and_increasing(self):
+        """
+        Tests that the shipped migrations are numbered 1..n without gaps.
+        """
+        versions = [migration.version for migration in migrations.MIGRATIONS]
+
+        self.assertEqual(versions, list(range(1, len(versions) + 1)))
+
+    @patch("data.migrations.database")
+    def test_applies_only_pending_migrations_in_order(self, mock_database):
+        """
+        Tests that applied versions are skipped and pending ones run and are recorded in order.
+        """
+        tx = mock_database.transaction.return_value.__enter__.return_value
+        mock_database.read_query.return_value = [(1,)]
+        pending = [
+            Migration(3, "third", ["CREATE INDEX c"]),
+            Migration(1, "first", ["CREATE INDEX a"]),
+            Migration(2, "second", ["CREATE INDEX b1", "CREATE INDEX b2"]),
+        ]
+
+        result = migrations.apply_migrations(pending)
+
+        self.assertEqual(result, [2, 3])
+        self.assertEqual(tx.update_query.call_args_list[2:], [
+            call("CREATE INDEX b1"),
+            call("CREATE INDEX b2"),
+            call("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (2, "second")),
+            call("CREATE INDEX c"),
+            call("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (3, "third")),
+        ])
+
+    @patch("data.migrations.database")
+    def test_locks_the_version_table_before_reading_it(self, mock_database):
+        """
+        Tests that concurrent runners are serialized before pending versions are read.
+        """
+        tx = mock_database.transaction.return_value.__enter__.return_value
+        mock_database.read_query.return_value = [(m.version,) for m in migrations.MIGRATIONS]
+
+        self.assertEqual(migrations.apply_migrations(), [])
+        self.assertIn("LOCK TABLE schema_migrations", tx.update_query.call_args_list[1][0][0])
+        self.assertEqual(tx.update_query.call_count, 2)
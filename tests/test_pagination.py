@@ -0,0 +1,89 @@
+"""
+This module contains tests for the keyset pagination helpers in `common.pagination`.
+"""
+
+from datetime import date
+from unittest import TestCase
+from flask import Flask
+from common.pagination import (
+    DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor, id_key, match_key, page_params,
+    read_page_params
+)
+
+class PaginationShould(TestCase):
+    """
+    Unit tests for cursor encoding and query parameter parsing.
+    """
+    def setUp(self):
+        self.app = Flask(__name__)
+
+    def test_cursor_round_trips_sort_key(self):
+        """
+        Test if a sort key survives encoding and decoding, with dates as ISO strings.
+        """
+        token = encode_cursor((date(2025, 1, 31), 42))
+
+        self.assertEqual(decode_cursor(token), ("2025-01-31", 42))
+
+    def test_cursor_is_none_on_last_page(self):
+        """
+        Test if no token is produced when there is no next page.
+        """
+        self.assertIsNone(encode_cursor(None))
+        self.assertIsNone(decode_cursor(None))
+
+    def test_decode_cursor_rejects_garbage(self):
+        """
+        Test if a malformed token raises ValueError.
+        """
+        with self.assertRaises(ValueError):
+            decode_cursor("not-a-cursor")
+
+    def test_page_params_use_defaults(self):
+        """
+        Test if a request without parameters gets the default page size and no cursor.
+        """
+        with self.app.test_request_context("/players/all"):
+            self.assertEqual(page_params(), (DEFAULT_PAGE_SIZE, None))
+
+    def test_page_params_reject_out_of_range_limit(self):
+        """
+        Test if a limit outside the allowed range raises ValueError.
+        """
+        with self.app.test_request_context("/players/all?limit=0"):
+            with self.assertRaises(ValueError):
+                page_params()
+
+    def test_read_page_params_from_mapping(self):
+        """
+        Test if parameters are read from a plain mapping.
+        """
+        token = encode_cursor((7,))
+
+        self.assertEqual(read_page_params({"limit": "5", "cursor": token}), (5, (7,)))
+
+    def test_read_page_params_reject_non_numeric_limit(self):
+        """
+        Test if a limit that is not a number raises ValueError.
+        """
+        with self.assertRaises(ValueError):
+            read_page_params({"limit": "five"})
+
+    def test_keys_convert_decoded_cursors(self):
+        """
+        Test if decoded cursors are converted to the types the drivers bind.
+        """
+        self.assertEqual(id_key((7,)), (7,))
+        self.assertEqual(match_key(("2025-01-31", 42)), (date(2025, 1, 31), 42))
+        self.assertIsNone(id_key(None))
+
+    def test_keys_reject_cursors_of_the_wrong_shape(self):
+        """
+        Test if cursors with the wrong number or type of values raise ValueError.
+        """
+        for key in [(1, 2), ("seven",)]:
+            with self.assertRaises(ValueError):
+                id_key(key)
+        for key in [(1,), ("yesterday", 2), ("2025-01-31", None)]:
+            with self.assertRaises(ValueError):
+                match_key(key)
@@ -7,18 +7,27 @@ from unittest import TestCase
 from unittest.mock import patch
 from services import player_service
 from data.models import Player
+from services.player_stats import StatDelta
 
 class PlayerServiceShould(TestCase):
     """
     This class contains test cases for various functions such as creating a 
     player, retrieving player data, and handling players in a tournament.
     """
-    @patch("services.player_service.database.read_query")
-    def test_country_id_returns_correctly(self, mock_read_query):
+    def setUp(self):
+        patcher = patch("services.player_service.database.transaction")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("services.version_service.bump")
+        self.bump = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("services.player_service.reference_service.countries")
+    def test_country_id_returns_correctly(self, mock_countries):
         """
         Test if country_id correctly returns the country ID for a given country name.
         """
-        mock_read_query.return_value = [(1,)]
+        mock_countries.id_of.return_value = 1
 
         result = player_service.country_id("USA")
         expected = 1
@@ -69,12 +78,12 @@ class PlayerServiceShould(TestCase):
 
         self.assertIsNone(result)
 
-    @patch("services.player_service.database.read_query")
-    def test_get_player_by_id_returns_correctly(self, mock_read_query):
+    @patch("services.player_service.database.execute_statement")
+    def test_get_player_by_id_returns_correctly(self, mock_execute_statement):
         """
         Test if get_player_by_id correctly retrieves the player based on ID.
         """
-        mock_read_query.return_value = [(23, 'Michael', 'Jordan', 'USA', 'Chicago Bulls')]
+        mock_execute_statement.return_value = [(23, 'Michael', 'Jordan', 'USA', 'Chicago Bulls')]
 
         result = player_service.get_player_by_id(23)
         expected = Player(
@@ -84,76 +93,42 @@ class PlayerServiceShould(TestCase):
 
         self.assertEqual(result, expected)
 
-    @patch("services.player_service.database")
-    def test_get_tournament_players_returns_correctly(self, mock_base):
+    @patch("services.player_service.database.read_query")
+    def test_get_players_by_ids_returns_players_keyed_by_id(self, mock_read_query):
         """
-        Test if get_tournament_players correctly retrieves players for a given tournament.
+        Test if get_players_by_ids fetches all players in one query and keys them by ID.
         """
-        mock_base.read_query.return_value = [
-            (23, 'Michael', 'Jordan', 'USA', 'Chicago Bulls', 33, 'Scottie',
-             'Pippen', 'USA', 'Chicago Bulls'
-            ),
-            (30, 'Stephen', 'Curry', 'USA', 'Golden State Warriors', 34, 'Shaquille',
-             'O\'Neal', 'USA', None
-            ),
-            (23, 'Michael', 'Jordan', 'USA', 'Chicago Bulls', 34, 'Shaquille',
-             'O\'Neal', 'USA', None
-            ),
-            (33, 'Scottie', 'Pippen', 'USA', 'Chicago Bulls', 30, 'Stephen',
-             'Curry', 'USA', 'Golden State Warriors'
-            )
-        ]
-
-        result = player_service.get_tournament_players(1)
-        expected = [
-            Player(
-                id=23, first_name="Michael", second_name="Jordan", country="USA",
-                team="Chicago Bulls"
-            ),
-            Player(
-                id=33, first_name="Scottie", second_name="Pippen", country="USA",
-                team="Chicago Bulls"
-            ),
-            Player(
-                id=30, first_name="Stephen", second_name="Curry", country="USA",
-                team="Golden State Warriors"
-            ),
-            Player(
-                id=34, first_name="Shaquille", second_name="O'Neal", country="USA",
-                team=None
-            )
+        mock_read_query.return_value = [
+            (23, 'Michael', 'Jordan', 'USA', 'Chicago Bulls'),
+            (24, 'Kobe', 'Bryant', 'USA', 'Lakers')
         ]
 
-        self.assertEqual(result, expected)
+        result = player_service.get_players_by_ids([23, 24])
 
-    @patch("services.player_service.database")
-    def test_get_tournament_players_returns_correctly_when_no_players(self, mock_base):
-        """
-        Test if get_tournament_players returns an empty list when no players are found.
-        """
-        mock_base.read_query.return_value = []
-
-        result = player_service.get_tournament_players(1)
-        expected = []
-        self.assertEqual(result, expected)
+        self.assertEqual(mock_read_query.call_count, 1)
+        self.assertEqual(mock_read_query.call_args[0][1], ([23, 24],))
+        self.assertEqual(result[24], Player(
+            id=24, first_name='Kobe', second_name='Bryant', country='USA', team='Lakers'
+        ))
 
     @patch("services.player_service.database.update_query")
     def test_delete_player(self, mock_update_query):
         """
-        Test if delete_player correctly deletes a player by ID.
+        Test if delete_player correctly deletes a player by ID and bumps the players version.
         """
         mock_update_query.return_value = None
 
         player_service.delete_player(1)
 
         mock_update_query.assert_called_once_with("DELETE from player where id = %s", (1,))
+        self.bump.assert_called_once_with('players')
 
     @patch("services.player_service.database")
     def test_get_player_by_name_returns_correctly(self, mock_base):
         """
         Test if get_player_by_name correctly retrieves a player based on full name.
         """
-        mock_base.read_query.return_value = [(23, 'Michael', 'Jordan', 'USA', 'Chicago Bulls')]
+        mock_base.execute_statement.return_value = [(23, 'Michael', 'Jordan', 'USA', 'Chicago Bulls')]
 
         result = player_service.get_player_by_name("Michael Jordan")
         expected = Player(
@@ -168,7 +143,7 @@ class PlayerServiceShould(TestCase):
         """
         Test if get_player_by_name returns None when no player is found by the name.
         """
-        mock_base.read_query.return_value = []
+        mock_base.execute_statement.return_value = []
 
         result = player_service.get_player_by_name("Michael Jordan")
         expected = None
@@ -241,12 +216,12 @@ class PlayerServiceShould(TestCase):
 
         self.assertEqual(result, expected)
 
-    @patch("services.player_service.database")
-    def test_country_names_returns_correctly(self, mock_database):
+    @patch("services.player_service.reference_service.countries")
+    def test_country_names_returns_correctly(self, mock_countries):
         """
         Test if country_names correctly returns a list of country names when queried.
         """
-        mock_database.read_query.return_value = [("USA",), ("Canada",)]
+        mock_countries.names.return_value = ["USA", "Canada"]
 
         result = player_service.country_names()
         expected = ["USA", "Canada"]
@@ -295,3 +270,78 @@ class PlayerServiceShould(TestCase):
             "UPDATE player set team_id = %s where team_id = %s", (None, 1)
         )
         self.assertIsNone(result)
+
+    @patch("services.player_service.database")
+    def test_get_player_stats_returns_correctly(self, mock_base):
+        """
+        Test if get_player_stats reads the aggregates and derives the average.
+        """
+        mock_base.read_query.return_value = [(23, 'Michael', 'Jordan', 4, 3, 110, 1)]
+
+        result = player_service.get_player_stats(23)
+
+        self.assertEqual(result.wins, 3)
+        self.assertEqual(result.average_points, 27.5)
+        self.assertEqual(result.titles, 1)
+
+    @patch("services.player_service.database")
+    def test_get_player_stats_returns_none_for_unknown_player(self, mock_base):
+        """
+        Test if get_player_stats returns None when the player does not exist.
+        """
+        mock_base.read_query.return_value = []
+
+        self.assertIsNone(player_service.get_player_stats(99))
+
+    @patch("services.player_service.database")
+    def test_stats_leaderboard_orders_by_indexed_column(self, mock_base):
+        """
+        Test if the points leaderboard orders by total points and limits the rows.
+        """
+        mock_base.read_query.return_value = [(23, 'Michael', 'Jordan', 4, 3, 110, 1)]
+
+        result = player_service.stats_leaderboard('points', 5)
+
+        sql, params = mock_base.read_query.call_args[0]
+        self.assertIn("ORDER BY s.total_points DESC, s.player_id", sql)
+        self.assertEqual(params, (5,))
+        self.assertEqual(result[0].player_id, 23)
+
+    def test_stats_leaderboard_raises_for_unknown_ordering(self):
+        """
+        Test if stats_leaderboard rejects orderings without an index.
+        """
+        with self.assertRaises(ValueError):
+            player_service.stats_leaderboard('average')
+
+    @patch("services.player_service.database")
+    def test_apply_stat_deltas_upserts_in_player_order(self, mock_base):
+        """
+        Test if deltas are added in one upsert, ordered by player ID.
+        """
+        player_service.apply_stat_deltas({
+            30: StatDelta(1, 0, 12, 0), 23: StatDelta(1, 1, 20, 0)
+        })
+        player_service.apply_stat_deltas({})
+
+        mock_base.insert_many.assert_called_once()
+        self.assertEqual(mock_base.insert_many.call_args[0][1],
+                         [(23, 1, 1, 20, 0), (30, 1, 0, 12, 0)])
+
+    @patch("services.player_service.database")
+    def test_rebuild_player_stats_replaces_all_rows(self, mock_base):
+        """
+        Test if the rebuild aggregates every result and title into fresh rows.
+        """
+        tx = mock_base.transaction.return_value.__enter__.return_value
+        tx.read_query.side_effect = [
+            [(2, 23, 20), (2, 30, 12), (3, 23, 8), (3, 33, 9)],
+            [(23, 1), (34, 2)]
+        ]
+
+        result = player_service.rebuild_player_stats()
+
+        self.assertEqual(result, 4)
+        self.assertEqual(tx.insert_many.call_args[0][1], [
+            (23, 2, 1, 28, 1), (30, 1, 0, 12, 0), (33, 1, 1, 9, 0), (34, 0, 0, 0, 2)
+        ])
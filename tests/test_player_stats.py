@@ -0,0 +1,96 @@
+"""
+This module contains unit tests for aggregating scores into player career statistics.
+"""
+
+import unittest
+import numpy as np
+from services import player_stats
+from services.player_stats import StatDelta
+
+class PlayerStatsShould(unittest.TestCase):
+    """
+    Unit tests for the player statistics functions.
+    """
+    def test_result_stats_gives_win_to_single_top_score(self):
+        """
+        Tests that only the sole highest score wins and unscored players are skipped.
+        """
+        result = player_stats.result_stats({1: 80, 2: 72, 3: None})
+        expected = {1: (1, 1, 80), 2: (1, 0, 72)}
+
+        self.assertEqual(result, expected)
+
+    def test_result_stats_gives_no_win_for_tie_or_lone_score(self):
+        """
+        Tests that a tied top score or a single scored participant wins nothing.
+        """
+        self.assertEqual(player_stats.result_stats({1: 70, 2: 70}), {1: (1, 0, 70), 2: (1, 0, 70)})
+        self.assertEqual(player_stats.result_stats({1: 70, 2: None}), {1: (1, 0, 70)})
+
+    def test_result_deltas_moves_win_when_result_is_corrected(self):
+        """
+        Tests that correcting scores moves the win without counting the match again.
+        """
+        result = player_stats.result_deltas({1: 80, 2: 72}, {1: 70, 2: 75})
+        expected = {1: StatDelta(0, -1, -10, 0), 2: StatDelta(0, 1, 3, 0)}
+
+        self.assertEqual(result, expected)
+
+    def test_title_deltas_moves_title_between_players(self):
+        """
+        Tests that replacing a winner removes their title and gives it to the new winner.
+        """
+        self.assertEqual(player_stats.title_deltas(1, 2),
+                         {1: StatDelta(0, 0, 0, -1), 2: StatDelta(0, 0, 0, 1)})
+        self.assertEqual(player_stats.title_deltas(2, 2), {})
+
+    def test_merge_deltas_sums_and_drops_cancelled(self):
+        """
+        Tests that deltas are summed per player and zero sums are dropped.
+        """
+        result = player_stats.merge_deltas(
+            {1: StatDelta(1, 1, 10, 0), 2: StatDelta(1, 0, 5, 0)},
+            {1: StatDelta(1, 0, 7, 0), 2: StatDelta(-1, 0, -5, 0)}
+        )
+
+        self.assertEqual(result, {1: StatDelta(2, 1, 17, 0)})
+
+    def test_aggregate_results_matches_per_game_stats(self):
+        """
+        Tests that the vectorized aggregation agrees with summing result_stats per game.
+        """
+        rng = np.random.default_rng(7)
+        games = rng.integers(0, 300, 2000)
+        players = rng.integers(1, 50, 2000)
+        scores = rng.integers(0, 30, 2000)
+        _, first = np.unique(np.stack([games, players], axis=1), axis=0, return_index=True)
+        games, players, scores = games[first], players[first], scores[first]
+
+        expected: dict[int, list[int]] = {}
+        for game in np.unique(games).tolist():
+            rows = games == game
+            game_scores = dict(zip(players[rows].tolist(), scores[rows].tolist()))
+            for player_id, stats in player_stats.result_stats(game_scores).items():
+                totals = expected.setdefault(player_id, [0, 0, 0])
+                for index, value in enumerate(stats):
+                    totals[index] += value
+
+        player_ids, played, wins, points = player_stats.aggregate_results(games, players, scores)
+        result = {
+            player_id: [matches, won, total]
+            for player_id, matches, won, total in zip(
+                player_ids.tolist(), played.tolist(), wins.tolist(), points.tolist()
+            )
+        }
+
+        self.assertEqual(result, expected)
+
+    def test_aggregate_results_handles_no_rows(self):
+        """
+        Tests that aggregating nothing returns empty arrays.
+        """
+        empty = np.empty(0, dtype=np.int64)
+
+        player_ids, played, wins, points = player_stats.aggregate_results(empty, empty, empty)
+
+        self.assertEqual(player_ids.size + played.size + wins.size + points.size, 0)
@@ -0,0 +1,170 @@
+"""
+This module checks that the hot service queries are planned as index scans.
+
+It needs a PostgreSQL server: set TEST_DSN to a libpq connection string. The
+schema is created from `Database/create_and_fill_database.sql` in a scratch
+schema, migrated, seeded with generated rows and analyzed before the queries
+are explained. The scratch schema is dropped afterwards.
+"""
+
+import os
+import unittest
+from pathlib import Path
+import psycopg2
+from data import database
+from data.migrations import apply_migrations
+
+TEST_DSN = os.environ.get('TEST_DSN')
+SCHEMA = 'query_plan_check'
+SCHEMA_SQL = Path(__file__).resolve().parent.parent / 'Database' / 'create_and_fill_database.sql'
+
+SEED_STATEMENTS = [
+    "INSERT INTO team (name) SELECT 'Team ' || i FROM generate_series(1, 100) AS i",
+    """INSERT INTO player (first_name, second_name, team_id, country_id)
+       SELECT 'First' || (i % 5000), 'Last' || i, i % 100 + 1, 253 + i % 197
+       FROM generate_series(1, 50000) AS i""",
+    """INSERT INTO tournament (title, prize, tournament_format_id)
+       SELECT 'Cup ' || i, '1000 lv', 1 FROM generate_series(1, 2000) AS i""",
+    """INSERT INTO matchups (tournament_id, played_at, tournament_phase, player_one, player_two)
+       SELECT i / 16 + 1, DATE '2030-01-01', i % 5 + 1, i % 50000 + 1, (i + 1) % 50000 + 1
+       FROM generate_series(0, 31999) AS i""",
+    """INSERT INTO match (title, played_at, match_format_id)
+       SELECT 'Match ' || i, DATE '2030-01-01', 2 FROM generate_series(1, 20000) AS i""",
+    """INSERT INTO player_match_detail (player_id, match_id, score)
+       SELECT (i * 2 + side) % 50000 + 1, i, 10 + side
+       FROM generate_series(1, 20000) AS i, generate_series(0, 1) AS side""",
+    """INSERT INTO team_match_detail (match_id, team_id, score)
+       SELECT i, (i + side) % 100 + 1, 10 + side
+       FROM generate_series(1, 20000) AS i, generate_series(0, 1) AS side""",
+    """INSERT INTO users (email, password, role, name)
+       SELECT 'user' || i || '@example.com', 'secret', 'user', 'User ' || i
+       FROM generate_series(1, 20000) AS i""",
+    "ANALYZE",
+]
+
+INDEX_SCANS = {'Index Scan', 'Index Only Scan', 'Bitmap Index Scan'}
+
+def _connect() -> psycopg2.extensions.connection:
+    return psycopg2.connect(TEST_DSN, options=f'-c search_path={SCHEMA}')
+
+def _plan_nodes(node: dict):
+    yield node
+    for child in node.get('Plans', []):
+        yield from _plan_nodes(child)
+
+@unittest.skipUnless(TEST_DSN, "TEST_DSN is not set")
+class QueryPlansShould(unittest.TestCase):
+    """
+    EXPLAIN-based checks that the migrated indexes serve the hot predicates.
+    """
+    @classmethod
+    def setUpClass(cls):
+        with psycopg2.connect(TEST_DSN) as conn, conn.cursor() as cursor:
+            cursor.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+            cursor.execute(f'CREATE SCHEMA {SCHEMA}')
+        conn.close()
+
+        with _connect() as conn, conn.cursor() as cursor:
+            cursor.execute(SCHEMA_SQL.read_text(encoding='utf-8'))
+        conn.close()
+
+        database.configure_pool(min_size=1, max_size=1, connect=_connect)
+        apply_migrations()
+        with _connect() as conn:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                for statement in SEED_STATEMENTS:
+                    cursor.execute(statement)
+        conn.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        database.configure_pool()
+        with psycopg2.connect(TEST_DSN) as conn, conn.cursor() as cursor:
+            cursor.execute(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE')
+        conn.close()
+
+    def assertUsesIndex(self, sql: str, sql_params: tuple, table: str, index: str):
+        """
+        Asserts that `sql` reads `table` through `index` and never scans it sequentially.
+        """
+        plan = database.read_query(f'EXPLAIN (FORMAT JSON) {sql}', sql_params)[0][0][0]['Plan']
+        nodes = list(_plan_nodes(plan))
+
+        self.assertFalse(
+            [n for n in nodes if n['Node Type'] == 'Seq Scan' and n.get('Relation Name') == table],
+            f"sequential scan on {table}: {plan}"
+        )
+        self.assertTrue(
+            [n for n in nodes if n['Node Type'] in INDEX_SCANS and n.get('Index Name') == index],
+            f"{index} not used: {plan}"
+        )
+
+    def test_tournament_detail_reads_matchups_by_tournament(self):
+        """
+        Tests that loading a tournament's matchups uses the tournament/phase index.
+        """
+        self.assertUsesIndex(
+            '''SELECT m.id, m.tournament_phase, p.first_name, pt.first_name
+               FROM matchups AS m
+               LEFT JOIN player AS p ON m.player_one = p.id
+               LEFT JOIN player AS pt ON m.player_two = pt.id
+               WHERE m.tournament_id = %s
+               ORDER BY m.tournament_phase, m.id''',
+            (42,), 'matchups', 'idx_matchups_tournament_phase'
+        )
+
+    def test_matchups_of_a_phase_use_composite_index(self):
+        """
+        Tests that filtering on tournament and phase uses the composite index.
+        """
+        self.assertUsesIndex(
+            'SELECT id FROM matchups WHERE tournament_id = %s AND tournament_phase = %s',
+            (42, 2), 'matchups', 'idx_matchups_tournament_phase'
+        )
+
+    def test_player_by_name_uses_name_index(self):
+        """
+        Tests that the player_by_name lookup uses the name index.
+        """
+        self.assertUsesIndex(
+            'SELECT * FROM player WHERE first_name = %s and second_name = %s',
+            ('First17', 'Last17'), 'player', 'idx_player_name'
+        )
+
+    def test_null_team_uses_team_index(self):
+        """
+        Tests that clearing a team's players finds them through the team index.
+        """
+        self.assertUsesIndex(
+            'UPDATE player set team_id = %s where team_id = %s',
+            (None, 7), 'player', 'idx_player_team_id'
+        )
+
+    def test_player_match_scores_lock_rows_by_match(self):
+        """
+        Tests that reading the previous scores of matches uses the match index.
+        """
+        self.assertUsesIndex(
+            '''SELECT match_id, player_id, score FROM player_match_detail
+               WHERE match_id = ANY(%s) FOR UPDATE''',
+            ([1, 2, 3],), 'player_match_detail', 'idx_player_match_detail_match_id'
+        )
+
+    def test_team_match_detail_by_match_uses_primary_key(self):
+        """
+        Tests that team scores of a match are read through the primary key.
+        """
+        self.assertUsesIndex(
+            'SELECT team_id, score FROM team_match_detail WHERE match_id = %s',
+            (5,), 'team_match_detail', 'pk_team_match_detail'
+        )
+
+    def test_login_uses_email_index(self):
+        """
+        Tests that the user_by_credentials lookup uses the unique email index.
+        """
+        self.assertUsesIndex(
+            'SELECT * from users where email = %s and password = %s',
+            ('user17@example.com', 'secret'), 'users', 'email_unique'
+        )
@@ -0,0 +1,65 @@
+"""
+This module contains tests for the reference data cache in `reference_service`.
+"""
+
+from unittest import TestCase
+from unittest.mock import patch
+from services.reference_service import ReferenceTable
+
+class ReferenceTableShould(TestCase):
+    """
+    Unit tests for the ReferenceTable class.
+    """
+    @patch("services.reference_service.database.read_query")
+    def test_reads_table_once_within_ttl(self, mock_read_query):
+        """
+        Test if repeated lookups are served from memory after the first read.
+        """
+        mock_read_query.return_value = [(441, "USA"), (286, "Canada")]
+        table = ReferenceTable("country")
+
+        self.assertEqual(table.id_of("USA"), 441)
+        self.assertEqual(table.name_of(286), "Canada")
+        self.assertEqual(table.names(), ["USA", "Canada"])
+
+        self.assertEqual(mock_read_query.call_count, 1)
+        stats = table.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.loads), (2, 1, 1))
+
+    @patch("services.reference_service.database.read_query")
+    def test_returns_none_for_unknown_names(self, mock_read_query):
+        """
+        Test if lookups of unknown names and ids return None.
+        """
+        mock_read_query.return_value = [(1, "Lakers")]
+        table = ReferenceTable("team")
+
+        self.assertIsNone(table.id_of("Bulls"))
+        self.assertIsNone(table.name_of(2))
+
+    @patch("services.reference_service.database.read_query")
+    def test_reloads_after_invalidation(self, mock_read_query):
+        """
+        Test if an invalidated table is read again on the next lookup.
+        """
+        mock_read_query.side_effect = [[(1, "Lakers")], [(1, "Lakers"), (2, "Bulls")]]
+        table = ReferenceTable("team")
+
+        self.assertIsNone(table.id_of("Bulls"))
+        table.invalidate()
+
+        self.assertEqual(table.id_of("Bulls"), 2)
+        self.assertEqual(mock_read_query.call_count, 2)
+
+    @patch("services.reference_service.database.read_query")
+    def test_reloads_after_ttl_expires(self, mock_read_query):
+        """
+        Test if the table is read again once its TTL has passed.
+        """
+        mock_read_query.return_value = [(1, "Lakers")]
+        table = ReferenceTable("team", ttl=0)
+
+        table.id_of("Lakers")
+        table.id_of("Lakers")
+
+        self.assertEqual(mock_read_query.call_count, 2)
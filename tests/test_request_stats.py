@@ -0,0 +1,57 @@
+"""
+Unit tests for reporting the database work of each request.
+"""
+
+import json
+from unittest import TestCase
+from unittest.mock import patch
+from flask import Flask
+from common import request_stats
+from data import database
+
+class RequestStatsShould(TestCase):
+    """
+    Tests for the request statistics hooks.
+    """
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.before_request(request_stats.start_request_stats)
+        self.app.after_request(request_stats.add_query_headers)
+        self.app.teardown_request(request_stats.finish_request_stats)
+
+        @self.app.get('/players')
+        def players():
+            log = database._query_log.get()
+            for player_id in range(database.N_PLUS_ONE_THRESHOLD):
+                log.record("SELECT * FROM player WHERE id = %s", (player_id,), 0.001)
+            return "ok"
+
+        self.client = self.app.test_client()
+
+    def test_reports_headers_in_debug_mode(self):
+        """
+        Tests that query counts and N+1 statements are sent as headers in debug mode.
+        """
+        self.app.debug = True
+
+        response = self.client.get('/players')
+
+        self.assertEqual(response.headers['X-DB-Queries'], '5')
+        self.assertEqual(response.headers['X-DB-Connections'], '0')
+        self.assertEqual(response.headers['X-DB-N-Plus-One'],
+                         '5x SELECT * FROM player WHERE id = %s')
+        self.assertIsNone(database._query_log.get())
+
+    @patch("common.request_stats.logger")
+    def test_logs_one_structured_line_in_production(self, mock_logger):
+        """
+        Tests that outside debug mode the figures are logged instead of sent.
+        """
+        response = self.client.get('/players')
+
+        self.assertNotIn('X-DB-Queries', response.headers)
+        record = json.loads(mock_logger.info.call_args.args[0])
+        self.assertEqual(record["path"], "/players")
+        self.assertEqual(record["status"], 200)
+        self.assertEqual(record["queries"], 5)
+        self.assertEqual(record["n_plus_one"][0]["count"], 5)
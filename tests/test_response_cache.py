@@ -0,0 +1,232 @@
+"""
+This module contains tests for the response cache: the byte-bounded LRU, tag
+invalidation, the shared socket backend and the `cached_response` decorator.
+"""
+
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from flask import Flask, jsonify
+from benchmarks.standin import StandInCacheServer
+from common import response_cache
+from common.response_cache import ResponseCache, SocketBackend, cached_response, read_reply
+from services import version_service
+
+class ResponseCacheShould(TestCase):
+    """
+    Unit tests for the ResponseCache class.
+    """
+    def test_evicts_least_recently_used_entries_beyond_byte_budget(self):
+        """
+        Tests that storing past the byte budget evicts the least recently used entry.
+        """
+        cache = ResponseCache(max_bytes=80)
+        cache.set("a", b"x" * 9, ("teams",))
+        cache.set("b", b"y" * 9, ("teams",))
+        cache.get("a")
+
+        for key in "cdefghi":
+            cache.set(key, b"z" * 9, ("teams",))
+
+        self.assertEqual(cache.get("a"), b"x" * 9)
+        self.assertIsNone(cache.get("b"))
+        self.assertLessEqual(cache.stats().size, 80)
+        self.assertEqual(cache.stats().evictions, 1)
+
+    def test_does_not_keep_bodies_above_a_fraction_of_the_budget(self):
+        """
+        Tests that one large body cannot flush the whole cache.
+        """
+        cache = ResponseCache(max_bytes=800)
+        cache.set("large", b"x" * 200, ("teams",))
+
+        self.assertIsNone(cache.get("large"))
+
+    def test_invalidate_drops_only_tagged_entries(self):
+        """
+        Tests that invalidating a tag drops the entries built from it.
+        """
+        cache = ResponseCache()
+        cache.set("/team/all", b"[]", ("teams",))
+        cache.set("/player/all", b"[]", ("players", "teams"))
+        cache.set("/tournaments/all", b"[]", ("tournaments", "players"))
+
+        self.assertEqual(cache.invalidate({"teams"}), 2)
+
+        self.assertIsNone(cache.get("/player/all"))
+        self.assertEqual(cache.get("/tournaments/all"), b"[]")
+
+    def test_reports_hit_ratio_and_bytes_saved(self):
+        """
+        Tests that hits, misses and the bytes served from the cache are counted.
+        """
+        cache = ResponseCache()
+        cache.set("/team/all", b"[1,2,3]", ("teams",))
+
+        cache.get("/team/all")
+        cache.get("/team/all")
+        cache.get("/player/all")
+
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.bytes_saved), (2, 1, 14))
+        self.assertAlmostEqual(stats.hit_ratio, 2 / 3)
+
+    def test_version_change_invalidates_tagged_entries(self):
+        """
+        Tests that a new version of a family drops the cached responses built from it.
+        """
+        cache = ResponseCache()
+        cache.set("/team/all", b"[]", ("teams",))
+
+        with patch("common.response_cache._cache", cache), \
+                patch("services.version_service._versions", {}):
+            for version in (1, 2):
+                version_service.dispatch(json.dumps(
+                    {"family": "teams", "version": version, "modified_at": 0}
+                ))
+
+        self.assertIsNone(cache.get("/team/all"))
+
+class ConfigureResponseCacheShould(TestCase):
+    """
+    Unit tests for configuring the response cache from settings.
+    """
+    def setUp(self):
+        patcher = patch("common.response_cache._cache", ResponseCache())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_uses_shared_backend_when_socket_is_set(self):
+        """
+        Tests that a socket path and byte budget in the config enable the shared backend.
+        """
+        cache = response_cache.configure_response_cache_from(
+            {"RESPONSE_CACHE_SOCKET": "/run/cache.sock", "RESPONSE_CACHE_MAX_BYTES": 1024}
+        )
+
+        self.assertEqual(cache.max_bytes, 1024)
+        self.assertIsInstance(cache.backend, SocketBackend)
+        self.assertEqual(cache.backend.path, "/run/cache.sock")
+
+    def test_reads_environment_when_config_is_unset(self):
+        """
+        Tests that the environment is used for settings missing from the config.
+        """
+        with patch.dict(os.environ, {"RESPONSE_CACHE_MAX_BYTES": "2048"}):
+            os.environ.pop("RESPONSE_CACHE_SOCKET", None)
+            cache = response_cache.configure_response_cache_from({})
+
+        self.assertEqual(cache.max_bytes, 2048)
+        self.assertIsNone(cache.backend)
+
+    def test_closes_previous_backend(self):
+        """
+        Tests that reconfiguring closes the connection of the replaced backend.
+        """
+        backend = MagicMock(spec=SocketBackend)
+        response_cache.configure_response_cache(backend=backend)
+
+        response_cache.configure_response_cache()
+
+        backend.close.assert_called_once()
+
+class SocketBackendShould(TestCase):
+    """
+    Unit tests for the shared cache backend on a Unix socket.
+    """
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, directory)
+        self.server = StandInCacheServer(os.path.join(directory, "cache.sock")).start()
+        self.addCleanup(self.server.close)
+
+    def test_processes_share_hits_through_backend(self):
+        """
+        Tests that a body stored by one process is served to another from the backend.
+        """
+        first = ResponseCache(backend=SocketBackend(self.server.path))
+        second_backend = SocketBackend(self.server.path)
+        second = ResponseCache(backend=second_backend)
+        self.addCleanup(first.backend.close)
+        self.addCleanup(second_backend.close)
+
+        first.set("/team/all?#teams.1", b'{"teams":[]}', ("teams",))
+
+        self.assertEqual(second.get("/team/all?#teams.1", ("teams",)), b'{"teams":[]}')
+        self.assertEqual(second.get("/team/all?#teams.1", ("teams",)), b'{"teams":[]}')
+        self.assertEqual(second.stats().shared_hits, 1)
+        self.assertEqual(second.stats().hits, 1)
+
+    def test_treats_unreachable_server_as_miss(self):
+        """
+        Tests that a backend failure is a miss, not an error.
+        """
+        backend = SocketBackend(self.server.path + ".missing")
+
+        self.assertIsNone(backend.get("/team/all"))
+
+    def test_error_reply_raises(self):
+        """
+        Tests that a RESP error reply is reported as ValueError.
+        """
+        with self.assertRaises(ValueError):
+            read_reply(io.BytesIO(b"-ERR unknown command\r\n"))
+
+class CachedResponseShould(TestCase):
+    """
+    Unit tests for serving views from the response cache.
+    """
+    def setUp(self):
+        patcher = patch("common.response_cache._cache", ResponseCache())
+        self.cache = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("services.version_service.validators")
+        self.validators = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.validators.return_value = ("teams.1", None)
+
+        self.load = MagicMock(return_value=[{"id": 1, "name": "Lakers"}])
+        app = Flask(__name__)
+        app.add_url_rule("/team/all", view_func=cached_response("teams")(
+            lambda: jsonify({"teams": self.load()})
+        ), endpoint="teams")
+        self.client = app.test_client()
+
+    def test_serves_repeated_request_from_cache(self):
+        """
+        Tests that the second identical request gets the stored bytes without running the view.
+        """
+        first = self.client.get("/team/all?limit=5&cursor=x")
+        second = self.client.get("/team/all?cursor=x&limit=5")
+
+        self.assertEqual((first.headers["X-Cache"], second.headers["X-Cache"]), ("MISS", "HIT"))
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second.mimetype, "application/json")
+        self.load.assert_called_once()
+
+    def test_new_version_misses(self):
+        """
+        Tests that a response is rebuilt once the family version changes.
+        """
+        self.client.get("/team/all")
+        self.validators.return_value = ("teams.2", None)
+
+        response = self.client.get("/team/all")
+
+        self.assertEqual(response.headers["X-Cache"], "MISS")
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_bypasses_cache_while_versions_are_unknown(self):
+        """
+        Tests that nothing is cached while versions may be stale.
+        """
+        self.validators.return_value = None
+
+        self.client.get("/team/all")
+        self.client.get("/team/all")
+
+        self.assertEqual(self.load.call_count, 2)
+        self.assertEqual(response_cache.response_cache_stats().entries, 0)
@@ -0,0 +1,138 @@
+"""
+This module contains tests for the live score channel: publishing events in
+`scoreboard_service`, the notification `Listener` and the SSE endpoints.
+"""
+
+import json
+import socket
+import time
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from flask import Flask
+from common.broker import Broker, sse_frame
+from data.notifications import Listener
+from routers.tournaments import tournaments_blueprint
+from services import scoreboard_service
+
+class ScoreboardServiceShould(TestCase):
+    """
+    Unit tests for publishing and dispatching score events.
+    """
+    def setUp(self):
+        patcher = patch("services.scoreboard_service._broker", Broker())
+        self.broker = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("services.scoreboard_service.start_listener")
+        self.start_listener = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("services.scoreboard_service.database.notify")
+    def test_publish_sends_all_events_in_one_notify(self, mock_notify):
+        """
+        Tests that the events are serialized as one payload each and sent together.
+        """
+        scoreboard_service.publish([
+            ("tournament:1", "score", {"matchup_id": 9}),
+            ("tournament:1", "advance", {"matchup_id": 15, "slot": 2, "player_id": 8}),
+        ])
+
+        channel, payloads = mock_notify.call_args.args
+        self.assertEqual(channel, scoreboard_service.CHANNEL)
+        self.assertEqual([json.loads(p)["event"] for p in payloads], ["score", "advance"])
+
+    def test_dispatch_delivers_payload_to_topic_subscribers(self):
+        """
+        Tests that a notification reaches the local subscribers of its topic as an SSE frame.
+        """
+        subscription = scoreboard_service.subscribe(scoreboard_service.match_topic(4))
+        payload = json.dumps({"topic": "match:4", "event": "score", "data": {"match_id": 4}})
+
+        delivered = scoreboard_service.dispatch(payload)
+
+        self.assertEqual(delivered, 1)
+        self.assertEqual(subscription.get(timeout=0), sse_frame("score", '{"match_id":4}'))
+        self.start_listener.assert_called_once()
+
+    def test_tournament_stream_sends_published_events(self):
+        """
+        Tests that the SSE endpoint opens with a keep-alive and streams dispatched events.
+        """
+        app = Flask(__name__)
+        app.register_blueprint(tournaments_blueprint)
+
+        response = app.test_client().get("/tournaments/1/live")
+        frames = response.response
+        self.assertEqual(response.mimetype, "text/event-stream")
+        self.assertEqual(next(frames), b": keep-alive\n\n")
+
+        scoreboard_service.dispatch(json.dumps(
+            {"topic": "tournament:1", "event": "winner", "data": {"winner": 7}}
+        ))
+        self.assertEqual(next(frames), sse_frame("winner", '{"winner":7}'))
+
+        response.close()
+        self.assertEqual(self.broker.stats().subscribers, 0)
+
+class ListenerShould(TestCase):
+    """
+    Unit tests for the notification listener thread.
+    """
+    def test_passes_notification_payloads_to_callback(self):
+        """
+        Tests that the listener LISTENs on its channel and hands every payload to the callback.
+        """
+        server, client = socket.socketpair()
+        self.addCleanup(server.close)
+        self.addCleanup(client.close)
+        conn = MagicMock()
+        conn.fileno.return_value = client.fileno()
+        conn.notifies = []
+        received = []
+
+        def poll():
+            client.recv(16)
+            conn.notifies.extend([MagicMock(payload="first"), MagicMock(payload="second")])
+
+        conn.poll.side_effect = poll
+        listener = Listener("scoreboard", received.append, connect=lambda: conn, poll_interval=0.05)
+        listener.start()
+        self.assertTrue(listener.listening.wait(5))
+
+        server.send(b"x")
+        for _ in range(100):
+            if len(received) == 2:
+                break
+            time.sleep(0.01)
+        listener.stop(5)
+
+        self.assertEqual(received, ["first", "second"])
+        conn.cursor.return_value.__enter__.return_value.execute.assert_called_once_with(
+            "LISTEN scoreboard"
+        )
+        conn.close.assert_called_once()
+
+    def test_runs_on_listen_before_reporting_listening(self):
+        """
+        Tests that the on_listen hook runs after LISTEN and before the listener reports it is listening.
+        """
+        server, client = socket.socketpair()
+        self.addCleanup(server.close)
+        self.addCleanup(client.close)
+        conn = MagicMock()
+        conn.fileno.return_value = client.fileno()
+        states = []
+        listener = Listener("resource_versions", print, connect=lambda: conn, poll_interval=0.05,
+                            on_listen=lambda: states.append(listener.listening.is_set()))
+
+        listener.start()
+        self.assertTrue(listener.listening.wait(5))
+        listener.stop(5)
+
+        self.assertEqual(states, [False])
+
+    def test_rejects_invalid_channel_name(self):
+        """
+        Tests that a channel name that is not an identifier is rejected.
+        """
+        with self.assertRaises(ValueError):
+            Listener("score; DROP TABLE users", print)
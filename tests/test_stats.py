@@ -0,0 +1,75 @@
+"""
+Unit tests for the admin statistics route.
+"""
+
+from unittest import TestCase
+from unittest.mock import patch
+from flask import Flask
+from data.models import User
+from common.response_cache import ResponseCacheStats
+from data.pool import PoolStats
+from routers.stats import stats_blueprint
+import utils
+
+class StatsRouteShould(TestCase):
+    """
+    Tests for reporting process statistics to admins.
+    """
+    def setUp(self):
+        app = Flask(__name__)
+        app.before_request(utils.load_user)
+        app.register_blueprint(stats_blueprint)
+        self.client = app.test_client()
+        self.admin = User(id=1, email="a@example.com", password="", role="admin", name="Ada")
+        patcher = patch("utils.user_service.authenticated_user", return_value=self.admin)
+        self.authenticated_user = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("routers.stats.database.pool_stats",
+                        return_value=PoolStats(1, 10, 3, 2, 1, 4, 50, 2, 0.5, 3, 0))
+        self.pool_stats = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("routers.stats.auth_stats", return_value=utils.AuthStats(12, 0.024, 0.005))
+        self.auth_stats = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("routers.stats.response_cache_stats",
+                        return_value=ResponseCacheStats(30, 5, 15, 0.7, 4096, 12, 8192, 1))
+        self.response_cache_stats = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reports_pool_statistics_to_admins(self):
+        """
+        Tests that an admin gets the connection pool statistics.
+        """
+        response = self.client.get('/stats/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["pool"]["peak_in_use"], 4)
+        self.assertEqual(response.json["pool"]["checkouts"], 50)
+
+    def test_reports_authentication_time(self):
+        """
+        Tests that the time spent authenticating requests is reported.
+        """
+        response = self.client.get('/stats/')
+
+        self.assertEqual(response.json["auth"], {"requests": 12, "total_time": 0.024,
+                                                 "max_time": 0.005})
+
+    def test_reports_response_cache_hit_ratio(self):
+        """
+        Tests that the hit ratio and size of the response cache are reported.
+        """
+        response = self.client.get('/stats/')
+
+        self.assertEqual(response.json["response_cache"]["hit_ratio"], 0.7)
+        self.assertEqual(response.json["response_cache"]["bytes_saved"], 4096)
+
+    def test_rejects_directors_and_anonymous_requests(self):
+        """
+        Tests that only admins can read the statistics.
+        """
+        self.authenticated_user.return_value = self.admin.model_copy(update={"role": "director"})
+        self.assertEqual(self.client.get('/stats/').status_code, 401)
+
+        self.authenticated_user.return_value = None
+        self.assertEqual(self.client.get('/stats/').status_code, 401)
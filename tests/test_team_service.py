@@ -12,12 +12,22 @@ class TeamServiceShould(TestCase):
     """
     Unit tests for the team_service module.
     """
+    def setUp(self):
+        patcher = patch("services.team_service.database.transaction")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("services.version_service.bump")
+        self.bump = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("services.team_service.reference_service.teams")
     @patch("services.team_service.database")
-    def test_create_team_returns_correctly(self, mock_database):
+    def test_create_team_returns_correctly(self, mock_database, mock_teams):
         """
-        Test if create_team correctly inserts a team and returns the created team with ID.
+        Test if create_team correctly inserts a team, returns it with its ID,
+        bumps the teams version and invalidates the cached team names.
         """
-        mock_database.read_query.return_value = []
+        mock_teams.id_of.return_value = None
         mock_database.insert_query.return_value = 1
 
         team = Team(name="Golden State Warriors")
@@ -25,18 +35,22 @@ class TeamServiceShould(TestCase):
         expected = Team(id=1, name="Golden State Warriors")
 
         self.assertEqual(result, expected)
+        mock_teams.invalidate.assert_called_once()
+        self.bump.assert_called_once_with('teams')
 
+    @patch("services.team_service.reference_service.teams")
     @patch("services.team_service.database")
-    def test_create_team_returns_none_when_team_exists(self, mock_database):
+    def test_create_team_returns_none_when_team_exists(self, mock_database, mock_teams):
         """
         Test if create_team returns None when the team already exists in the database.
         """
-        mock_database.read_query.return_value = [(1, "Golden State Warriors")]
+        mock_teams.id_of.return_value = 1
 
         team = Team(name="Golden State Warriors")
         result = team_service.create_team(team)
 
         self.assertIsNone(result)
+        mock_database.insert_query.assert_not_called()
 
     @patch("services.team_service.database")
     def test_all_teams_returns_correctly(self, mock_database):
@@ -68,65 +82,65 @@ class TeamServiceShould(TestCase):
 
         self.assertEqual(list(result), expected)
 
-    @patch("services.team_service.database")
-    def test_get_team_by_id_returns_correctly(self, mock_database):
+    @patch("services.team_service.reference_service.teams")
+    def test_get_team_by_id_returns_correctly(self, mock_teams):
         """
         Test if get_team_by_id correctly returns a team based on the provided ID.
         """
-        mock_database.read_query.return_value = [(1, "Golden State Warriors")]
+        mock_teams.name_of.return_value = "Golden State Warriors"
 
         result = team_service.get_team_by_id(1)
         expected = [Team(id=1, name="Golden State Warriors")]
 
         self.assertEqual(result, expected)
 
-    @patch("services.team_service.database")
-    def test_get_team_by_id_returns_none_when_no_team_found(self, mock_database):
+    @patch("services.team_service.reference_service.teams")
+    def test_get_team_by_id_returns_none_when_no_team_found(self, mock_teams):
         """
         Test if get_team_by_id returns None when no team is found for the given ID.
         """
-        mock_database.read_query.return_value = []
+        mock_teams.name_of.return_value = None
 
         result = team_service.get_team_by_id(99)
         expected = None
 
         self.assertEqual(result, expected)
 
-    @patch("services.team_service.database")
-    def test_get_team_names_returns_correctly(self, mock_database):
+    @patch("services.team_service.reference_service.teams")
+    def test_get_team_names_returns_correctly(self, mock_teams):
         """
         Test if get_team_names correctly returns a list of team names.
         """
-        mock_database.read_query.return_value = [
-            ("Golden State Warriors",),
-            ("Los Angeles Lakers",)
-        ]
+        mock_teams.names.return_value = ["Golden State Warriors", "Los Angeles Lakers"]
 
         result = team_service.get_team_names()
         expected = ["Golden State Warriors", "Los Angeles Lakers"]
 
         self.assertEqual(result, expected)
 
-    @patch("services.team_service.database")
-    def test_get_team_id_returns_correctly(self, mock_database):
+    @patch("services.team_service.reference_service.teams")
+    def test_get_team_id_returns_correctly(self, mock_teams):
         """
         Test if get_team_id correctly returns the team ID for a given team name.
         """
-        mock_database.read_query.return_value = [(1,)]
+        mock_teams.id_of.return_value = 1
 
         result = team_service.get_team_id("Golden State Warriors")
         expected = 1
 
         self.assertEqual(result, expected)
 
+    @patch("services.team_service.reference_service.teams")
     @patch("services.team_service.database")
-    def test_delete_team_returns_correctly(self, mock_database):
+    def test_delete_team_returns_correctly(self, mock_database, mock_teams):
         """
-        Test if delete_team correctly calls the delete query and returns None.
+        Test if delete_team correctly calls the delete query, invalidates the
+        cached team names and returns None.
         """
         mock_database.update_query.return_value = None
 
         result = team_service.delete_team(1)
 
         mock_database.update_query.assert_called_with("DELETE from team where id = %s", (1,))
+        mock_teams.invalidate.assert_called_once()
         self.assertIsNone(result)
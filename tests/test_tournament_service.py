@@ -8,13 +8,31 @@ from unittest.mock import patch
 from datetime import date
 from services import tournaments_service
 from data.models import Tournament, MatchUp, Player, TournamentResponseModel
+from services.player_stats import StatDelta
 
 class TournamentServiceShould(TestCase):
     """
     Unit tests for the tournament service functions.
     """
+    def setUp(self):
+        tournaments_service._detail_cache.clear()
+        patcher = patch("services.player_service.apply_stat_deltas")
+        self.apply_stat_deltas = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("services.scoreboard_service.publish")
+        self.publish = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("services.version_service.bump")
+        self.bump = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("services.reference_service.tournament_formats")
+        self.tournament_formats = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.tournament_formats.name_of.side_effect = {1: "Knockout", 2: "League"}.get
+
+    @patch("services.tournaments_service.transaction")
     @patch("services.tournaments_service.insert_query")
-    def test_create_tournament_raises_error_with_invalid_data(self, mock_query):
+    def test_create_tournament_raises_error_with_invalid_data(self, mock_query, _):
         """
         Tests that the create_tournament method raises an exception when invalid data is passed.
         """
@@ -24,40 +42,6 @@ class TournamentServiceShould(TestCase):
         with self.assertRaises(Exception):
             tournaments_service.create_tournament(tournament)
 
-    @patch("services.tournaments_service.read_query")
-    def test_get_matchup_ids_next_phase_returns_correctly(self, mock_query):
-        """
-        Tests that get_matchup_ids_next_phase returns the correct matchups for the next phase.
-        """
-        mock_query.return_value = [[9],[10],[11],[12]]
-        matchup = MatchUp(
-            id=1, tournament_id=1, played_at=date(2022, 12, 23),
-            tournament_phase=1, player_one=1, player_two=2,
-            player_one_score=10, player_two_score=15
-        )
-
-        result = tournaments_service.get_matchup_ids_next_phase(matchup)
-        expected = [9,10,11,12]
-
-        self.assertEqual(result, expected)
-
-    @patch("services.tournaments_service.read_query")
-    def test_get_matchup_ids_next_phase_returns_correctly_when_final(self, mock_query):
-        """
-        Tests that get_matchup_ids_next_phase returns an empty list when it's the final phase.
-        """
-        mock_query.return_value = []
-        matchup = MatchUp(
-            id=13, tournament_id=1,
-            played_at=date(2022, 12, 23), tournament_phase=1, player_one=1,
-            player_two=2, player_one_score=10, player_two_score=15
-        )
-
-        result = tournaments_service.get_matchup_ids_next_phase(matchup)
-        expected = []
-
-        self.assertEqual(result, expected)
-
     @patch("services.tournaments_service.create_league")
     def test_create_league_tournament_returns_success_message(self, mock_create_league):
         """
@@ -91,77 +75,128 @@ class TournamentServiceShould(TestCase):
 
         self.assertEqual(result, expected)
 
-    @patch("services.tournaments_service.create_phase")
-    def test_create_phase_creates_phase_correctly(self, mock_create_phase):
+    def test_generate_round_robin_pairs_every_player_once(self):
         """
-        Tests that the create_phase method creates a phase correctly.
+        Tests that every pair of players meets exactly once and nobody plays twice in a round.
         """
-        mock_create_phase.return_value = None
+        schedule = tournaments_service.generate_round_robin([1, 2, 3, 4, 5, 6])
 
-        participants = ["1", "2", "3", "4"]
-        phase = 1
-        starting_date = date(2025, 2, 2)
+        pairs = [frozenset(pair) for matchups in schedule for pair in matchups]
+        self.assertEqual(len(schedule), 5)
+        self.assertEqual(len(pairs), 15)
+        self.assertEqual(len(set(pairs)), 15)
+        for matchups in schedule:
+            players = [p for pair in matchups for p in pair]
+            self.assertEqual(len(players), len(set(players)))
 
-        tournaments_service.create_phase(
-            Tournament(id=1, title="Test Tournament", prize="1000 lv", format_id=1),
-            participants, phase, starting_date
-        )
+    def test_generate_round_robin_gives_byes_for_odd_count(self):
+        """
+        Tests that with an odd number of players each round has one player sitting out.
+        """
+        schedule = tournaments_service.generate_round_robin([1, 2, 3, 4, 5])
 
-        mock_create_phase.assert_called_once_with(
-            Tournament(id=1, title="Test Tournament", prize="1000 lv", format_id=1),
-            participants, phase, starting_date
-        )
+        self.assertEqual(len(schedule), 5)
+        self.assertTrue(all(len(matchups) == 2 for matchups in schedule))
+        sitting_out = [
+            ({1, 2, 3, 4, 5} - {p for pair in matchups for p in pair}).pop()
+            for matchups in schedule
+        ]
+        self.assertEqual(sorted(sitting_out), [1, 2, 3, 4, 5])
 
-    def test_create_phase_raises_unauthorized_for_invalid_participants(self):
+    @patch("services.tournaments_service.transaction")
+    @patch("services.tournaments_service.insert_query")
+    @patch("services.player_service.get_players_by_ids")
+    def test_create_league_inserts_schedule_in_one_statement(
+        self, mock_get_players, mock_insert_query, mock_transaction
+    ):
         """
-        Tests that the create_phase method raises an unauthorized error 
-        for invalid participants count.
+        Tests that league creation writes every round in one bulk insert, a week apart.
         """
-        participants = ["1", "2", "3"]
-        result = len(participants) - 1
-        expected = 2
-        self.assertEqual(result, expected)
+        mock_get_players.return_value = {i: Player(id=i) for i in range(1, 5)}
+        mock_insert_query.return_value = 9
+        tx = mock_transaction.return_value.__enter__.return_value
+        league = Tournament(title="League", prize="2000 lv", format_id=2)
+
+        schedule = tournaments_service.create_league(league, ["1", "2", "3", "4"], date(2025, 2, 2))
 
-    def test_get_right_id_returns_correctly(self):
+        rows = tx.insert_many.call_args_list[0][0][1]
+        self.assertEqual(len(schedule), 3)
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0], (9, date(2025, 2, 2), 1, 1, 4, None, None))
+        self.assertEqual(rows[-1][1:3], (date(2025, 2, 16), 3))
+        standings = tx.insert_many.call_args_list[1][0][1]
+        self.assertEqual(standings, [(9, 1), (9, 2), (9, 3), (9, 4)])
+
+    def test_standing_deltas_for_first_result(self):
         """
-        Tests that the get_right_id method returns the correct ID for the next phase.
+        Tests that scoring an unscored matchup adds one played matchup to both players.
         """
-        current_ids = [[1,2],[3,4],[5,6],[7,8]]
-        next_ids = [9,10,11,12]
-        matchup = MatchUp(
-            id=5, tournament_id=1, played_at=date(2022, 12, 23),
-            tournament_phase=1, player_one=1, player_two=2, player_one_score=10,
-            player_two_score=15
-        )
+        result = tournaments_service.standing_deltas(None, (80, 72))
+        expected = ((1, 1, 0, 80, 72), (1, 0, 1, 72, 80))
 
-        result = tournaments_service.get_right_id(matchup,current_ids, next_ids)
-        expected = 11
+        self.assertEqual(result, expected)
+
+    def test_standing_deltas_when_result_is_corrected(self):
+        """
+        Tests that correcting a score swaps the win without counting the matchup twice.
+        """
+        result = tournaments_service.standing_deltas((80, 72), (70, 75))
+        expected = ((0, -1, 1, -10, 3), (0, 1, -1, 3, -10))
 
         self.assertEqual(result, expected)
 
-    def test_get_right_id_returns_correctly_when_final(self):
+    @patch("services.tournaments_service.transaction")
+    def test_set_matchup_score_updates_standings_in_same_transaction(self, mock_transaction):
         """
-        Tests that the get_right_id method returns None for the final phase.
+        Tests that a league score upserts both players' standings by the change in result.
         """
-        current_ids = [[15]]
-        next_ids = []
-        matchup = MatchUp(
-            id=15, tournament_id=1, played_at=date(2022, 12, 23),
-            tournament_phase=1, player_one=1, player_two=2, player_one_score=10,
-            player_two_score=15
-        )
+        tx = mock_transaction.return_value.__enter__.return_value
+        tx.read_query.return_value = [(4, 1, 2, None, None)]
 
-        result = tournaments_service.get_right_id(matchup,current_ids, next_ids)
-        expected = None
+        tournaments_service.set_matchup_score(10, [5, 3])
 
-        self.assertEqual(result, expected)
+        self.assertEqual(tx.read_query.call_args[0][1], (5, 3, 10))
+        tx.insert_many.assert_called_once()
+        self.assertEqual(tx.insert_many.call_args[0][1], [
+            (4, 1, 1, 1, 0, 5, 3),
+            (4, 2, 1, 0, 1, 3, 5)
+        ])
+        self.apply_stat_deltas.assert_called_once_with({
+            1: StatDelta(1, 1, 5, 0), 2: StatDelta(1, 0, 3, 0)
+        })
 
     @patch("services.tournaments_service.read_query")
+    def test_get_league_standings_returns_correctly(self, mock_query):
+        """
+        Tests that standings rows are read into models in the order returned.
+        """
+        mock_query.return_value = [
+            (1, "John", "Doe", 2, 2, 0, 160, 140, 20),
+            (2, "Jane", "Roe", 2, 0, 2, 140, 160, -20)
+        ]
+
+        result = tournaments_service.get_league_standings(4)
+
+        self.assertEqual([standing.player_id for standing in result], [1, 2])
+        self.assertEqual(result[0].point_differential, 20)
+        self.assertEqual(mock_query.call_args[0][1], (4,))
+
+    def test_create_phase_raises_unauthorized_for_invalid_participants(self):
+        """
+        Tests that the create_phase method raises an unauthorized error 
+        for invalid participants count.
+        """
+        participants = ["1", "2", "3"]
+        result = len(participants) - 1
+        expected = 2
+        self.assertEqual(result, expected)
+
+    @patch("services.tournaments_service.execute_statement")
     def test_get_matchup_returns_correctly(self, mock_query):
         """
         Tests that the get_matchup method returns the correct matchup details.
         """
-        mock_query.return_value = [[1,1,date(2022, 12, 23),1,1,2,10,15]]
+        mock_query.return_value = [[1,1,date(2022, 12, 23),1,1,2,10,15,None,None]]
 
         result = tournaments_service.get_matchup(1)
         expected = MatchUp(
@@ -172,7 +207,7 @@ class TournamentServiceShould(TestCase):
 
         self.assertEqual(result, expected)
 
-    @patch("services.tournaments_service.read_query")
+    @patch("services.tournaments_service.execute_statement")
     def test_get_matchup_returns_correctly_when_final(self, mock_query):
         """
         Tests that the get_matchup method returns None for the final phase.
@@ -184,8 +219,9 @@ class TournamentServiceShould(TestCase):
 
         self.assertEqual(result, expected)
 
+    @patch("services.tournaments_service.transaction")
     @patch("services.tournaments_service.insert_query")
-    def test_create_league_returns_correctly(self, mock_query):
+    def test_create_league_returns_correctly(self, mock_query, _):
         """
         Tests that the create_tournament method works for creating league tournaments.
         """
@@ -197,6 +233,7 @@ class TournamentServiceShould(TestCase):
         expected = Tournament(id= 1, title="Test League", prize="1000 lv", format_id=2)
 
         self.assertEqual(result, expected)
+        self.bump.assert_called_once_with('tournaments')
 
     @patch("services.tournaments_service.read_query")
     def test_all_tournaments_returns_correctly(self, mock_query):
@@ -204,8 +241,8 @@ class TournamentServiceShould(TestCase):
         Tests that all_tournaments returns the correct list of tournaments.
         """
         mock_query.return_value = [
-            (1, "Test Tournament", "1000 lv", 1, "John", "Doe", 1, 2, 10),
-            (2, "Second Tournament", "2000 lv", 2, "Jane", "Smith", 3, 4, 11)
+            (1, "Test Tournament", "1000 lv", 1, "John", "Doe", [1, 2], [10]),
+            (2, "Second Tournament", "2000 lv", 2, "Jane", "Smith", [3, 4], [11])
         ]
 
         result = tournaments_service.all_tournaments()
@@ -267,23 +304,6 @@ class TournamentServiceShould(TestCase):
 
         mock_set_score.assert_called_once_with(matchup_id, scores)
 
-    @patch("services.tournaments_service.get_matchup_ids_next_phase")
-    def test_get_matchup_ids_next_phase_when_phase_is_complete(self, mock_get_matchups):
-        """
-        Tests if getting matchup IDs for the next phase works when the phase is complete.
-        """
-        mock_get_matchups.return_value = [11, 12, 13, 14]
-
-        matchup = MatchUp(
-            id=1, tournament_id=1, played_at=date(2025, 2, 2), tournament_phase=2,
-            player_one=1, player_two=2, player_one_score=10, player_two_score=5
-        )
-
-        result = tournaments_service.get_matchup_ids_next_phase(matchup)
-        expected = [11, 12, 13, 14]
-
-        self.assertEqual(result, expected)
-
     @patch("services.tournaments_service.read_query")
     def test_get_league_matchup_returns_correctly(self, mock_query):
         """
@@ -326,47 +346,89 @@ class TournamentServiceShould(TestCase):
 
         self.assertEqual(result, expected)
 
-    @patch("services.tournaments_service.insert_query")
-    @patch("services.player_service.get_player_by_name")
-    def test_create_random_matchups_creates_matchup_correctly(
-        self, mock_get_player, mock_insert_query
-    ):
+    @patch("services.tournaments_service.read_query")
+    def test_get_tournament_format_reads_name_from_reference_cache(self, mock_query):
+        """
+        Tests that the format name of a tournament is looked up in the reference cache.
+        """
+        mock_query.return_value = [(2,)]
+
+        result = tournaments_service.get_tournament_format(5)
+
+        self.assertEqual(result, "League")
+        self.tournament_formats.name_of.assert_called_once_with(2)
+
+    def test_build_knockout_bracket_pairs_players_and_adds_empty_phases(self):
         """
-        Tests if creating random matchups inserts the correct values into the database.
+        Tests that the bracket pairs participants in order and adds empty later phases.
         """
-        mock_get_player.side_effect = [
-            Player(id=1, name="Player One"), Player(id=2, name="Player Two")
+        result = tournaments_service.build_knockout_bracket([1, 2, 3, 4, 5, 6, 7, 8])
+        expected = [
+            (1, 1, 2), (1, 3, 4), (1, 5, 6), (1, 7, 8),
+            (2, None, None), (2, None, None),
+            (3, None, None)
         ]
-        mock_insert_query.return_value = 1
 
-        tournament = Tournament(id=1, title="Test Tournament", prize="1000 lv", format_id=1)
-        start_date = date(2025, 2, 2)
+        self.assertEqual(result, expected)
 
-        tournaments_service.create_random_matchups(
-            tournament, "Player One", "Player Two", start_date
-        )
+    def test_link_knockout_bracket_points_each_matchup_to_its_next_slot(self):
+        """
+        Tests that pairs of matchups feed the two slots of one matchup in the next phase.
+        """
+        bracket = tournaments_service.build_knockout_bracket([1, 2, 3, 4, 5, 6, 7, 8])
 
-        mock_insert_query.assert_called_once_with(
-            '''insert into matchups (tournament_id, played_at, tournament_phase,
-        player_one, player_two, player_one_score, player_two_score)
-        values (%s, %s, %s, %s, %s, %s, %s)''',
-            (1, date(2025, 2, 2), 1, 1, 2, None, None)
-        )
+        result = tournaments_service.link_knockout_bracket(bracket)
+        expected = [(4, 1), (4, 2), (5, 1), (5, 2), (6, 1), (6, 2), (None, None)]
+
+        self.assertEqual(result, expected)
+
+    @patch("services.tournaments_service.transaction")
+    @patch("services.tournaments_service.insert_query")
+    @patch("services.player_service.get_players_by_ids")
+    def test_create_knockout_tournament_inserts_bracket_in_one_statement(
+        self, mock_get_players, mock_insert_query, mock_transaction
+    ):
+        """
+        Tests that knockout creation fetches participants once and bulk inserts every matchup.
+        """
+        mock_get_players.return_value = {i: Player(id=i) for i in range(1, 5)}
+        mock_insert_query.return_value = 3
+        tx = mock_transaction.return_value.__enter__.return_value
+        tx.read_query.return_value = [(20,), (21,), (22,)]
+        tournament = Tournament(title="Cup", prize="1000 lv", format_id=1)
+        start_date = date(2025, 2, 2)
 
-    @patch("services.tournaments_service.create_empty_matchup")
-    def test_create_empty_phase_creates_matchups(self, mock_create_empty_matchup):
+        with patch("services.tournaments_service.jsonify"):
+            tournaments_service.create_knockout_tournament(
+                tournament, ["1", "2", "3", "4"], start_date
+            )
+
+        mock_get_players.assert_called_once_with([1, 2, 3, 4])
+        tx.insert_many.assert_called_once()
+        rows = tx.insert_many.call_args[0][1]
+        self.assertEqual(rows, [
+            (20, 3, start_date, 1, 1, 2, None, None, 22, 1),
+            (21, 3, start_date, 1, 3, 4, None, None, 22, 2),
+            (22, 3, start_date, 2, None, None, None, None, None, None)
+        ])
+
+    @patch("services.tournaments_service.transaction")
+    @patch("services.player_service.get_players_by_ids")
+    def test_create_knockout_tournament_raises_error_for_unknown_player(
+        self, mock_get_players, mock_transaction
+    ):
         """
-        Tests if creating an empty phase generates the correct number of matchups.
+        Tests that knockout creation fails before writing anything when a participant is unknown.
         """
-        tournament = Tournament(id=1, title="Test Tournament", prize="1000 lv", format_id=1)
-        tournament_date = date(2025, 2, 2)
-        phase = 1
-        p_count = 8
+        mock_get_players.return_value = {1: Player(id=1), 2: Player(id=2), 3: Player(id=3)}
+        tournament = Tournament(title="Cup", prize="1000 lv", format_id=1)
 
-        tournaments_service.create_empty_phase(tournament, tournament_date, phase, p_count)
+        with self.assertRaises(ValueError):
+            tournaments_service.create_knockout_tournament(
+                tournament, ["1", "2", "3", "4"], date(2025, 2, 2)
+            )
 
-        self.assertEqual(mock_create_empty_matchup.call_count, 4)
-        mock_create_empty_matchup.assert_called_with(tournament, tournament_date, phase)
+        mock_transaction.assert_not_called()
 
     @patch("services.tournaments_service.read_query")
     def test_check_for_existing_player_returns_true_if_player_exists(self, mock_query):
@@ -388,21 +450,6 @@ class TournamentServiceShould(TestCase):
         result = tournaments_service.check_for_existing_player(999)
         self.assertFalse(result)
 
-    @patch("services.tournaments_service.read_query")
-    def test_get_tournament_matchups_returns_correctly(self, mock_query):
-        """
-        Tests if get_tournament_matchups returns the correct matchups for a given tournament.
-        """
-        mock_query.return_value = [
-            (1, 1, date(2025, 2, 2), 1, 1, 2, 10, 15)
-        ]
-
-        result = tournaments_service.get_tournament_matchups(1)
-        expected = [MatchUp(id=1, tournament_id=1, played_at=date(2025, 2, 2), tournament_phase=1,
-                            player_one=1, player_two=2, player_one_score=10, player_two_score=15)]
-
-        self.assertEqual(result, expected)
-
     @patch("services.tournaments_service.create_league")
     def test_create_league_raises_error_for_invalid_participants(self, mock_create_league):
         """
@@ -425,7 +472,8 @@ class TournamentServiceShould(TestCase):
     @patch("services.tournaments_service.read_query")
     def test_get_by_tournament_id_returns_none_when_not_found(self, mock_query):
         """
-        Tests if get_by_tournament_id returns None when the tournament is not found.
+        Tests if get_by_tournament_id returns None without loading matchups
+        when the tournament is not found.
         """
         mock_query.return_value = []
 
@@ -433,38 +481,96 @@ class TournamentServiceShould(TestCase):
         expected = None
 
         self.assertEqual(result, expected)
+        mock_query.assert_called_once()
 
     @patch("services.tournaments_service.read_query")
-    @patch("services.player_service.get_tournament_players")
-    @patch("services.tournaments_service.get_tournament_matchups")
-    @patch("services.tournaments_service.get_tournament_format")
-    def test_get_by_tournament_id_returns_correctly(self, mock_get_format, mock_get_matchups,
-                                                mock_get_players, mock_read_query):
-        """
-        Tests if get_by_tournament_id returns the correct tournament details.
-        """
-        mock_read_query.return_value = [(1, "Test Tournament", "1000 lv", 1, "John Doe")]
-        mock_get_players.return_value = [Player(id=1, name="Player One")]
-        mock_get_matchups.return_value = [
-            MatchUp(
-                id=1, tournament_id=1, played_at=date(2025, 2, 2), tournament_phase=1,
-                player_one=1, player_two=2, player_one_score=3, player_two_score=2
-                )
+    def test_get_by_tournament_id_returns_correctly(self, mock_read_query):
+        """
+        Tests if get_by_tournament_id returns the correct tournament details,
+        listing each player once.
+        """
+        mock_read_query.side_effect = [
+            [(1, "Test Tournament", "1000 lv", 1, 3)],
+            [
+                (1, 1, date(2025, 2, 2), 1, 1, 2, 3, 2, 3, 1,
+                 "John", "Doe", "Bulgaria", "Lakers", "Jane", "Roe", None, None),
+                (2, 1, date(2025, 2, 3), 1, 3, 1, 1, 4, 3, 2,
+                 "Jim", "Poe", None, "Bulls", "John", "Doe", "Bulgaria", "Lakers"),
+                (3, 1, None, 2, None, None, None, None, None, None,
+                 None, None, None, None, None, None, None, None)
             ]
-        mock_get_format.return_value = "Knockout"
+        ]
 
         result = tournaments_service.get_by_tournament_id(1)
         expected = TournamentResponseModel(
-            id=1, title="Test Tournament", prize="1000 lv", format="Knockout",
-            winner="John Doe", players=[Player(id=1, name="Player One")],
+            id=1, title="Test Tournament", prize="1000 lv", format="Knockout", winner=3,
+            players=[
+                Player(id=1, first_name="John", second_name="Doe",
+                       country="Bulgaria", team="Lakers"),
+                Player(id=2, first_name="Jane", second_name="Roe"),
+                Player(id=3, first_name="Jim", second_name="Poe", team="Bulls")
+            ],
             matchups=[
                 MatchUp(id=1, tournament_id=1, played_at=date(2025, 2, 2),
                 tournament_phase=1, player_one=1, player_two=2, player_one_score=3,
-                player_two_score=2)
+                player_two_score=2, next_matchup_id=3, next_slot=1),
+                MatchUp(id=2, tournament_id=1, played_at=date(2025, 2, 3),
+                tournament_phase=1, player_one=3, player_two=1, player_one_score=1,
+                player_two_score=4, next_matchup_id=3, next_slot=2),
+                MatchUp(id=3, tournament_id=1, tournament_phase=2)
             ]
         )
 
         self.assertEqual(result, expected)
+        self.assertEqual(mock_read_query.call_count, 2)
+
+    @patch("services.tournaments_service.load_tournament_detail")
+    def test_get_by_tournament_id_caches_details(self, mock_load):
+        """
+        Tests that tournament details are loaded once and then served from the cache.
+        """
+        mock_load.return_value = TournamentResponseModel(
+            id=1, title="Test Tournament", prize=None, format="Knockout", winner=None)
+
+        first = tournaments_service.get_by_tournament_id(1)
+        second = tournaments_service.get_by_tournament_id(1)
+
+        self.assertIs(first, second)
+        mock_load.assert_called_once_with(1)
+
+    @patch("services.tournaments_service.transaction")
+    @patch("services.tournaments_service.load_tournament_detail")
+    def test_set_matchup_score_drops_cached_details(self, mock_load, mock_transaction):
+        """
+        Tests that updating a matchup score reloads its tournament on the next read.
+        """
+        mock_load.return_value = TournamentResponseModel(
+            id=1, title="Test Tournament", prize=None, format="Knockout", winner=None)
+        tx = mock_transaction.return_value.__enter__.return_value
+        tx.read_query.return_value = [(1, 1, 2, None, None)]
+
+        tournaments_service.get_by_tournament_id(1)
+        tournaments_service.set_matchup_score(10, [5, 3])
+        tournaments_service.get_by_tournament_id(1)
+
+        self.assertEqual(mock_load.call_count, 2)
+
+    @patch("services.tournaments_service.transaction")
+    @patch("services.tournaments_service.read_query")
+    @patch("services.tournaments_service.load_tournament_detail")
+    def test_set_tournament_winner_drops_cached_details(self, mock_load, mock_read_query, _):
+        """
+        Tests that setting the winner reloads the tournament on the next read.
+        """
+        mock_load.return_value = TournamentResponseModel(
+            id=1, title="Test Tournament", prize=None, format="Knockout", winner=None)
+        mock_read_query.return_value = [(None,)]
+
+        tournaments_service.get_by_tournament_id(1)
+        tournaments_service.set_tournament_winner(1, 101)
+        tournaments_service.get_by_tournament_id(1)
+
+        self.assertEqual(mock_load.call_count, 2)
 
     @patch("services.tournaments_service.create_knockout_tournament")
     def test_create_knockout_tournament_raises_error_for_invalid_participants(self, mock_knockout):
@@ -486,45 +592,102 @@ class TournamentServiceShould(TestCase):
 
         self.assertEqual(result, expected)
 
-    @patch("services.tournaments_service.update_query")
-    def test_set_tournament_winner_success(self, mock_update_query):
+    @patch("services.tournaments_service.set_tournament_winner")
+    @patch("services.tournaments_service.transaction")
+    def test_set_knockout_score_advances_winner_to_next_slot(self, mock_transaction,
+                                                             mock_set_winner):
         """
-        Tests if set_tournament_winner successfully updates the tournament winner.
+        Tests that the winner of a knockout matchup is written into its slot of the next matchup.
         """
-        mock_update_query.return_value = 1
+        tx = mock_transaction.return_value.__enter__.return_value
+        tx.read_query.return_value = [(1, 7, 8, 15, 2, None, None, False)]
 
-        tournament_id = 1
-        winner_id = 101
+        result = tournaments_service.set_knockout_score(9, [3, 5])
 
-        result = tournaments_service.set_tournament_winner(tournament_id, winner_id)
-        self.assertTrue(result)
+        self.assertEqual(result, 8)
+        self.assertEqual(tx.update_query.call_args[0][1], (2, 8, 2, 8, 15))
+        mock_set_winner.assert_not_called()
+        self.apply_stat_deltas.assert_called_once_with({
+            7: StatDelta(1, 0, 3, 0), 8: StatDelta(1, 1, 5, 0)
+        })
+        self.publish.assert_called_once_with([
+            ("tournament:1", "score", {"matchup_id": 9, "player_one": 7, "player_two": 8,
+                                       "player_one_score": 3, "player_two_score": 5}),
+            ("tournament:1", "advance", {"matchup_id": 15, "slot": 2, "player_id": 8}),
+        ])
 
-        mock_update_query.assert_called_once_with(
-            '''
-        UPDATE tournament
-        SET winner = %s
-        WHERE id = %s''',
-            (winner_id, tournament_id)
-        )
+    @patch("services.tournaments_service.set_tournament_winner")
+    @patch("services.tournaments_service.transaction")
+    def test_set_knockout_score_sets_tournament_winner_after_final(self, mock_transaction,
+                                                                   mock_set_winner):
+        """
+        Tests that scoring the final sets the tournament winner instead of advancing.
+        """
+        tx = mock_transaction.return_value.__enter__.return_value
+        tx.read_query.return_value = [(1, 7, 8, None, None, None, None, True)]
+
+        result = tournaments_service.set_knockout_score(15, [6, 2])
 
-    @patch("services.tournaments_service.update_query")
-    def test_set_tournament_winner_failure(self, mock_update_query):
+        self.assertEqual(result, 7)
+        mock_set_winner.assert_called_once_with(1, 7)
+        tx.update_query.assert_not_called()
+
+    @patch("services.tournaments_service.set_tournament_winner")
+    @patch("services.tournaments_service.transaction")
+    def test_set_knockout_score_does_not_crown_winner_before_final_phase(self, mock_transaction,
+                                                                         mock_set_winner):
         """
-        Tests if set_tournament_winner returns False when the update fails.
+        Tests that an unlinked matchup outside the last phase only gets its scores.
         """
-        mock_update_query.return_value = 0
+        tx = mock_transaction.return_value.__enter__.return_value
+        tx.read_query.return_value = [(1, 7, 8, None, None, None, None, False)]
 
-        tournament_id = 1
-        winner_id = 101
+        result = tournaments_service.set_knockout_score(3, [6, 2])
 
-        result = tournaments_service.set_tournament_winner(tournament_id, winner_id)
+        self.assertEqual(result, 7)
+        mock_set_winner.assert_not_called()
+        tx.update_query.assert_not_called()
 
-        self.assertFalse(result)
+    @patch("services.tournaments_service.transaction")
+    def test_set_knockout_score_returns_none_for_missing_matchup(self, mock_transaction):
+        """
+        Tests that scoring an unknown matchup changes nothing.
+        """
+        tx = mock_transaction.return_value.__enter__.return_value
+        tx.read_query.return_value = []
+
+        self.assertIsNone(tournaments_service.set_knockout_score(99, [1, 2]))
+        tx.update_query.assert_not_called()
+
+    @patch("services.tournaments_service.transaction")
+    @patch("services.tournaments_service.read_query")
+    def test_set_tournament_winner_success(self, mock_read_query, _):
+        """
+        Tests if set_tournament_winner updates the winner and moves the title between players.
+        """
+        mock_read_query.return_value = [(55,)]
 
-        mock_update_query.assert_called_once_with(
-            '''
-        UPDATE tournament
-        SET winner = %s
-        WHERE id = %s''',
-            (winner_id, tournament_id)
+        result = tournaments_service.set_tournament_winner(1, 101)
+
+        self.assertTrue(result)
+        self.assertEqual(mock_read_query.call_args[0][1], (101, 1))
+        self.apply_stat_deltas.assert_called_once_with({
+            55: StatDelta(0, 0, 0, -1), 101: StatDelta(0, 0, 0, 1)
+        })
+        self.publish.assert_called_once_with(
+            [("tournament:1", "winner", {"tournament_id": 1, "winner": 101})]
         )
+
+    @patch("services.tournaments_service.transaction")
+    @patch("services.tournaments_service.read_query")
+    def test_set_tournament_winner_failure(self, mock_read_query, _):
+        """
+        Tests if set_tournament_winner returns False when the tournament does not exist.
+        """
+        mock_read_query.return_value = []
+
+        result = tournaments_service.set_tournament_winner(1, 101)
+
+        self.assertFalse(result)
+        self.apply_stat_deltas.assert_not_called()
+        self.publish.assert_not_called()
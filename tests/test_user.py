@@ -6,6 +6,7 @@ registration, login, user retrieval, and logout in the application.
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
 from flask import Flask
+from data.models import Page
 from routers.user import (
     _is_valid_password, register, all_users,
     logout, user_blueprint
@@ -69,17 +70,18 @@ class UserBlueprintTests(TestCase):
             )
             self.assertEqual(response.status_code, 200)
 
-    @patch("services.user_service.all_users", return_value=[
+    @patch("services.user_service.users_page", return_value=Page([
         MagicMock(id=1, email="user1@example.com", role="user"),
         MagicMock(id=2, email="admin@example.com", role="admin")
-    ])
+    ], None))
     def test_all_users(self, _):
-        """Test retrieving all users."""
+        """Test retrieving a page of users."""
         with self.app.test_request_context("/user/all", method="GET"):
             response = all_users()
             self.assertEqual(response.status_code, 200)
             json_data = response.get_json()
             self.assertEqual(len(json_data["users"]), 2)
+            self.assertIsNone(json_data["next_cursor"])
 
     def test_logout(self):
         """
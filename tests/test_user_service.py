@@ -0,0 +1,108 @@
+"""
+This module contains unit tests for the user service functionality.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+from unittest.mock import patch
+import jwt
+from data.models import User
+from data.secrets import SECRET_KEY, ALGO
+from services import user_service
+
+class UserServiceShould(TestCase):
+    """
+    Unit tests for the user_service functions.
+    """
+    def setUp(self):
+        user_service._user_cache.clear()
+        self.versions = user_service.TokenVersions()
+        patcher = patch("services.user_service.token_versions", self.versions)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = User(id=1, email="john@example.com", password="Secret@123",
+                         role="director", name="John")
+
+    @patch("services.user_service.database.read_query", return_value=[])
+    def test_create_token_carries_claims_without_password(self, _):
+        """
+        Tests that the token holds the user's ID, role and version but no password.
+        """
+        token = user_service.create_token(self.user)
+        claims = jwt.decode(token, SECRET_KEY, algorithms=ALGO)
+
+        self.assertEqual(claims["sub"], "1")
+        self.assertEqual(claims["role"], "director")
+        self.assertEqual(claims["ver"], 0)
+        self.assertNotIn("password", claims)
+
+    @patch("services.user_service.database.read_query", return_value=[])
+    def test_authenticated_user_reads_database_only_to_refresh_versions(self, mock_read_query):
+        """
+        Tests that repeated authorization checks are decided from the token claims.
+        """
+        token = user_service.create_token(self.user)
+
+        for _ in range(3):
+            user = user_service.authenticated_user(token)
+
+        self.assertTrue(user.is_director())
+        self.assertEqual(user.id, 1)
+        self.assertEqual(user.password, "")
+        mock_read_query.assert_called_once()
+
+    def test_authenticated_user_raises_for_expired_token(self):
+        """
+        Tests that expired tokens are rejected.
+        """
+        token = jwt.encode(
+            {"sub": "1", "email": "john@example.com", "name": "John", "role": "user",
+             "ver": 0, "exp": datetime.now(timezone.utc) - timedelta(minutes=1)},
+            SECRET_KEY, algorithm=ALGO
+        )
+
+        with self.assertRaises(jwt.exceptions.ExpiredSignatureError):
+            user_service.authenticated_user(token)
+
+    def test_authenticated_user_rejects_tokens_in_old_format(self):
+        """
+        Tests that tokens carrying credentials instead of claims are not accepted.
+        """
+        token = jwt.encode(
+            {"email": "john@example.com", "password": "Secret@123", "role": "admin",
+             "exp": datetime.now(timezone.utc) + timedelta(minutes=5)},
+            SECRET_KEY, algorithm=ALGO
+        )
+
+        self.assertIsNone(user_service.authenticated_user(token))
+
+    @patch("services.user_service.database.insert_query", return_value=1)
+    @patch("services.user_service.database.update_query", return_value=1)
+    @patch("services.user_service.database.read_query", return_value=[])
+    def test_promote_to_director_revokes_existing_tokens(self, *_):
+        """
+        Tests that a token issued before a role change is no longer accepted.
+        """
+        token = user_service.create_token(self.user)
+        self.assertIsNotNone(user_service.authenticated_user(token))
+
+        user_service.promote_to_director(self.user)
+
+        self.assertIsNone(user_service.authenticated_user(token))
+        self.assertEqual(
+            user_service.authenticated_user(user_service.create_token(self.user)).id, 1
+        )
+
+    @patch("services.user_service.database.read_query")
+    def test_revocations_from_other_processes_apply_after_refresh(self, mock_read_query):
+        """
+        Tests that a version bumped elsewhere is picked up when the table is read again.
+        """
+        mock_read_query.return_value = []
+        token = user_service.create_token(self.user)
+        self.assertIsNotNone(user_service.authenticated_user(token))
+
+        mock_read_query.return_value = [(1, 1)]
+        self.versions.reload()
+
+        self.assertIsNone(user_service.authenticated_user(token))
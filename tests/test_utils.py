@@ -0,0 +1,108 @@
+"""
+Unit tests for the authentication middleware and role decorators.
+"""
+
+from unittest import TestCase
+from unittest.mock import patch
+import jwt
+from flask import Flask, g
+from data.models import User
+from routers.match import match_blueprint
+from routers.player import player_blueprint
+import utils
+
+class AuthMiddlewareShould(TestCase):
+    """
+    Tests for loading the user once per request and guarding views by role.
+    """
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.before_request(utils.load_user)
+        self.app.after_request(utils.add_auth_timing)
+        self.app.add_url_rule('/home', 'home', lambda: 'home')
+
+        @self.app.route('/protected', methods=['GET', 'PUT'])
+        @utils.require_admin_or_director("Not allowed", methods=('PUT',))
+        def protected():
+            return f"hello {g.user.name}" if g.user else "form"
+
+        self.client = self.app.test_client()
+        self.director = User(id=1, email="d@example.com", password="", role="director",
+                             name="Dee")
+
+    @patch("utils.user_service.authenticated_user")
+    def test_reads_token_from_cookie_once_per_request(self, mock_authenticated_user):
+        """
+        Tests that the token is verified once even when the user is requested repeatedly.
+        """
+        mock_authenticated_user.return_value = self.director
+
+        with self.app.test_request_context('/protected', headers={'Cookie': 'access_token=token'}):
+            self.app.preprocess_request()
+            first = utils.authenticate_user()
+            second = utils.authenticate_user()
+
+        self.assertIs(first, second)
+        mock_authenticated_user.assert_called_once_with('token')
+
+    @patch("utils.user_service.authenticated_user")
+    def test_allows_required_role(self, mock_authenticated_user):
+        """
+        Tests that admins and directors reach the view, with auth timing reported.
+        """
+        mock_authenticated_user.return_value = self.director
+
+        response = self.client.put('/protected')
+
+        self.assertEqual(response.data, b"hello Dee")
+        self.assertIn("auth;dur=", response.headers["Server-Timing"])
+
+    @patch("utils.user_service.authenticated_user")
+    def test_rejects_other_roles_and_anonymous_requests(self, mock_authenticated_user):
+        """
+        Tests that users without the role or without a valid token get 401.
+        """
+        mock_authenticated_user.return_value = self.director.model_copy(update={"role": "user"})
+        self.assertEqual(self.client.put('/protected').status_code, 401)
+
+        mock_authenticated_user.side_effect = jwt.exceptions.DecodeError()
+        self.assertEqual(self.client.put('/protected').status_code, 401)
+
+    @patch("utils.user_service.authenticated_user")
+    def test_redirects_expired_tokens_home(self, mock_authenticated_user):
+        """
+        Tests that an expired token redirects to the home page.
+        """
+        mock_authenticated_user.side_effect = jwt.exceptions.ExpiredSignatureError()
+
+        response = self.client.put('/protected')
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response.location.endswith('/home'))
+
+    @patch("utils.user_service.authenticated_user", return_value=None)
+    def test_does_not_guard_other_methods(self, _):
+        """
+        Tests that methods outside `methods` are served without a role check.
+        """
+        self.assertEqual(self.client.get('/protected').data, b"form")
+
+class WriteRoutesShould(TestCase):
+    """
+    Tests that the create routes reject requests without an admin or director.
+    """
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.before_request(utils.load_user)
+        self.app.register_blueprint(match_blueprint)
+        self.app.register_blueprint(player_blueprint)
+        self.client = self.app.test_client()
+
+    @patch("utils.user_service.authenticated_user", return_value=None)
+    def test_reject_anonymous_creates(self, _):
+        """
+        Tests that creating players and matches without a valid token gets 401, not 500.
+        """
+        self.assertEqual(self.client.post('/player/', data={}).status_code, 401)
+        self.assertEqual(self.client.post('/match/playerMatches/', json={}).status_code, 401)
+        self.assertEqual(self.client.post('/match/teamMatches/', json={}).status_code, 401)
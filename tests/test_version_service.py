@@ -0,0 +1,143 @@
+"""
+This module contains tests for the resource version counters in
+`version_service` and the conditional GET support built on them.
+"""
+
+import json
+from datetime import datetime, timezone
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from flask import Flask
+from data.models import MatchFormat
+from routers.match_format import match_format_blueprint
+from services import version_service
+from services.version_service import ResourceVersion
+
+MODIFIED = datetime(2030, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+class VersionServiceShould(TestCase):
+    """
+    Unit tests for bumping and tracking resource versions.
+    """
+    def setUp(self):
+        patcher = patch("services.version_service._versions", {})
+        self.versions = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.listener = MagicMock()
+        patcher = patch("services.version_service.start_listener", return_value=self.listener)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @patch("services.version_service.database")
+    def test_bump_updates_versions_only_after_commit(self, mock_database):
+        """
+        Tests that the counter row is not touched inside the writing transaction,
+        and that versions are bumped, announced and recorded once it commits.
+        """
+        mock_database.read_query.return_value = [("teams", 4, MODIFIED, "")]
+
+        version_service.bump("teams")
+
+        mock_database.read_query.assert_not_called()
+        self.assertEqual(self.versions, {})
+
+        mock_database.on_commit.call_args.args[0]()
+        sql, params = mock_database.read_query.call_args.args
+        self.assertIn("pg_notify", sql)
+        self.assertEqual(params, (["teams"], version_service.CHANNEL))
+        self.assertEqual(self.versions, {"teams": ResourceVersion(4, MODIFIED)})
+
+    def test_keeps_highest_version_when_updates_arrive_out_of_order(self):
+        """
+        Tests that a notification older than the known version is ignored.
+        """
+        version_service.dispatch(json.dumps(
+            {"family": "players", "version": 7, "modified_at": MODIFIED.timestamp()}
+        ))
+        version_service.dispatch(json.dumps(
+            {"family": "players", "version": 6, "modified_at": 0}
+        ))
+
+        self.assertEqual(self.versions, {"players": ResourceVersion(7, MODIFIED)})
+
+    def test_validators_combine_versions_of_all_families(self):
+        """
+        Tests that the entity tag names every family version and the last
+        modification is the latest of them.
+        """
+        self.versions.update({
+            "tournaments": ResourceVersion(3, MODIFIED),
+            "players": ResourceVersion(9, datetime(2029, 1, 1, tzinfo=timezone.utc)),
+        })
+
+        self.assertEqual(version_service.validators("tournaments", "players"),
+                         ("tournaments.3-players.9", MODIFIED))
+
+    def test_validators_are_unknown_while_not_listening(self):
+        """
+        Tests that no validators are reported when changes could have been missed.
+        """
+        self.versions["teams"] = ResourceVersion(1, MODIFIED)
+        self.listener.listening.is_set.return_value = False
+
+        self.assertIsNone(version_service.validators("teams"))
+
+class ConditionalGetShould(TestCase):
+    """
+    Unit tests for answering conditional requests on the list endpoints.
+    """
+    def setUp(self):
+        patcher = patch("services.version_service.validators",
+                        return_value=("match_formats.4", MODIFIED))
+        self.validators = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch("services.match_format_service.all_formats")
+        self.all_formats = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.all_formats.return_value = [MatchFormat(id=2, name="Player match")]
+        app = Flask(__name__)
+        app.register_blueprint(match_format_blueprint)
+        self.client = app.test_client()
+
+    def test_sends_validators_with_full_response(self):
+        """
+        Tests that a plain request gets the payload with ETag and Last-Modified.
+        """
+        response = self.client.get("/match_format/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["ETag"], 'W/"match_formats.4"')
+        self.assertEqual(response.last_modified, MODIFIED)
+        self.validators.assert_called_once_with("match_formats")
+
+    def test_answers_matching_etag_without_running_the_view(self):
+        """
+        Tests that a request with the current ETag gets 304 and reads no data.
+        """
+        response = self.client.get("/match_format/",
+                                   headers={"If-None-Match": 'W/"match_formats.4"'})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.all_formats.assert_not_called()
+
+    def test_serves_full_response_for_stale_etag(self):
+        """
+        Tests that a request with an older ETag gets the current payload.
+        """
+        response = self.client.get("/match_format/",
+                                   headers={"If-None-Match": 'W/"match_formats.3"'})
+
+        self.assertEqual(response.status_code, 200)
+        self.all_formats.assert_called_once()
+
+    def test_skips_validators_when_versions_are_unknown(self):
+        """
+        Tests that the view is served without validators while versions are unknown.
+        """
+        self.validators.return_value = None
+
+        response = self.client.get("/match_format/", headers={"If-None-Match": "*"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response.headers)